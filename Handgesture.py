@@ -1,65 +1,259 @@
 import cv2
 import mediapipe as mp
 import math
+import numpy as np
+
+TIP_IDS = np.array([4, 8, 12, 16, 20])  # Thumb, Index, Middle, Ring, Pinky
+HAND_CONNECTIONS = np.array([
+    (0, 1), (1, 2), (2, 3), (3, 4), (0, 5), (5, 6), (6, 7), (7, 8),
+    (5, 9), (9, 10), (10, 11), (11, 12), (9, 13), (13, 14), (14, 15), (15, 16),
+    (13, 17), (0, 17), (17, 18), (18, 19), (19, 20)
+])
+
+
+class Hand:
+    """One detected hand. All arrays are views into the HandBatch it came from."""
+    __slots__ = ("landmarks", "px", "bbox", "center", "fingers", "type")
+
+    def __init__(self, landmarks, px, bbox, center, fingers, hand_type):
+        self.landmarks = landmarks  # (21, 3) float32, normalized x, y, z
+        self.px = px                # (21, 2) int32 pixel coordinates
+        self.bbox = bbox            # (xmin, ymin, xmax, ymax)
+        self.center = center        # (cx, cy)
+        self.fingers = fingers      # (5,) int8, 1 if finger up
+        self.type = hand_type       # "right" / "left"
+
+    @property
+    def lmList(self):
+        """Landmarks in the old [[id, x, y], ...] list format."""
+        return [[id, int(x), int(y)] for id, (x, y) in enumerate(self.px)]
+
+    def __getitem__(self, key):
+        # Lets older code keep using hand['lmList'], hand['bbox'], ...
+        if key == "lmList":
+            return self.lmList
+        if key in ("bbox", "center"):
+            return tuple(int(v) for v in getattr(self, key))
+        if key == "type":
+            return self.type
+        raise KeyError(key)
+
+    def distance(self, p1, p2):
+        """Pixel distance between two landmarks of this hand."""
+        d = self.px[p1] - self.px[p2]
+        return math.hypot(int(d[0]), int(d[1]))
+
+
+class HandBatch:
+    """All hands from one frame, stored as stacked arrays and computed in one pass."""
+    __slots__ = ("landmarks", "px", "bbox", "center", "fingers", "types", "hands", "shape")
+
+    def __init__(self, landmarks, types, shape, handedThumb=True, fingers=True):
+        h, w = shape[:2]
+        n = len(types)
+        self.shape = shape
+        self.landmarks = np.asarray(landmarks, dtype=np.float32).reshape(n, 21, 3)
+        self.types = list(types)
+
+        self.px = (self.landmarks[:, :, :2] * np.array([w, h], dtype=np.float32)).astype(np.int32)
+        mins = self.px.min(axis=1)
+        maxs = self.px.max(axis=1)
+        self.bbox = np.concatenate([mins, maxs], axis=1)
+        self.center = (mins + maxs) // 2
+        self.fingers = None
+
+        self.hands = [Hand(self.landmarks[i], self.px[i], self.bbox[i], self.center[i],
+                           None, self.types[i]) for i in range(n)]
+        if fingers:
+            self.computeFingers(handedThumb)
+
+    @classmethod
+    def empty(cls, shape=(480, 640)):
+        return cls(np.empty((0, 21, 3), dtype=np.float32), [], shape)
+
+    def computeFingers(self, handedThumb=True):
+        """Fills self.fingers (hands, 5) and each Hand.fingers in one batched pass."""
+        self.fingers = fingers = np.empty((len(self.types), 5), dtype=np.int8)
+        for i, hand in enumerate(self.hands):
+            hand.fingers = fingers[i]
+        if not len(self.types):
+            return fingers
+
+        # Thumb: compare tip and IP joint along x. With handedThumb the direction
+        # follows the reported hand type, otherwise tip right of the joint = up.
+        thumb_dx = self.px[:, 4, 0] - self.px[:, 3, 0]
+        if handedThumb:
+            right = np.array([t == "right" for t in self.types])
+            fingers[:, 0] = np.where(right, thumb_dx < 0, thumb_dx > 0)
+        else:
+            fingers[:, 0] = thumb_dx > 0
+
+        # Other fingers (Index, Middle, Ring, Pinky): tip above the PIP joint
+        fingers[:, 1:] = self.px[:, TIP_IDS[1:], 1] < self.px[:, TIP_IDS[1:] - 2, 1]
+        return fingers
+
+    def distances(self, pairs):
+        """Pixel distances for landmark pairs, shape (hands, len(pairs))."""
+        pairs = np.asarray(pairs)
+        d = self.px[:, pairs[:, 0]] - self.px[:, pairs[:, 1]]
+        return np.hypot(d[..., 0], d[..., 1])
+
+    def __len__(self):
+        return len(self.hands)
+
+    def __iter__(self):
+        return iter(self.hands)
+
+    def __getitem__(self, i):
+        return self.hands[i]
+
 
 class HandDetector:
-    def __init__(self, mode=False, maxHands=2, detectionCon=0.7, trackCon=0.7):
+    def __init__(self, mode=False, maxHands=2, detectionCon=0.7, trackCon=0.7, handedThumb=True,
+                 modelComplexity=1, roi=False, roiPad=0.4, roiSize=256, roiRefresh=30):
         self.mode = mode
         self.maxHands = maxHands
         self.detectionCon = detectionCon
         self.trackCon = trackCon
+        self.handedThumb = handedThumb
+        self.modelComplexity = modelComplexity
         self.mpHands = mp.solutions.hands
-        self.hands = self.mpHands.Hands(
+        self.hands = self.makeHands()
+        self.mpDraw = mp.solutions.drawing_utils
+        self.tipIds = TIP_IDS.tolist()
+
+        # ROI tracking: run inference on a crop around last frame's hands. Crops get their
+        # own Hands instance: in video mode MediaPipe seeds each frame with the previous
+        # frame's hand rect, which would point at the wrong place after a crop <-> full switch.
+        self.roi = roi
+        self.roiHands = None            # built on the first crop
+        self.roiPad = roiPad            # padding around the hand boxes, fraction of their size
+        self.roiSize = roiSize          # crops larger than this (px, square) are downscaled
+        self.roiRefresh = roiRefresh    # full-frame pass every N frames to pick up new hands
+        self.roiBox = None              # (xmin, ymin, xmax, ymax) of last frame's hands
+        self.roiCount = 0               # frames since the last full-frame pass
+        self.roiFrames = 0
+        self.fullFrames = 0
+        self.switchDrops = 0            # hands lost on the first pass after a crop <-> full switch
+        self.lastPass = None            # last frame's final pass, "roi" / "full"
+        self.lastFound = False          # ... and whether it found hands
+        self.crop = None
+
+    def makeHands(self):
+        return self.mpHands.Hands(
             static_image_mode=self.mode,
             max_num_hands=self.maxHands,
+            model_complexity=self.modelComplexity,
             min_detection_confidence=self.detectionCon,
             min_tracking_confidence=self.trackCon
         )
-        self.mpDraw = mp.solutions.drawing_utils
-        self.tipIds = [4, 8, 12, 16, 20]  # Thumb, Index, Middle, Ring, Pinky
 
     def findHands(self, img, draw=True):
-        """Detects hands and returns processed image and list of hands with landmarks."""
-        imgRGB = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-        self.results = self.hands.process(imgRGB)
-        hands_data = []
-
-        if self.results.multi_hand_landmarks:
-            for i, handLms in enumerate(self.results.multi_hand_landmarks):
-                lmList, xList, yList = [], [], []
-
-                # Hand type (Right/Left)
-                hand_type = self.results.multi_handedness[i].classification[0].label.lower()
-
-                h, w, c = img.shape
-                for id, lm in enumerate(handLms.landmark):
-                    cx, cy = int(lm.x * w), int(lm.y * h)
-                    lmList.append([id, cx, cy])
-                    xList.append(cx)
-                    yList.append(cy)
-
-                if lmList:  # Safety check
-                    xmin, xmax = min(xList), max(xList)
-                    ymin, ymax = min(yList), max(yList)
-                    bbox = (xmin, ymin, xmax, ymax)
-                    center = ((xmin + xmax) // 2, (ymin + ymax) // 2)
-
-                    hands_data.append({
-                        'lmList': lmList,
-                        'bbox': bbox,
-                        'center': center,
-                        'type': hand_type
-                    })
-
-                    if draw:
-                        self.mpDraw.draw_landmarks(img, handLms, self.mpHands.HAND_CONNECTIONS)
-                        cv2.rectangle(img, (xmin - 20, ymin - 20), (xmax + 20, ymax + 20),
-                                      (0, 255, 0), 2)
+        """Detects hands and returns processed image and a HandBatch of detected hands."""
+        self.results, self.crop = self.process(img)
+        hands_data = self.toBatch(self.results, img.shape, crop=self.crop)
+        self.trackRoi(hands_data)
 
+        if draw:
+            self.drawHands(img, hands_data)
+            if self.crop is not None:
+                x0, y0, x1, y1 = self.crop
+                cv2.rectangle(img, (x0, y0), (x1, y1), (255, 128, 0), 1)
         return img, hands_data
 
+    def process(self, img):
+        """Runs MediaPipe on the ROI crop (or the full frame). Returns (results, crop or None)."""
+        crop = self.roiCrop(img.shape) if self.roi else None
+        if crop is not None:
+            x0, y0, x1, y1 = crop
+            sub = img[y0:y1, x0:x1]
+            if x1 - x0 > self.roiSize:
+                sub = cv2.resize(sub, (self.roiSize, self.roiSize), interpolation=cv2.INTER_AREA)
+            if self.roiHands is None:
+                self.roiHands = self.makeHands()
+            results = self.roiHands.process(cv2.cvtColor(sub, cv2.COLOR_BGR2RGB))
+            if results.multi_hand_landmarks:
+                self.roiFrames += 1
+                self._passed("roi", True)
+                return results, crop
+            self.roiBox = None  # hands left the crop: retry this frame on the full image
+
+        self.fullFrames += 1
+        results = self.hands.process(cv2.cvtColor(img, cv2.COLOR_BGR2RGB))
+        if self.roi:
+            self._passed("full", bool(results.multi_hand_landmarks))
+        return results, None
+
+    def _passed(self, kind, found):
+        """Counts frames that lost last frame's hands right after switching between crop and full frame."""
+        if kind != self.lastPass and self.lastFound and not found:
+            self.switchDrops += 1
+        self.lastPass, self.lastFound = kind, found
+
+    def roiCrop(self, shape):
+        """Square crop around the padded union of last frame's hand boxes, or None for a full pass."""
+        if self.roiBox is None or self.roiCount >= self.roiRefresh:
+            self.roiCount = 0
+            return None
+        self.roiCount += 1
+        h, w = shape[:2]
+        xmin, ymin, xmax, ymax = self.roiBox
+        side = int(max(xmax - xmin, ymax - ymin) * (1 + 2 * self.roiPad))
+        if side >= min(w, h):
+            return None
+        cx, cy = (xmin + xmax) // 2, (ymin + ymax) // 2
+        x0 = min(max(cx - side // 2, 0), w - side)
+        y0 = min(max(cy - side // 2, 0), h - side)
+        return (x0, y0, x0 + side, y0 + side)
+
+    def trackRoi(self, hands_data):
+        if not self.roi:
+            return
+        if len(hands_data):
+            mins = hands_data.bbox[:, :2].min(axis=0)
+            maxs = hands_data.bbox[:, 2:].max(axis=0)
+            self.roiBox = (int(mins[0]), int(mins[1]), int(maxs[0]), int(maxs[1]))
+        else:
+            self.roiBox = None
+
+    def toBatch(self, results, shape, fingers=True, crop=None):
+        """Packs MediaPipe results into a HandBatch with a single array copy.
+
+        With a crop, landmarks are remapped from crop-normalized to full-frame coordinates.
+        """
+        if not results.multi_hand_landmarks:
+            return HandBatch(np.empty((0, 21, 3), dtype=np.float32), [], shape, fingers=fingers)
+        landmarks = np.array([(lm.x, lm.y, lm.z)
+                              for handLms in results.multi_hand_landmarks for lm in handLms.landmark],
+                             dtype=np.float32).reshape(-1, 21, 3)
+        if crop is not None:
+            h, w = shape[:2]
+            x0, y0, x1, y1 = crop
+            scale = np.array([(x1 - x0) / w, (y1 - y0) / h, (x1 - x0) / w], dtype=np.float32)
+            landmarks *= scale
+            landmarks[:, :, 0] += x0 / w
+            landmarks[:, :, 1] += y0 / h
+        types = [hd.classification[0].label.lower() for hd in results.multi_handedness]
+        return HandBatch(landmarks, types, shape, self.handedThumb, fingers)
+
+    @staticmethod
+    def drawHands(img, hands_data, bbox=True):
+        """Draws skeletons (and optionally padded boxes) straight from the pixel arrays."""
+        for hand in hands_data:
+            cv2.polylines(img, list(hand.px[HAND_CONNECTIONS]), False, (224, 224, 224), 2)
+            for x, y in hand.px:
+                cv2.circle(img, (int(x), int(y)), 3, (0, 0, 255), cv2.FILLED)
+            if bbox:
+                xmin, ymin, xmax, ymax = (int(v) for v in hand.bbox)
+                cv2.rectangle(img, (xmin - 20, ymin - 20), (xmax + 20, ymax + 20),
+                              (0, 255, 0), 2)
+        return img
+
     def fingersUp(self, lmList, hand_type="right"):
         """Returns list of 5 integers: 1 if finger up, 0 if down."""
+        if isinstance(lmList, Hand):
+            return lmList.fingers.tolist()
+
         fingers = []
 
         if not lmList or len(lmList) < 21:  # Safety check
@@ -79,6 +273,8 @@ class HandDetector:
 
     def findDistance(self, p1, p2, lmList, img=None, draw=True, r=10, t=3):
         """Finds distance between two points."""
+        if isinstance(lmList, Hand):
+            lmList = lmList.lmList
         if not lmList or p1 >= len(lmList) or p2 >= len(lmList):
             return 0, img, [0, 0, 0, 0, 0, 0]
 
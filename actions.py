@@ -0,0 +1,92 @@
+import threading
+import time
+from collections import deque
+
+
+class ActionExecutor:
+    """Runs gesture actions on a worker thread so the vision loop never sleeps.
+
+    Each action has a name. A cooldown (seconds) is enforced per name using
+    timestamps, and edge=True fires the action only on the first frame a hand
+    enters that gesture. Call new_frame() once per frame before dispatching;
+    passing the frame timestamp lets replays drive cooldowns from recorded time.
+    Actions submitted with a coalesce key replace any still-pending action with
+    the same key, so e.g. cursor moves never pile up behind a slow backend.
+    """
+
+    def __init__(self, coalesce=True):
+        self.coalesce = coalesce     # False keeps every job (deterministic replays)
+        self.jobs = deque()          # (key, fn, args, kwargs)
+        self.pending = {}            # coalesce key -> job still waiting in self.jobs
+        self.cond = threading.Condition()
+        self.last_fired = {}         # action name -> timestamp
+        self.held = {}               # hand -> gesture held on the previous frame
+        self.current = {}            # hand -> gesture seen on this frame
+        self.now = time.monotonic()
+        self.executed = 0
+        self.skipped = 0
+        self.running = True
+        self.thread = threading.Thread(target=self._worker, daemon=True)
+        self.thread.start()
+
+    # ---------------- Frame bookkeeping ----------------
+    def new_frame(self, t=None):
+        self.held = self.current
+        self.current = {}
+        self.now = time.monotonic() if t is None else t
+
+    def hold(self, hand, gesture):
+        """Marks a gesture as active for this frame. Returns True if it was just entered."""
+        self.current[hand] = gesture
+        return self.held.get(hand) != gesture
+
+    # ---------------- Submission ----------------
+    def fire(self, hand, name, fn, *args, cooldown=0.0, edge=False, **kwargs):
+        """Queues fn(*args, **kwargs) if edge / cooldown rules allow it. Returns True if queued."""
+        entered = self.hold(hand, name)
+        if edge and not entered:
+            self.skipped += 1
+            return False
+        if self.now - self.last_fired.get(name, float("-inf")) < cooldown:
+            self.skipped += 1
+            return False
+        self.last_fired[name] = self.now
+        self.submit(fn, *args, **kwargs)
+        return True
+
+    def submit(self, fn, *args, coalesce=None, **kwargs):
+        if not self.coalesce:
+            coalesce = None
+        with self.cond:
+            job = [coalesce, fn, args, kwargs]
+            if coalesce is not None and coalesce in self.pending:
+                self.pending[coalesce][1:] = job[1:]
+                return
+            if coalesce is not None:
+                self.pending[coalesce] = job
+            self.jobs.append(job)
+            self.cond.notify()
+
+    # ---------------- Worker ----------------
+    def _worker(self):
+        while True:
+            with self.cond:
+                while self.running and not self.jobs:
+                    self.cond.wait()
+                if not self.jobs:
+                    return
+                key, fn, args, kwargs = self.jobs.popleft()
+                if key is not None:
+                    self.pending.pop(key, None)
+            try:
+                fn(*args, **kwargs)
+            except Exception as e:
+                print(f"⚠️ Action error ({getattr(fn, '__name__', fn)}): {e}")
+            self.executed += 1
+
+    def stop(self, timeout=1.0):
+        """Lets queued actions finish, then stops the worker."""
+        with self.cond:
+            self.running = False
+            self.cond.notify()
+        self.thread.join(timeout)
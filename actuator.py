@@ -0,0 +1,557 @@
+"""Mouse and keyboard injection for Sky Pointer and Luffy.
+
+Actuator keeps the pyautogui call style (moveTo, click, hotkey, ...) but sends
+input straight to the OS: XTest on X11, SendInput on Windows, or pyautogui
+with its 0.1 s per-call PAUSE switched off as the portable fallback.
+
+Cursor moves are coalesced: moveTo only stores the latest target and a mover
+thread injects it at most `rate` times a second (the display rate), so a
+burst of tracking frames costs one OS call per screen refresh. Buttons, keys
+and scrolls first flush any pending move, so a click always lands where the
+cursor was last sent. A chord (hotkey) goes out as one batch of key-downs and
+key-ups. FakeActuator records what would have been injected.
+
+    python actuator.py --bench                    # injection latency per backend vs. pyautogui defaults
+    python actuator.py --bench --backend fake --fake-latency-ms 2
+"""
+import argparse
+import ctypes
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+
+
+class Actuator:
+    """Base class: backends implement size(), _move(), _mouse(), _keys() and _scroll()."""
+
+    name = "base"
+
+    def __init__(self, rate=60.0):
+        self.rate = rate                # cursor moves injected per second at most (0 = every call)
+        self._lock = threading.Condition(threading.RLock())
+        self._target = None             # latest cursor target not injected yet
+        self._last = None               # last injected cursor position
+        self._lastMove = 0.0
+        self._closed = False
+        self._thread = None
+
+        self.requested = 0              # moveTo calls
+        self.coalesced = 0              # moves replaced by a newer one before injection
+        self.injections = 0
+        self.injectTime = 0.0
+        self.injectMax = 0.0
+
+    # ---------------- Backend primitives ----------------
+    def size(self):
+        raise NotImplementedError
+
+    def _move(self, x, y):
+        raise NotImplementedError
+
+    def _mouse(self, events):
+        """events: [(button, down)] injected as one batch."""
+        raise NotImplementedError
+
+    def _keys(self, events):
+        """events: [(key name, down)] injected as one batch."""
+        raise NotImplementedError
+
+    def _scroll(self, clicks):
+        raise NotImplementedError
+
+    def _inject(self, fn, *args):
+        start = time.perf_counter()
+        fn(*args)
+        cost = time.perf_counter() - start
+        self.injections += 1
+        self.injectTime += cost
+        self.injectMax = max(self.injectMax, cost)
+
+    # ---------------- Cursor ----------------
+    def moveTo(self, x, y, *args, **kwargs):
+        target = (int(x), int(y))
+        with self._lock:
+            self.requested += 1
+            if not self.rate:
+                self._inject(self._move, *target)
+                self._last = target
+                return
+            if self._target is not None:
+                self.coalesced += 1
+            self._target = target
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._mover, daemon=True, name=f"{self.name}-mover")
+                self._thread.start()
+            self._lock.notify()
+
+    def _moveNow(self, target):
+        if target != self._last:    # the cursor is already there
+            self._inject(self._move, *target)
+            self._last = target
+            self._lastMove = time.perf_counter()
+
+    def _flush(self):
+        if self._target is not None:
+            target, self._target = self._target, None
+            self._moveNow(target)
+
+    def _mover(self):
+        interval = 1.0 / self.rate
+        with self._lock:
+            while True:
+                while self._target is None and not self._closed:
+                    self._lock.wait()
+                if self._closed:
+                    return
+                wait = self._lastMove + interval - time.perf_counter()
+                if wait > 0:
+                    self._lock.wait(wait)   # a newer target may replace this one meanwhile
+                    continue
+                self._flush()
+
+    # ---------------- Buttons, keys, wheel (pyautogui names) ----------------
+    def click(self, x=None, y=None, button="left", *args, **kwargs):
+        with self._lock:
+            if x is not None and y is not None:
+                self._target = (int(x), int(y))
+            self._flush()
+            self._inject(self._mouse, [(button, True), (button, False)])
+
+    def rightClick(self, x=None, y=None, *args, **kwargs):
+        self.click(x, y, button="right")
+
+    def mouseDown(self, x=None, y=None, button="left", *args, **kwargs):
+        with self._lock:
+            if x is not None and y is not None:
+                self._target = (int(x), int(y))
+            self._flush()
+            self._inject(self._mouse, [(button, True)])
+
+    def mouseUp(self, x=None, y=None, button="left", *args, **kwargs):
+        with self._lock:
+            self._flush()
+            self._inject(self._mouse, [(button, False)])
+
+    def scroll(self, clicks, *args, **kwargs):
+        with self._lock:
+            self._flush()
+            self._inject(self._scroll, int(clicks))
+
+    def hotkey(self, *keys, **kwargs):
+        """Presses keys in order and releases them in reverse, in a single batch."""
+        keys = [k.lower() for k in keys]
+        with self._lock:
+            self._flush()
+            self._inject(self._keys, [(k, True) for k in keys] + [(k, False) for k in reversed(keys)])
+
+    def press(self, key, *args, **kwargs):
+        self.hotkey(key)
+
+    # ---------------- Lifetime ----------------
+    def close(self):
+        with self._lock:
+            self._flush()
+            self._closed = True
+            self._lock.notify_all()
+        if self._thread is not None:
+            self._thread.join(1.0)
+
+    def stats(self):
+        return {
+            "backend": self.name,
+            "moves_requested": self.requested,
+            "moves_coalesced": self.coalesced,
+            "injections": self.injections,
+            "inject_ms_avg": round(1000 * self.injectTime / self.injections, 3) if self.injections else 0.0,
+            "inject_ms_max": round(1000 * self.injectMax, 3),
+        }
+
+
+# -------------------- pyautogui (portable fallback) --------------------
+class PyAutoGuiActuator(Actuator):
+    name = "pyautogui"
+
+    def __init__(self, rate=60.0, pause=0.0):
+        super().__init__(rate)
+        import pyautogui
+        pyautogui.PAUSE = pause     # the default 0.1 s sleep after every call caps the loop near 10 FPS
+        self.gui = pyautogui
+
+    def size(self):
+        return tuple(self.gui.size())
+
+    def _move(self, x, y):
+        self.gui.moveTo(x, y)
+
+    def _mouse(self, events):
+        for button, down in events:
+            (self.gui.mouseDown if down else self.gui.mouseUp)(button=button)
+
+    def _keys(self, events):
+        for key, down in events:
+            (self.gui.keyDown if down else self.gui.keyUp)(key)
+
+    def _scroll(self, clicks):
+        self.gui.scroll(clicks)
+
+
+# -------------------- X11: XTest --------------------
+X_KEYS = {
+    "ctrl": "Control_L", "ctrlleft": "Control_L", "ctrlright": "Control_R",
+    "shift": "Shift_L", "shiftleft": "Shift_L", "shiftright": "Shift_R",
+    "alt": "Alt_L", "altleft": "Alt_L", "altright": "Alt_R",
+    "win": "Super_L", "winleft": "Super_L", "winright": "Super_R", "command": "Super_L",
+    "tab": "Tab", "enter": "Return", "return": "Return", "esc": "Escape", "escape": "Escape",
+    "space": "space", " ": "space", "backspace": "BackSpace", "delete": "Delete", "del": "Delete",
+    "up": "Up", "down": "Down", "left": "Left", "right": "Right",
+    "home": "Home", "end": "End", "pageup": "Prior", "pagedown": "Next",
+    "printscreen": "Print", "volumeup": "XF86AudioRaiseVolume", "volumedown": "XF86AudioLowerVolume",
+    "volumemute": "XF86AudioMute", "playpause": "XF86AudioPlay",
+    "nexttrack": "XF86AudioNext", "prevtrack": "XF86AudioPrev",
+}
+X_BUTTONS = {"left": 1, "middle": 2, "right": 3}
+
+
+class XTestActuator(Actuator):
+    """One X connection; every batch is sent with a single flush (no round trip)."""
+
+    name = "xtest"
+
+    def __init__(self, rate=60.0, display=None):
+        super().__init__(rate)
+        from Xlib import X, XK
+        from Xlib import display as xdisplay
+        from Xlib.ext import xtest
+        self.X, self.XK, self.xtest = X, XK, xtest
+        self.display = xdisplay.Display(display)
+        if not self.display.has_extension("XTEST"):
+            raise RuntimeError("X server has no XTEST extension")
+        self.keycodes = {}
+
+    def size(self):
+        screen = self.display.screen()
+        return screen.width_in_pixels, screen.height_in_pixels
+
+    def _keycode(self, key):
+        code = self.keycodes.get(key)
+        if code is None:
+            name = X_KEYS.get(key) or (key.upper() if key.startswith("f") and key[1:].isdigit() else key)
+            code = self.display.keysym_to_keycode(self.XK.string_to_keysym(name))
+            if not code:
+                raise ValueError(f"no keycode for {key!r}")
+            self.keycodes[key] = code
+        return code
+
+    def _move(self, x, y):
+        self.xtest.fake_input(self.display, self.X.MotionNotify, x=x, y=y)
+        self.display.flush()
+
+    def _mouse(self, events):
+        for button, down in events:
+            self.xtest.fake_input(self.display, self.X.ButtonPress if down else self.X.ButtonRelease,
+                                  X_BUTTONS[button])
+        self.display.flush()
+
+    def _keys(self, events):
+        codes = [(self._keycode(key), down) for key, down in events]     # fail before sending half a chord
+        for code, down in codes:
+            self.xtest.fake_input(self.display, self.X.KeyPress if down else self.X.KeyRelease, code)
+        self.display.flush()
+
+    def _scroll(self, clicks):
+        button = 4 if clicks > 0 else 5     # as pyautogui on X11: one wheel click per unit
+        for _ in range(abs(clicks)):
+            self.xtest.fake_input(self.display, self.X.ButtonPress, button)
+            self.xtest.fake_input(self.display, self.X.ButtonRelease, button)
+        self.display.flush()
+
+    def close(self):
+        super().close()
+        self.display.close()
+
+
+# -------------------- Windows: SendInput --------------------
+class MOUSEINPUT(ctypes.Structure):
+    _fields_ = [("dx", ctypes.c_int32), ("dy", ctypes.c_int32), ("mouseData", ctypes.c_uint32),
+                ("dwFlags", ctypes.c_uint32), ("time", ctypes.c_uint32), ("dwExtraInfo", ctypes.c_size_t)]
+
+
+class KEYBDINPUT(ctypes.Structure):
+    _fields_ = [("wVk", ctypes.c_uint16), ("wScan", ctypes.c_uint16), ("dwFlags", ctypes.c_uint32),
+                ("time", ctypes.c_uint32), ("dwExtraInfo", ctypes.c_size_t)]
+
+
+class HARDWAREINPUT(ctypes.Structure):
+    _fields_ = [("uMsg", ctypes.c_uint32), ("wParamL", ctypes.c_uint16), ("wParamH", ctypes.c_uint16)]
+
+
+class _INPUTUNION(ctypes.Union):
+    _fields_ = [("mi", MOUSEINPUT), ("ki", KEYBDINPUT), ("hi", HARDWAREINPUT)]
+
+
+class INPUT(ctypes.Structure):
+    _fields_ = [("type", ctypes.c_uint32), ("u", _INPUTUNION)]
+
+
+INPUT_MOUSE, INPUT_KEYBOARD = 0, 1
+MOUSEEVENTF_MOVE, MOUSEEVENTF_ABSOLUTE, MOUSEEVENTF_WHEEL = 0x0001, 0x8000, 0x0800
+MOUSE_FLAGS = {("left", True): 0x0002, ("left", False): 0x0004, ("right", True): 0x0008,
+               ("right", False): 0x0010, ("middle", True): 0x0020, ("middle", False): 0x0040}
+KEYEVENTF_EXTENDEDKEY, KEYEVENTF_KEYUP = 0x0001, 0x0002
+VK_KEYS = {
+    "ctrl": 0x11, "ctrlleft": 0xA2, "ctrlright": 0xA3, "shift": 0x10, "shiftleft": 0xA0,
+    "shiftright": 0xA1, "alt": 0x12, "altleft": 0xA4, "altright": 0xA5,
+    "win": 0x5B, "winleft": 0x5B, "winright": 0x5C, "command": 0x5B,
+    "tab": 0x09, "enter": 0x0D, "return": 0x0D, "esc": 0x1B, "escape": 0x1B, "space": 0x20, " ": 0x20,
+    "backspace": 0x08, "delete": 0x2E, "del": 0x2E, "up": 0x26, "down": 0x28, "left": 0x25,
+    "right": 0x27, "home": 0x24, "end": 0x23, "pageup": 0x21, "pagedown": 0x22, "printscreen": 0x2C,
+    "volumemute": 0xAD, "volumedown": 0xAE, "volumeup": 0xAF,
+    "nexttrack": 0xB0, "prevtrack": 0xB1, "playpause": 0xB3,
+}
+VK_KEYS.update({f"f{i}": 0x6F + i for i in range(1, 13)})
+VK_EXTENDED = {0x5B, 0x5C, 0x2E, 0x26, 0x28, 0x25, 0x27, 0x24, 0x23, 0x21, 0x22, 0xA3, 0xA5,
+               0xAD, 0xAE, 0xAF, 0xB0, 0xB1, 0xB3}
+
+
+class SendInputActuator(Actuator):
+    """Each batch (a click, a whole chord) is one SendInput call."""
+
+    name = "sendinput"
+
+    def __init__(self, rate=60.0):
+        super().__init__(rate)
+        self.user32 = ctypes.windll.user32
+        self.user32.SetProcessDPIAware()    # physical pixels, like pyautogui
+        self.width = self.user32.GetSystemMetrics(0)
+        self.height = self.user32.GetSystemMetrics(1)
+
+    def size(self):
+        return self.width, self.height
+
+    def _send(self, inputs):
+        batch = (INPUT * len(inputs))(*inputs)
+        sent = self.user32.SendInput(len(inputs), batch, ctypes.sizeof(INPUT))
+        if sent != len(inputs):
+            raise ctypes.WinError()
+
+    def _mouseInput(self, flags, dx=0, dy=0, data=0):
+        return INPUT(INPUT_MOUSE, _INPUTUNION(mi=MOUSEINPUT(dx, dy, data & 0xFFFFFFFF, flags, 0, 0)))
+
+    def _move(self, x, y):
+        # Absolute coordinates are 0..65535 across the primary screen
+        dx = round(x * 65535 / max(self.width - 1, 1))
+        dy = round(y * 65535 / max(self.height - 1, 1))
+        self._send([self._mouseInput(MOUSEEVENTF_MOVE | MOUSEEVENTF_ABSOLUTE, dx, dy)])
+
+    def _mouse(self, events):
+        self._send([self._mouseInput(MOUSE_FLAGS[event]) for event in events])
+
+    def _keys(self, events):
+        inputs = []
+        for key, down in events:
+            vk = VK_KEYS.get(key) or (ord(key.upper()) if len(key) == 1 and key.isalnum() else None)
+            if vk is None:
+                raise ValueError(f"no virtual-key code for {key!r}")
+            flags = (0 if down else KEYEVENTF_KEYUP) | (KEYEVENTF_EXTENDEDKEY if vk in VK_EXTENDED else 0)
+            inputs.append(INPUT(INPUT_KEYBOARD, _INPUTUNION(ki=KEYBDINPUT(vk, 0, flags, 0, 0))))
+        self._send(inputs)
+
+    def _scroll(self, clicks):
+        self._send([self._mouseInput(MOUSEEVENTF_WHEEL, data=clicks)])   # raw wheel delta, as pyautogui
+
+
+# -------------------- Recording fake --------------------
+class FakeActuator(Actuator):
+    """Records what would be injected (plus screenshot / brightness / volume / Luffy calls) instead of doing it.
+
+    Moves are injected on every call by default (rate=0) so replays stay
+    deterministic; latency simulates a slow backend for benchmarks.
+    """
+
+    name = "fake"
+
+    def __init__(self, screen=(1920, 1080), rate=0.0, latency=0.0):
+        super().__init__(rate)
+        self.screen = screen
+        self.latency = latency
+        self.calls = []
+        self.t0 = time.perf_counter()
+
+    def _log(self, name, *args):
+        self.calls.append((round(time.perf_counter() - self.t0, 4), name) + args)
+
+    def _wait(self):
+        if self.latency:
+            time.sleep(self.latency)
+
+    def size(self):
+        return self.screen
+
+    def _move(self, x, y):
+        self._wait()
+        self._log("moveTo", int(x), int(y))
+
+    def _mouse(self, events):
+        self._wait()
+        if len(events) == 2:
+            self._log("click" if events[0][0] == "left" else "rightClick")
+        else:
+            self._log("mouseDown" if events[0][1] else "mouseUp")
+
+    def _keys(self, events):
+        self._wait()
+        keys = [key for key, down in events if down]
+        if len(keys) == 1:
+            self._log("press", keys[0])
+        else:
+            self._log("hotkey", *keys)
+
+    def _scroll(self, clicks):
+        self._wait()
+        self._log("scroll", clicks)
+
+    def take(self, path=None, *args, **kwargs):
+        """Stands in for screencap.ScreenshotService.take."""
+        self._log("screenshot", path)
+        return path
+
+    def set_brightness(self, value, *args, **kwargs):
+        self._log("set_brightness", int(value))
+
+    def SetMasterVolumeLevelScalar(self, level, *args):
+        self._log("set_volume", round(float(level), 3))
+
+    def luffy_main(self):
+        self._log("luffy_main")
+
+    def names(self):
+        """Just the action names, handy for regression comparisons."""
+        return [c[1] for c in self.calls]
+
+    def cursorTrack(self):
+        """(moves, 2) array of every moveTo target, in order."""
+        moves = [c[2:4] for c in self.calls if c[1] == "moveTo"]
+        return np.array(moves, dtype=np.float64).reshape(-1, 2)
+
+
+# -------------------- Backend selection --------------------
+BACKENDS = {"xtest": XTestActuator, "sendinput": SendInputActuator,
+            "pyautogui": PyAutoGuiActuator, "fake": FakeActuator}
+
+
+def makeActuator(spec="auto", rate=60.0):
+    """Named backend, or "auto": SendInput on Windows, XTest on X11, else pyautogui.
+
+    Returns None (after printing why) when the backend, or every "auto" candidate, is unavailable.
+    """
+    if spec != "auto":
+        candidates = [spec]
+    elif sys.platform == "win32":
+        candidates = ["sendinput", "pyautogui"]
+    elif os.environ.get("DISPLAY"):
+        candidates = ["xtest", "pyautogui"]
+    else:
+        candidates = ["pyautogui"]
+    for name in candidates:
+        if name not in BACKENDS:
+            print(f"⚠️ Unknown input backend {name!r}, use one of {', '.join(BACKENDS)}")
+            continue
+        try:
+            return BACKENDS[name](rate=rate)
+        except Exception as e:
+            print(f"⚠️ {name} input unavailable: {e}")
+    return None
+
+
+# -------------------- Benchmark --------------------
+def bench(actuator, moves):
+    """Mean / p95 / max ms per moveTo and per chord, injected synchronously (no coalescing)."""
+    rate, actuator.rate = actuator.rate, 0.0
+    w, h = actuator.size()
+    cx, cy = w // 2, h // 2
+    result = {"backend": actuator.name}
+    for label, action in (("move", lambda i: actuator.moveTo(cx + i % 50, cy)),
+                          ("chord", lambda i: actuator.hotkey("shift", "ctrl"))):
+        times = []
+        for i in range(moves):
+            start = time.perf_counter()
+            action(i)
+            times.append(time.perf_counter() - start)
+        ms = np.array(times) * 1000
+        result[f"{label}_ms_avg"] = round(float(ms.mean()), 3)
+        result[f"{label}_ms_p95"] = round(float(np.percentile(ms, 95)), 3)
+        result[f"{label}_ms_max"] = round(float(ms.max()), 3)
+    actuator.rate = rate
+    return result
+
+
+def benchPyAutoGuiDefault(moves):
+    """The old path: pyautogui.moveTo with its default PAUSE."""
+    import pyautogui
+    pyautogui.PAUSE = 0.1
+    w, h = pyautogui.size()
+    times = []
+    for i in range(moves):
+        start = time.perf_counter()
+        pyautogui.moveTo(w // 2 + i % 50, h // 2)
+        times.append(time.perf_counter() - start)
+    ms = np.array(times) * 1000
+    return {"backend": "pyautogui (PAUSE=0.1)", "move_ms_avg": round(float(ms.mean()), 3),
+            "move_ms_p95": round(float(np.percentile(ms, 95)), 3), "move_ms_max": round(float(ms.max()), 3)}
+
+
+def benchCoalescing(actuator, seconds=1.0, submitHz=240.0):
+    """Cursor updates at submitHz through the coalescer: how many actually reach the OS."""
+    w, h = actuator.size()
+    before = actuator.stats()
+    start = time.perf_counter()
+    i = 0
+    while time.perf_counter() - start < seconds:
+        actuator.moveTo(w // 2 + i % 50, h // 2)
+        i += 1
+        time.sleep(1.0 / submitHz)
+    actuator.close()
+    after = actuator.stats()
+    return {"backend": actuator.name, "submitted": i,
+            "coalesced": after["moves_coalesced"] - before["moves_coalesced"],
+            "injected_per_s": round((after["injections"] - before["injections"]) / seconds, 1)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Input injection backends")
+    parser.add_argument("--bench", action="store_true", help="measure injection latency")
+    parser.add_argument("--backend", action="append", choices=list(BACKENDS),
+                        help="backend(s) to measure (default: every one that loads here)")
+    parser.add_argument("--moves", type=int, default=200, help="calls per measurement")
+    parser.add_argument("--rate", type=float, default=60.0, help="coalesced cursor moves per second")
+    parser.add_argument("--fake-latency-ms", type=float, default=0.0, help="simulated cost per fake injection")
+    parser.add_argument("--skip-default", action="store_true", help="don't time pyautogui with PAUSE=0.1")
+    args = parser.parse_args()
+    if not args.bench:
+        parser.print_help()
+        return
+
+    for name in args.backend or list(BACKENDS):
+        try:
+            if name == "fake":
+                make = lambda: FakeActuator(rate=args.rate, latency=args.fake_latency_ms / 1000)
+            else:
+                make = lambda: BACKENDS[name](rate=args.rate)
+            actuator = make()
+        except Exception as e:
+            print(f"{name:<10} unavailable: {e}")
+            continue
+        print(bench(actuator, args.moves))
+        print(benchCoalescing(actuator))
+    if not args.skip_default:
+        try:
+            print(benchPyAutoGuiDefault(max(1, args.moves // 10)))
+        except Exception as e:
+            print(f"pyautogui  unavailable: {e}")
+
+
+if __name__ == "__main__":
+    main()
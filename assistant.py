@@ -0,0 +1,268 @@
+"""Luffy in its own process, driven by the gesture process over a message channel.
+
+The first activation starts `python assistant.py` as a child process; after a
+session ends it stays dormant (microphone open and calibrated, browser still
+up) and the next activation reuses it. Audio capture, speech recognition, TTS
+and Selenium therefore never compete with hand tracking for the GIL.
+
+Messages are small pickled tuples over a multiprocessing.connection channel on
+localhost, authenticated with a per-run key:
+
+    gesture -> Luffy   ("activate",)  ("shutdown",)
+    Luffy -> gesture   ("status", "ready" | "listening" | "dormant" | "stopped")
+                       ("action", name, *args)     e.g. ("action", "quit")
+
+    python assistant.py          # run one Luffy session in a child process, as the gesture does
+"""
+import argparse
+import os
+import queue
+import secrets
+import subprocess
+import sys
+import threading
+import time
+from multiprocessing.connection import Client, Listener
+
+import startup
+
+AUTHKEY_ENV = "LUFFY_AUTHKEY"
+
+
+class LuffyProcess:
+    """Gesture-process side: starts the worker on first use, forwards activations, reports its status."""
+
+    def __init__(self, onAction=None, onStatus=None):
+        self.onAction = onAction        # onAction(name, *args), called on the channel thread
+        self.onStatus = onStatus        # onStatus(status)
+        self.status = "stopped"
+        self.failed = False
+        self.proc = None
+        self._conn = None
+        self._pending = []              # messages sent before the worker connected
+        self._lock = threading.Lock()
+        self._thread = None
+        self.started = 0.0
+        self.startupTime = None         # process start -> "ready"
+
+    @property
+    def active(self):
+        """True while a session is starting or running (another activation is ignored)."""
+        return self.status in ("starting", "listening")
+
+    def start(self):
+        """Starts the worker (dormant) if it isn't running; returns at once."""
+        with self._lock:
+            if self.proc is not None and self.proc.poll() is None:
+                return self
+            authkey = secrets.token_bytes(16)
+            listener = Listener(("127.0.0.1", 0), authkey=authkey)
+            env = dict(os.environ, **{AUTHKEY_ENV: authkey.hex()})
+            script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assistant.py")
+            try:
+                self.proc = subprocess.Popen([sys.executable, script, "--connect", str(listener.address[1])],
+                                             env=env)
+            except OSError as e:
+                listener.close()
+                self.failed = True
+                print(f"⚠️ Luffy unavailable: {e}")
+                return self
+            self.started = time.perf_counter()
+            self._setStatus("loading")
+            self._thread = threading.Thread(target=self._run, args=(listener,), daemon=True, name="luffy-channel")
+            self._thread.start()
+        return self
+
+    def activate(self):
+        """Starts a voice session (starting the worker first if needed)."""
+        if self.active or self.failed:
+            return False
+        self.start()
+        self._setStatus("starting")
+        self.send(("activate",))
+        return True
+
+    def send(self, msg):
+        with self._lock:
+            if self._conn is None:
+                self._pending.append(msg)
+                return
+            try:
+                self._conn.send(msg)
+            except OSError:
+                pass    # worker gone; _run reports it
+
+    def _setStatus(self, status):
+        if status == self.status:
+            return
+        self.status = status
+        if self.onStatus is not None:
+            self.onStatus(status)
+
+    def _run(self, listener):
+        try:
+            conn = listener.accept()
+        except OSError:
+            return
+        finally:
+            listener.close()
+        try:
+            with self._lock:
+                self._conn = conn
+                for msg in self._pending:
+                    conn.send(msg)      # BrokenPipeError if the worker already died
+                self._pending = []
+            while True:
+                kind, *args = conn.recv()
+                if kind == "status":
+                    if args[0] == "ready" and self.startupTime is None:
+                        self.startupTime = time.perf_counter() - self.started
+                    if args[0] == "ready" and self.status == "starting":
+                        continue    # loaded with an activation already on its way
+                    self._setStatus(args[0])
+                elif kind == "action" and self.onAction is not None:
+                    try:
+                        self.onAction(*args)
+                    except Exception as e:
+                        print(f"⚠️ Luffy action error ({args[0]}): {e}")
+        except (EOFError, OSError):
+            pass
+        with self._lock:
+            self._conn = None
+        if self.proc is not None and self._reap(2.0) != 0:
+            print(f"⚠️ Luffy stopped (exit code {self.proc.returncode})")
+            if self.startupTime is None:
+                self.failed = True      # couldn't even load: don't respawn on every gesture
+        self._setStatus("stopped")
+
+    def close(self, timeout=5.0):
+        """Asks the worker to end its session and release microphone / browser, then waits for it."""
+        if self.proc is None:
+            return
+        self.send(("shutdown",))
+        self._reap(timeout)
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+        if self._thread is not None:
+            self._thread.join(1.0)
+
+    def _reap(self, timeout):
+        """Waits for the worker to exit, terminating it after `timeout` seconds; returns its exit code."""
+        try:
+            return self.proc.wait(timeout)
+        except subprocess.TimeoutExpired:
+            self.proc.terminate()
+        try:
+            return self.proc.wait(2.0)
+        except subprocess.TimeoutExpired:
+            self.proc.kill()
+            return self.proc.wait()
+
+    def stats(self):
+        return {"status": self.status, "pid": self.proc.pid if self.proc else None,
+                "startup_s": round(self.startupTime, 2) if self.startupTime is not None else None}
+
+
+class FakeLuffy:
+    """Stands in for LuffyProcess in replays: activations go to `sink` (e.g. FakeActuator.luffy_main)."""
+
+    status = "stopped"
+    active = False
+    failed = False
+
+    def __init__(self, sink):
+        self.sink = sink
+
+    def activate(self):
+        self.sink()
+        return True
+
+    def start(self):
+        return self
+
+    def close(self):
+        pass
+
+
+# -------------------- Worker process --------------------
+def serve(port, authkey):
+    conn = Client(("127.0.0.1", port), authkey=authkey)
+    sendLock = threading.Lock()
+
+    def send(*msg):
+        with sendLock:
+            try:
+                conn.send(msg)
+            except OSError:
+                pass
+
+    with startup.timed("luffy", "import"):
+        import luffy
+    luffy.on_close_program = lambda: send("action", "quit")
+    activations = queue.Queue()
+
+    def receive():
+        try:
+            while True:
+                kind, *_ = conn.recv()
+                if kind == "activate":
+                    activations.put(True)
+                elif kind == "shutdown":
+                    break
+        except (EOFError, OSError):
+            pass    # the gesture process went away
+        activations.put(None)
+        luffy.shutdown()    # ends a running session: listen() sees the microphone close
+
+    threading.Thread(target=receive, daemon=True, name="luffy-commands").start()
+    send("status", "ready")
+    try:
+        while activations.get():
+            send("status", "listening")
+            try:
+                luffy.luffy_main()
+            except Exception as e:
+                print(f"⚠️ Luffy error: {e}")
+            while not activations.empty():      # activations that came in during the session
+                if activations.get_nowait() is None:
+                    activations.put(None)
+                    break
+            send("status", "dormant")
+    finally:
+        try:
+            luffy.shutdown()
+        finally:
+            send("status", "stopped")   # send() ignores a channel that is already gone
+            conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Luffy worker process")
+    parser.add_argument("--connect", type=int, help="channel port (set by LuffyProcess)")
+    args = parser.parse_args()
+    if args.connect:
+        serve(args.connect, bytes.fromhex(os.environ[AUTHKEY_ENV]))
+        return
+
+    # Stand-alone: drive one session from here, the way virtualmouse.py does
+    done = threading.Event()
+
+    def onStatus(status):
+        print("ℹ️ Luffy is", status)
+        if status in ("dormant", "stopped"):
+            done.set()
+
+    luffy = LuffyProcess(onAction=lambda name, *args: print("↩️ Luffy asks for:", name, *args),
+                         onStatus=onStatus)
+    luffy.activate()
+    try:
+        done.wait()
+    except KeyboardInterrupt:
+        pass
+    luffy.close()
+    print(luffy.stats())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+"""Per-stage latency benchmark for the Sky Pointer vision loop.
+
+Runs the same stages as virtualmouse.py one by one and times each of them:
+capture, color conversion, hands.process, landmark extraction, fingers,
+dispatch, drawing and display. Prints p50 / p95 / p99 per stage plus overall
+throughput as JSON.
+
+    python benchmark.py --source synthetic --frames 300
+    python benchmark.py --source session.npz --model-complexity 0 --output run.json
+    python benchmark.py --source clip.mp4 --baseline run.json   # exit 1 on regression
+"""
+import argparse
+import json
+import sys
+import time
+from collections import OrderedDict
+
+import cv2
+import numpy as np
+
+STAGES = ("capture", "color", "process", "extract", "fingers", "dispatch", "draw", "display")
+
+
+class StageTimer:
+    """Lap timer: call start() once per frame, then lap(stage) after each stage."""
+
+    def __init__(self):
+        self.samples = OrderedDict((name, []) for name in STAGES)
+        self.frame_times = []
+        self.t = self.t_frame = 0.0
+
+    def start(self):
+        self.t = self.t_frame = time.perf_counter()
+
+    def lap(self, stage):
+        now = time.perf_counter()
+        self.samples.setdefault(stage, []).append(now - self.t)
+        self.t = now
+
+    def end_frame(self):
+        self.frame_times.append(time.perf_counter() - self.t_frame)
+
+    def report(self):
+        stages = OrderedDict()
+        for name, values in self.samples.items():
+            if not values:
+                continue
+            ms = np.array(values) * 1000
+            stages[name] = {
+                "mean": round(float(ms.mean()), 3),
+                "p50": round(float(np.percentile(ms, 50)), 3),
+                "p95": round(float(np.percentile(ms, 95)), 3),
+                "p99": round(float(np.percentile(ms, 99)), 3),
+                "max": round(float(ms.max()), 3),
+            }
+        total = np.array(self.frame_times) * 1000
+        return {
+            "frames": len(self.frame_times),
+            "throughput_fps": round(1000 / total.mean(), 1) if len(total) else 0.0,
+            "frame_ms_p50": round(float(np.percentile(total, 50)), 3) if len(total) else 0.0,
+            "frame_ms_p99": round(float(np.percentile(total, 99)), 3) if len(total) else 0.0,
+            "stages": stages,
+        }
+
+
+class SyntheticCapture:
+    """Endless stream of noise frames at a fixed resolution (no camera needed)."""
+
+    def __init__(self, width, height, seed=0):
+        rng = np.random.default_rng(seed)
+        self.frames = [rng.integers(0, 255, (height, width, 3), dtype=np.uint8) for _ in range(8)]
+        self.index = -1
+
+    def read(self):
+        self.index += 1
+        return True, self.frames[self.index % len(self.frames)].copy()
+
+    def release(self):
+        pass
+
+
+def open_source(source, width, height):
+    """Returns (capture, recording or None) for 'synthetic', a camera index, .npz or video."""
+    from replay import ReplayCapture
+    if source == "synthetic":
+        return SyntheticCapture(width, height), None
+    if source.isdigit():
+        cap = cv2.VideoCapture(int(source))
+        cap.set(3, width)
+        cap.set(4, height)
+        return cap, None
+    cap = ReplayCapture(source, realtime=False, loop=True)
+    return cap, cap.recording
+
+
+def run(args):
+    import virtualmouse as vm
+    from Handgesture import HandDetector
+    from actuator import FakeActuator
+    from replay import ReplayDetector
+
+    vm.use_actuator(FakeActuator())
+    cap, recording = open_source(args.source, args.width, args.height)
+    landmarks_only = recording is not None and not recording.has_frames
+    if landmarks_only:
+        vm.detector = ReplayDetector(cap)
+    else:
+        vm.detector = HandDetector(maxHands=args.max_hands, detectionCon=args.detection_con,
+                                   trackCon=args.tracking_con,
+                                   modelComplexity=args.model_complexity, roi=args.roi)
+    detector = vm.detector
+
+    timer = StageTimer()
+    for n in range(args.warmup + args.frames):
+        if n == args.warmup:
+            timer = StageTimer()
+        timer.start()
+        success, img = cap.read()
+        if not success:
+            break
+        if (img.shape[1], img.shape[0]) != (args.width, args.height):
+            img = cv2.resize(img, (args.width, args.height))
+        timer.lap("capture")
+
+        if landmarks_only:
+            # Recorded landmarks stand in for color conversion + inference
+            hands_data = recording.batch(cap.index, detector.handedThumb)
+            timer.lap("extract")
+        else:
+            crop = None
+            if args.roi:
+                # Crop, color conversion and any full-frame fallback are timed as "process"
+                results, crop = detector.process(img)
+            else:
+                imgRGB = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+                timer.lap("color")
+                results = detector.hands.process(imgRGB)
+            timer.lap("process")
+            hands_data = detector.toBatch(results, img.shape, fingers=False, crop=crop)
+            detector.trackRoi(hands_data)
+            timer.lap("extract")
+            hands_data.computeFingers(detector.handedThumb)
+            timer.lap("fingers")
+
+        vm.dispatch(hands_data)
+        timer.lap("dispatch")
+        vm.draw(img, hands_data)
+        timer.lap("draw")
+        if args.display:
+            cv2.imshow("Benchmark", img)
+            cv2.waitKey(1)
+            timer.lap("display")
+        timer.end_frame()
+
+    vm.actions.stop()
+    cap.release()
+    if args.display:
+        cv2.destroyAllWindows()
+
+    report = timer.report()
+    report["config"] = {
+        "source": args.source,
+        "resolution": [args.width, args.height],
+        "model_complexity": args.model_complexity,
+        "detection_con": args.detection_con,
+        "tracking_con": args.tracking_con,
+        "max_hands": args.max_hands,
+        "roi": args.roi,
+        "landmarks_only": landmarks_only,
+    }
+    if args.roi and not landmarks_only:
+        report["roi_frames"] = detector.roiFrames
+        report["full_frames"] = detector.fullFrames
+        report["roi_switch_drops"] = detector.switchDrops
+    return report
+
+
+def compare(report, baseline, tolerance):
+    """Lists stages whose p95 grew by more than `tolerance` (fraction) over the baseline."""
+    regressions = []
+    for name, stats in report["stages"].items():
+        old = baseline.get("stages", {}).get(name)
+        if old and old["p95"] > 0 and stats["p95"] > old["p95"] * (1 + tolerance):
+            regressions.append(f"{name}: p95 {old['p95']} ms -> {stats['p95']} ms")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-stage latency benchmark for Sky Pointer")
+    parser.add_argument("--source", default="synthetic",
+                        help="'synthetic', a camera index, a .npz recording or a video file")
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--width", type=int, default=640)
+    parser.add_argument("--height", type=int, default=480)
+    parser.add_argument("--model-complexity", type=int, default=1, choices=(0, 1))
+    parser.add_argument("--detection-con", type=float, default=0.5)
+    parser.add_argument("--tracking-con", type=float, default=0.5)
+    parser.add_argument("--max-hands", type=int, default=2)
+    parser.add_argument("--roi", action="store_true", help="crop inference to last frame's hands")
+    parser.add_argument("--display", action="store_true", help="also time cv2.imshow / waitKey")
+    parser.add_argument("--output", help="write the JSON report to this file")
+    parser.add_argument("--baseline", help="earlier JSON report to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.15,
+                        help="allowed p95 growth per stage before it counts as a regression")
+    args = parser.parse_args()
+
+    report = run(args)
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        for line in regressions:
+            print(f"⚠️ Regression {line}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
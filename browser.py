@@ -0,0 +1,362 @@
+"""One reusable Chrome session for Luffy's YouTube playback.
+
+The chromedriver path is resolved once and remembered on disk, the browser is
+started on first use (or pre-warmed in the background), every later request
+navigates the same tab, and the browser is quit on exit. The driver factory is
+injectable; FakeDriver stands in for Chrome in tests.
+
+Each session has one AdWatcher. It injects a MutationObserver that clicks
+YouTube's skip button from inside the page, and only polls the page (with
+backoff) to re-inject it after navigation and to count clicks.
+
+    python browser.py --fake "song one" "song two"
+"""
+import argparse
+import atexit
+import json
+import os
+import threading
+import time
+
+import startup
+
+DRIVER_CACHE = os.path.join(os.path.expanduser("~"), ".luffy_chromedriver.json")
+_driverPath = None
+_driverRemembered = False       # _driverPath came from DRIVER_CACHE and may be outdated
+
+
+def driverPath(cache=DRIVER_CACHE, refresh=False):
+    """chromedriver path: $CHROMEDRIVER, else the remembered path, else webdriver-manager (then remembered).
+
+    refresh=True skips the remembered path, e.g. once Chrome has updated past it.
+    """
+    global _driverPath, _driverRemembered
+    if _driverPath and not refresh:
+        return _driverPath
+    path = os.environ.get("CHROMEDRIVER")
+    remembered = False
+    if not path and not refresh:
+        try:
+            with open(cache) as f:
+                path = json.load(f)["path"]
+            remembered = True
+        except (OSError, ValueError, KeyError):
+            path = None
+    if not path or not os.path.exists(path):
+        from webdriver_manager.chrome import ChromeDriverManager
+        path = ChromeDriverManager().install()
+        remembered = False
+        try:
+            with open(cache, "w") as f:
+                json.dump({"path": path}, f)
+        except OSError:
+            pass
+    _driverPath, _driverRemembered = path, remembered
+    return path
+
+
+def driverErrors(driver):
+    """What a driver's calls raise: the driver's own `errors`, else selenium's WebDriverException.
+
+    Imported here, once a driver exists, so importing this module doesn't load selenium.
+    """
+    errors = getattr(driver, "errors", None)
+    if errors is None:
+        from selenium.common.exceptions import WebDriverException as errors
+    return errors
+
+
+def chromeFactory():
+    from selenium import webdriver
+    from selenium.common.exceptions import WebDriverException
+    from selenium.webdriver.chrome.service import Service
+    options = webdriver.ChromeOptions()
+    options.add_argument("--start-maximized")
+    try:
+        return webdriver.Chrome(service=Service(driverPath()), options=options)
+    except WebDriverException as e:
+        if not _driverRemembered:
+            raise
+        # Chrome has probably updated past the remembered driver: fetch a matching one once
+        print(f"⚠️ Remembered chromedriver failed ({e.msg}), fetching a new one")
+        return webdriver.Chrome(service=Service(driverPath(refresh=True)), options=options)
+
+
+# Clicks the skip button whenever the DOM changes; returns the click count for this page
+AD_SKIP_SCRIPT = """
+if (!location.hostname.endsWith("youtube.com")) return null;
+if (!window.__luffyAdObserver) {
+    window.__luffySkips = 0;
+    const selector = arguments[0];
+    const skip = () => {
+        const button = document.querySelector(selector);
+        if (button) { button.click(); window.__luffySkips++; }
+    };
+    window.__luffyAdObserver = new MutationObserver(skip);
+    window.__luffyAdObserver.observe(document.documentElement, {childList: true, subtree: true});
+    skip();
+    return -1;
+}
+return window.__luffySkips;
+"""
+SKIP_BUTTONS = ".ytp-ad-skip-button, .ytp-ad-skip-button-modern, .ytp-skip-ad-button"
+
+
+class AdWatcher:
+    """Keeps the skip-ad observer injected in one session's tab, polling with backoff."""
+
+    def __init__(self, session, minInterval=0.5, maxInterval=8.0):
+        self.session = session
+        self.minInterval = minInterval
+        self.maxInterval = maxInterval
+        self.stopped = False
+        self._wake = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._last = 0
+
+        self.polls = 0
+        self.injections = 0
+        self.clicks = 0
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def kick(self):
+        """The tab navigated: check again right away."""
+        self._wake.set()
+
+    def stop(self):
+        """No driver call is made after this returns when called under the session lock."""
+        self.stopped = True
+        self._wake.set()
+
+    def join(self, timeout=2.0):
+        if self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+
+    def _poll(self):
+        with self.session._lock:
+            if self.stopped:
+                return None
+            self.polls += 1
+            try:
+                count = self.session._driver.execute_script(AD_SKIP_SCRIPT, SKIP_BUTTONS)
+            except self.session._errors:
+                return None
+        if count == -1:
+            self.injections += 1
+            self._last = 0
+            return 0
+        if count is not None and count > self._last:
+            self.clicks += count - self._last
+            self._last = count
+            return count
+        return None
+
+    def _run(self):
+        interval = self.minInterval
+        while not self.stopped:
+            self._wake.wait(interval)
+            if self._wake.is_set():
+                self._wake.clear()
+                interval = self.minInterval
+            if self.stopped:
+                break
+            # Back off while nothing happens; stay quick around navigation and skips
+            changed = self._poll() is not None
+            interval = self.minInterval if changed else min(interval * 2, self.maxInterval)
+
+
+class BrowserSession:
+    def __init__(self, factory=chromeFactory, watchAds=True):
+        self.factory = factory
+        self.watchAds = watchAds
+        self.watcher = None
+        self._driver = None
+        self._tab = None
+        self._errors = ()               # driverErrors() of the live driver
+        self._lock = threading.RLock()
+
+        self.launches = 0
+        self.reuses = 0
+        self.launchTime = 0.0
+        self.retired = []               # stopped watchers, kept for their counters
+        atexit.register(self.close)
+
+    def driver(self):
+        """The live driver, started (or restarted, if the window was closed) when needed."""
+        with self._lock:
+            if self._driver is not None and not self._alive():
+                self._quit()
+            if self._driver is None:
+                start = time.perf_counter()
+                self._driver = self.factory()
+                self._errors = driverErrors(self._driver)
+                self._tab = self._driver.window_handles[0]
+                startup.record("browser", "launch", time.perf_counter() - start)
+                self.launchTime += time.perf_counter() - start
+                self.launches += 1
+                if self.watchAds:
+                    self.watcher = AdWatcher(self).start()
+            else:
+                self.reuses += 1
+            return self._driver
+
+    def _alive(self):
+        """Focuses our tab again; False if the browser (or every tab) has been closed."""
+        try:
+            handles = self._driver.window_handles
+            if not handles:
+                return False
+            if self._tab not in handles:
+                self._tab = handles[0]
+            self._driver.switch_to.window(self._tab)
+            return True
+        except self._errors:
+            return False
+
+    def open(self, url):
+        """Loads url in the session's tab and returns the driver."""
+        with self._lock:
+            driver = self.driver()
+            driver.get(url)
+            if self.watcher is not None:
+                self.watcher.kick()
+            return driver
+
+    def prewarm(self):
+        """Starts the browser in the background so the first request doesn't wait for it."""
+        def run():
+            try:
+                self.driver()
+            except Exception as e:
+                print("⚠️ Browser pre-warm failed:", e)
+        threading.Thread(target=run, daemon=True).start()
+
+    def _quit(self):
+        if self.watcher is not None:
+            self.watcher.stop()
+            self.retired.append(self.watcher)
+            self.watcher = None
+        driver, self._driver = self._driver, None
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def close(self):
+        with self._lock:
+            if self._driver is not None:
+                self._quit()
+        for watcher in self.retired:
+            watcher.join()
+
+    def stats(self):
+        watchers = self.retired + ([self.watcher] if self.watcher else [])
+        return {"launches": self.launches, "reuses": self.reuses,
+                "launch_s": round(self.launchTime, 3),
+                "ad_polls": sum(w.polls for w in watchers),
+                "ad_injections": sum(w.injections for w in watchers),
+                "ads_skipped": sum(w.clicks for w in watchers)}
+
+
+# -------------------- Fake driver for tests --------------------
+class FakeElement:
+    def __init__(self, driver, locator):
+        self.driver = driver
+        self.locator = locator
+
+    def is_displayed(self):
+        return True
+
+    def is_enabled(self):
+        return True
+
+    def click(self):
+        self.driver.clicks.append(self.locator)
+
+
+class _SwitchTo:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def window(self, handle):
+        self.driver._check()
+
+
+class FakeDriverError(Exception):
+    """Raised by FakeDriver once it has been quit, like selenium's WebDriverException."""
+
+
+class FakeDriver:
+    """Records navigation and clicks; every element lookup succeeds.
+
+    execute_script emulates the skip-ad observer: the first call after get()
+    "injects" it (-1), later calls return `skips`, which tests bump to simulate ads.
+    """
+
+    errors = FakeDriverError
+
+    def __init__(self):
+        self.urls = []
+        self.clicks = []
+        self.scripts = 0
+        self.injected = False
+        self.skips = 0
+        self.closed = False
+        self.switch_to = _SwitchTo(self)
+
+    def _check(self):
+        if self.closed:
+            raise FakeDriverError("browser closed")
+
+    @property
+    def window_handles(self):
+        self._check()
+        return ["tab-1"]
+
+    @property
+    def current_url(self):
+        self._check()
+        return self.urls[-1] if self.urls else "about:blank"
+
+    def get(self, url):
+        self._check()
+        self.urls.append(url)
+        self.injected = False
+        self.skips = 0
+
+    def find_element(self, by, value):
+        self._check()
+        return FakeElement(self, (by, value))
+
+    def execute_script(self, script, *args):
+        self._check()
+        self.scripts += 1
+        if not self.injected:
+            self.injected = True
+            return -1
+        return self.skips
+
+    def quit(self):
+        self.closed = True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Open searches in one reused browser session")
+    parser.add_argument("queries", nargs="+")
+    parser.add_argument("--fake", action="store_true", help="use FakeDriver instead of Chrome")
+    args = parser.parse_args()
+
+    session = BrowserSession(FakeDriver if args.fake else chromeFactory)
+    for q in args.queries:
+        start = time.perf_counter()
+        session.open("https://www.youtube.com/results?search_query=" + q.replace(" ", "+"))
+        print(f"{q!r}: {(time.perf_counter() - start) * 1000:.1f} ms")
+    session.close()
+    print(session.stats())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+"""Background setters for slow hardware controls (screen brightness, master volume).
+
+A brightness change can take hundreds of milliseconds through WMI or DDC/CI, so
+the vision loop never calls a device directly. It calls DeviceSetter.set(),
+which only records the latest requested value and returns. Each control has
+its own worker thread that opens the device (COM objects live on that thread),
+applies the newest value at most `maxRate` times a second and drops requests
+that differ from the last one by less than `minDelta`. Values requested while
+an apply is in flight are superseded, never queued.
+
+    python devices.py --latency-ms 250        # a 30 FPS gesture against a slow fake device
+"""
+import argparse
+import threading
+import time
+
+import startup
+
+
+def openBrightness():
+    import screen_brightness_control as sbc
+    return lambda value: sbc.set_brightness(int(value))
+
+
+def openVolume():
+    import comtypes
+    comtypes.CoInitialize()     # this worker thread's apartment
+    from pycaw.pycaw import AudioUtilities, IAudioEndpointVolume
+    devices = AudioUtilities.GetSpeakers()
+    interface = devices.Activate(IAudioEndpointVolume._iid_, comtypes.CLSCTX_ALL, None)
+    endpoint = interface.QueryInterface(IAudioEndpointVolume)
+    return lambda level: endpoint.SetMasterVolumeLevelScalar(float(level), None)
+
+
+class FakeDevice:
+    """Records applied values, taking `latency` seconds per apply like a slow driver."""
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.values = []
+
+    def open(self):
+        return self.apply
+
+    def apply(self, value):
+        time.sleep(self.latency)
+        self.values.append(value)
+
+
+class DeviceSetter:
+    def __init__(self, name, opener, minDelta=0.0, maxRate=10.0):
+        self.name = name
+        self.opener = opener            # called on the worker thread, returns apply(value)
+        self.minDelta = minDelta
+        self.maxRate = maxRate          # applies per second at most (0 = no limit)
+        self.threaded = True
+        self.error = None
+        self._apply = None
+        self._cond = threading.Condition()
+        self._pending = None
+        self._last = None               # last value accepted by set()
+        self._lastApply = float("-inf")
+        self._closed = False
+        self._thread = None
+
+        self.requested = 0
+        self.skipped = 0                # closer than minDelta to the previous value
+        self.superseded = 0             # replaced by a newer value before being applied
+        self.applied = 0
+        self.failed = 0
+        self.applyTime = 0.0
+        self.applyMax = 0.0
+        self.lagTime = 0.0              # set() -> applied, summed
+
+    @property
+    def available(self):
+        return self.error is None
+
+    def use(self, apply, threaded=False):
+        """Applies through `apply` instead of the real device; threaded=False applies inside set()."""
+        with self._cond:
+            self._apply, self.error, self.threaded = apply, None, threaded
+
+    def start(self):
+        """Opens the device on its worker thread now rather than on the first set()."""
+        with self._cond:
+            if self._thread is None and self.threaded:
+                self._thread = threading.Thread(target=self._run, daemon=True, name=f"{self.name}-setter")
+                self._thread.start()
+        return self
+
+    def set(self, value):
+        """Requests value and returns at once. False if it was dropped (too small a change, no device)."""
+        if self.error is not None:
+            return False
+        with self._cond:
+            self.requested += 1
+            if self._last is not None and abs(value - self._last) < self.minDelta:
+                self.skipped += 1
+                return False
+            self._last = value
+            if not self.threaded:
+                self._applyValue(value, time.perf_counter())
+                return True
+            if self._pending is not None:
+                self.superseded += 1
+            self._pending = (value, time.perf_counter())
+            self._cond.notify()
+        self.start()
+        return True
+
+    def _applyValue(self, value, requestedAt):
+        start = time.perf_counter()
+        try:
+            self._apply(value)
+            self.applied += 1
+        except Exception as e:
+            if not self.failed:
+                print(f"⚠️ {self.name} error: {e}")
+            self.failed += 1
+        end = time.perf_counter()
+        self.applyTime += end - start
+        self.applyMax = max(self.applyMax, end - start)
+        self.lagTime += end - requestedAt
+        self._lastApply = end
+
+    def _run(self):
+        if self._apply is None:
+            try:
+                with startup.timed(self.name, "open"):
+                    self._apply = self.opener()
+            except Exception as e:
+                self.error = e
+                print(f"⚠️ {self.name} control unavailable: {e}")
+                return
+        interval = 1.0 / self.maxRate if self.maxRate else 0.0
+        while True:
+            with self._cond:
+                while self._pending is None and not self._closed:
+                    self._cond.wait()
+                if self._pending is None:
+                    return
+                wait = self._lastApply + interval - time.perf_counter()
+                if wait > 0 and not self._closed:
+                    self._cond.wait(wait)   # newer values may arrive meanwhile
+                    continue
+                (value, requestedAt), self._pending = self._pending, None
+            self._applyValue(value, requestedAt)
+
+    def close(self, timeout=2.0):
+        """Applies the last pending value, then stops the worker."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def stats(self):
+        done = self.applied + self.failed
+        return {
+            "device": self.name,
+            "requested": self.requested,
+            "skipped": self.skipped,
+            "superseded": self.superseded,
+            "applied": self.applied,
+            "failed": self.failed,
+            "apply_ms_avg": round(1000 * self.applyTime / done, 1) if done else 0.0,
+            "apply_ms_max": round(1000 * self.applyMax, 1),
+            "lag_ms_avg": round(1000 * self.lagTime / done, 1) if done else 0.0,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Drive a slow fake device the way a held gesture does")
+    parser.add_argument("--latency-ms", type=float, default=250.0, help="fake device apply time")
+    parser.add_argument("--fps", type=float, default=30.0, help="gesture frames per second")
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--min-delta", type=float, default=2.0)
+    parser.add_argument("--max-rate", type=float, default=5.0)
+    args = parser.parse_args()
+
+    device = FakeDevice(args.latency_ms / 1000)
+    setter = DeviceSetter("fake", device.open, args.min_delta, args.max_rate)
+    frames, worst = 0, 0.0
+    start = time.perf_counter()
+    while time.perf_counter() - start < args.seconds:
+        t = time.perf_counter() - start
+        value = 100 * abs((t / 2) % 1 * 2 - 1)      # hand sweeping 100 -> 0 -> 100 every 2 s
+        before = time.perf_counter()
+        setter.set(round(value))
+        worst = max(worst, time.perf_counter() - before)
+        frames += 1
+        time.sleep(1 / args.fps)
+    setter.close()
+    print(f"{frames} frames, longest set() {worst * 1000:.3f} ms, device got {len(device.values)} values")
+    print(setter.stats())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,253 @@
+"""Persistent filename index for Luffy's "open <file>" command.
+
+The index keeps, per directory, its mtime plus the names of its files and
+subdirectories, and is saved to disk between runs. A refresh stats every
+directory but only re-lists the ones whose mtime changed, so keeping the index
+current is far cheaper than the original full os.walk per command.
+
+Lookups search one lowercased "\\n"-joined blob of every filename with
+str.find, so substring queries take milliseconds even for large trees. Results
+are ranked (exact name, prefix, word start, anywhere). When nothing matches,
+the lookup falls back to "all words present" and then to difflib close matches.
+
+    python fileindex.py ~/Documents ~/Downloads --query "resume"
+"""
+import argparse
+import bisect
+import difflib
+import json
+import os
+import threading
+import time
+from collections import namedtuple
+
+DEFAULT_INDEX = os.path.join(os.path.expanduser("~"), ".luffy_files.json")
+EXCLUDE = {"node_modules", "__pycache__", "$Recycle.Bin", "System Volume Information",
+           "AppData", "Windows", "site-packages", "venv", ".venv"}
+MAX_HITS = 5000     # stop scanning after this many substring hits (very short queries)
+
+# Everything a lookup reads, built by _rebuild() and swapped in with one assignment
+Snapshot = namedtuple("Snapshot", [
+    "names",        # lowercased filenames
+    "paths",        # full paths, same order
+    "blob",         # names joined by "\n", with a trailing "\n"
+    "starts",       # offset of each name in blob
+    "stems",        # first letter -> unique lowercased stems (fuzzy fallback)
+    "stemPaths",    # stem -> indices
+])
+EMPTY = Snapshot([], [], "\n", [], {}, {})
+
+
+def default_roots():
+    """Roots from LUFFY_FILE_ROOTS (os.pathsep separated), else the user's home folder."""
+    env = os.environ.get("LUFFY_FILE_ROOTS")
+    if env:
+        return [os.path.expanduser(p) for p in env.split(os.pathsep) if p]
+    return [os.path.expanduser("~")]
+
+
+class FileIndex:
+    def __init__(self, roots=None, path=DEFAULT_INDEX, exclude=EXCLUDE, interval=300.0):
+        self.roots = [os.path.abspath(r) for r in (roots or default_roots())]
+        self.path = path
+        self.exclude = set(exclude)
+        self.interval = interval        # seconds between background refreshes
+
+        self.dirs = {}                  # dir -> (mtime, files, subdirs)
+        self.snapshot = EMPTY           # replaced whole, never mutated
+
+        self.ready = threading.Event()
+        self._stop = threading.Event()
+        self._lock = threading.Lock()   # one refresh at a time
+        self._thread = None
+
+        self.lastRefresh = {}
+
+    # ---------------- Building ----------------
+    def _skip(self, name):
+        return name.startswith(".") or name in self.exclude
+
+    def refresh(self):
+        """Brings the index up to date, re-listing only directories whose mtime changed."""
+        with self._lock:
+            start = time.perf_counter()
+            old, dirs = self.dirs, {}
+            scanned = reused = 0
+            stack = list(self.roots)
+            while stack:
+                d = stack.pop()
+                try:
+                    mtime = os.stat(d).st_mtime
+                except OSError:
+                    continue
+                entry = old.get(d)
+                if entry is not None and entry[0] == mtime:
+                    reused += 1
+                else:
+                    entry = self._list(d, mtime)
+                    if entry is None:
+                        continue
+                    scanned += 1
+                dirs[d] = entry
+                stack.extend(os.path.join(d, s) for s in entry[2])
+            self.dirs = dirs
+            self._rebuild()
+            self.lastRefresh = {"dirs": len(dirs), "scanned": scanned, "reused": reused,
+                                "files": len(self.snapshot.paths),
+                                "seconds": round(time.perf_counter() - start, 3)}
+            self.ready.set()
+            return self.lastRefresh
+
+    def _list(self, d, mtime):
+        files, subdirs = [], []
+        try:
+            with os.scandir(d) as it:
+                for e in it:
+                    if self._skip(e.name):
+                        continue
+                    try:
+                        (subdirs if e.is_dir(follow_symlinks=False) else files).append(e.name)
+                    except OSError:
+                        continue
+        except OSError:
+            return None
+        return mtime, files, subdirs
+
+    def _rebuild(self):
+        names, paths = [], []
+        for d, (_, files, _) in self.dirs.items():
+            for f in files:
+                names.append(f.lower())
+                paths.append(os.path.join(d, f))
+
+        starts, pos = [], 0
+        for n in names:
+            starts.append(pos)
+            pos += len(n) + 1
+        stems, stemPaths = {}, {}
+        for i, n in enumerate(names):
+            stem = os.path.splitext(n)[0]
+            if stem not in stemPaths:
+                stemPaths[stem] = []
+                stems.setdefault(stem[:1], []).append(stem)
+            stemPaths[stem].append(i)
+
+        # A single assignment, so a lookup on another thread sees either the old snapshot or the new one
+        self.snapshot = Snapshot(names, paths, "\n".join(names) + "\n", starts, stems, stemPaths)
+
+    # ---------------- Persistence ----------------
+    def load(self):
+        """Loads a saved index built for the same roots; returns False if there is none."""
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if data.get("roots") != self.roots:
+            return False
+        self.dirs = {d: tuple(v) for d, v in data["dirs"].items()}
+        self._rebuild()
+        self.ready.set()
+        return True
+
+    def save(self):
+        tmp = self.path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump({"roots": self.roots, "dirs": self.dirs}, f)
+        os.replace(tmp, self.path)
+
+    # ---------------- Background ----------------
+    def start(self):
+        """Loads the saved index and keeps it refreshed on a daemon thread. Safe to call twice."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        return self
+
+    def _run(self):
+        self.load()
+        while not self._stop.is_set():
+            self.refresh()
+            try:
+                self.save()
+            except OSError as e:
+                print("File index not saved:", e)
+            self._stop.wait(self.interval)
+
+    def stop(self):
+        self._stop.set()
+
+    # ---------------- Lookup ----------------
+    @staticmethod
+    def _hits(snap, q):
+        blob, starts, hits = snap.blob, snap.starts, []
+        i = blob.find(q)
+        while i != -1 and len(hits) < MAX_HITS:
+            k = bisect.bisect_right(starts, i) - 1
+            hits.append((k, i - starts[k]))
+            nxt = starts[k + 1] if k + 1 < len(starts) else len(blob)
+            i = blob.find(q, nxt)
+        return hits
+
+    @staticmethod
+    def _rank(snap, q, k, at):
+        name = snap.names[k]
+        if name == q or os.path.splitext(name)[0] == q:
+            score = 0
+        elif at == 0:
+            score = 1
+        elif not name[at - 1].isalnum():
+            score = 2
+        else:
+            score = 3
+        return score, len(name), snap.paths[k].count(os.sep)
+
+    def lookup(self, query, limit=5):
+        """Best matching paths for a spoken file name, best first."""
+        snap = self.snapshot    # read once: a refresh may swap it meanwhile
+        q = " ".join(query.lower().split())
+        if not q or not snap.names:
+            return []
+        ranked = sorted(self._hits(snap, q), key=lambda h: self._rank(snap, q, *h))
+        if ranked:
+            return [snap.paths[k] for k, _ in ranked[:limit]]
+
+        # Every word somewhere in the name ("budget 2024" -> "2024_budget_final.xlsx")
+        words = sorted(q.split(), key=len, reverse=True)
+        if len(words) > 1:
+            matches = [k for k, _ in self._hits(snap, words[0])
+                       if all(w in snap.names[k] for w in words[1:])]
+            if matches:
+                matches.sort(key=lambda k: (len(snap.names[k]), snap.paths[k].count(os.sep)))
+                return [snap.paths[k] for k in matches[:limit]]
+
+        # Misheard names: close matches among stems sharing the first letter
+        close = difflib.get_close_matches(q, snap.stems.get(q[:1], []), n=limit, cutoff=0.7)
+        return [snap.paths[k] for stem in close for k in snap.stemPaths[stem]][:limit]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build / query Luffy's file index")
+    parser.add_argument("roots", nargs="*", help="folders to index (default: LUFFY_FILE_ROOTS or home)")
+    parser.add_argument("--index", default=DEFAULT_INDEX, help="index file")
+    parser.add_argument("--query", action="append", default=[], help="name to look up (repeatable)")
+    parser.add_argument("--limit", type=int, default=5)
+    args = parser.parse_args()
+
+    index = FileIndex(args.roots or None, args.index)
+    start = time.perf_counter()
+    loaded = index.load()
+    print(f"Loaded saved index: {loaded} ({time.perf_counter() - start:.3f}s)")
+    print("Refresh:", index.refresh())
+    index.save()
+
+    for q in args.query:
+        start = time.perf_counter()
+        results = index.lookup(q, args.limit)
+        print(f"\n{q!r}: {len(results)} result(s) in {(time.perf_counter() - start) * 1000:.2f} ms")
+        for p in results:
+            print("  ", p)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Cursor filters for normalized landmark coordinates.
+
+Every filter is called as f(hand, t, point) -> filtered point, where point is a
+normalized (x, y) landmark and t is in seconds. State lives in preallocated
+(maxHands, dims) NumPy arrays, one row per hand slot.
+"""
+import math
+
+import numpy as np
+
+
+class NoFilter:
+    """Passes points straight through (useful as a baseline)."""
+
+    def __init__(self, maxHands=2, dims=2):
+        pass
+
+    def __call__(self, hand, t, point):
+        return np.asarray(point, dtype=np.float64)
+
+    def reset(self, hand=None):
+        pass
+
+
+class ExponentialFilter:
+    """The old fixed blend: prev + (target - prev) / smoothening, once per frame."""
+
+    def __init__(self, maxHands=2, dims=2, smoothening=5):
+        self.smoothening = smoothening
+        self.x = np.zeros((maxHands, dims))
+        self.ready = np.zeros(maxHands, dtype=bool)
+
+    def __call__(self, hand, t, point):
+        x = self.x[hand]
+        if self.ready[hand]:
+            x += (np.asarray(point) - x) / self.smoothening
+        else:
+            x[:] = point
+            self.ready[hand] = True
+        return x.copy()
+
+    def reset(self, hand=None):
+        self.ready[slice(None) if hand is None else hand] = False
+
+
+class OneEuroFilter:
+    """One-Euro filter: smooths hard when the hand is still, opens up when it moves fast.
+
+    cutoff = minCutoff + beta * |speed|, with speed in normalized units / s and
+    itself low-passed at dCutoff (Hz).
+    """
+
+    def __init__(self, maxHands=2, dims=2, minCutoff=1.0, beta=10.0, dCutoff=1.0):
+        self.minCutoff = minCutoff
+        self.beta = beta
+        self.dCutoff = dCutoff
+        self.x = np.zeros((maxHands, dims))
+        self.dx = np.zeros((maxHands, dims))
+        self.t = np.zeros(maxHands)
+        self.ready = np.zeros(maxHands, dtype=bool)
+
+    @staticmethod
+    def _alpha(cutoff, dt):
+        tau = 1.0 / (2 * math.pi * cutoff)
+        return 1.0 / (1.0 + tau / dt)
+
+    def __call__(self, hand, t, point):
+        x, dx = self.x[hand], self.dx[hand]
+        point = np.asarray(point, dtype=np.float64)
+        dt = t - self.t[hand]
+        if not self.ready[hand] or dt <= 0:
+            if not self.ready[hand]:
+                x[:] = point
+                dx[:] = 0
+                self.t[hand] = t
+                self.ready[hand] = True
+            return x.copy()
+
+        a_d = self._alpha(self.dCutoff, dt)
+        dx += a_d * ((point - x) / dt - dx)
+        cutoff = self.minCutoff + self.beta * float(np.hypot(*dx[:2]))
+        x += self._alpha(cutoff, dt) * (point - x)
+        self.t[hand] = t
+        return x.copy()
+
+    def reset(self, hand=None):
+        self.ready[slice(None) if hand is None else hand] = False
+
+
+FILTERS = {"one-euro": OneEuroFilter, "ema": ExponentialFilter, "none": NoFilter}
+
+
+def makeFilter(name="one-euro", maxHands=2, **params):
+    """Builds a cursor filter by name ('one-euro', 'ema', 'none')."""
+    return FILTERS[name](maxHands=maxHands, **params)
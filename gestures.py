@@ -0,0 +1,78 @@
+"""Table-driven gesture lookup.
+
+The five finger states of a hand are packed into a 5-bit key (thumb = bit 4,
+pinky = bit 0, so the key reads like the "01100" patterns in gestures.json).
+Each hand side has a 32-entry table built once from the config, so matching
+a hand is a single list index however many gestures are configured.
+
+Patterns may use "x" for "don't care"; exact patterns win over wildcards.
+"""
+import json
+import os
+
+import numpy as np
+
+DEFAULT_CONFIG = os.path.join(os.path.dirname(os.path.abspath(__file__)), "gestures.json")
+KEY_WEIGHTS = np.array([16, 8, 4, 2, 1], dtype=np.int32)  # Thumb .. Pinky
+
+
+class Gesture:
+    """One table entry: which action to run, plus its label, timing and parameters."""
+    __slots__ = ("pattern", "action", "label", "cooldown", "edge", "params")
+
+    def __init__(self, pattern, spec):
+        spec = dict(spec)
+        self.pattern = pattern
+        self.action = spec.pop("action")
+        self.label = spec.pop("label", self.action)
+        self.cooldown = float(spec.pop("cooldown", 0.0))
+        self.edge = bool(spec.pop("edge", False))
+        self.params = spec
+
+    def __repr__(self):
+        return f"Gesture({self.pattern!r}, {self.action!r})"
+
+
+def patternKeys(pattern):
+    """All 5-bit keys matched by a pattern such as "011xx"."""
+    if len(pattern) != 5 or any(c not in "01x" for c in pattern):
+        raise ValueError(f"Bad gesture pattern {pattern!r}: use 5 characters of 0, 1 or x")
+    keys = [0]
+    for c in pattern:
+        keys = [k * 2 + b for k in keys for b in ((0, 1) if c == "x" else (int(c),))]
+    return keys
+
+
+class GestureEngine:
+    def __init__(self, config):
+        self.flip = bool(config.get("flip_handedness", True))
+        self.tables = {}
+        for side, gestures in config.get("hands", {}).items():
+            table = [None] * 32
+            # Wildcards first so exact patterns overwrite them
+            for pattern in sorted(gestures, key=lambda p: -p.count("x")):
+                gesture = Gesture(pattern, gestures[pattern])
+                for key in patternKeys(pattern):
+                    table[key] = gesture
+            self.tables[side] = table
+
+    @classmethod
+    def load(cls, path=DEFAULT_CONFIG):
+        with open(path) as f:
+            return cls(json.load(f))
+
+    def side(self, hand_type):
+        """Physical hand for a MediaPipe label. The preview isn't mirrored, so labels are swapped."""
+        if self.flip:
+            return "left" if hand_type == "right" else "right"
+        return hand_type
+
+    def match(self, hands_data):
+        """Yields (index, hand, side, gesture or None) for every detected hand."""
+        if not len(hands_data):
+            return
+        keys = (hands_data.fingers @ KEY_WEIGHTS).tolist()
+        for i, (hand, key) in enumerate(zip(hands_data, keys)):
+            side = self.side(hand.type)
+            table = self.tables.get(side)
+            yield i, hand, side, table[key] if table else None
@@ -0,0 +1,190 @@
+"""Idle power saving: poll for hands at a low rate while nobody is in view.
+
+IdleGovernor wraps a HandDetector (same findHands interface, like
+PredictiveTracker). After `idleAfter` seconds without a hand it goes idle:
+inference runs only `idleHz` times a second, on frames downscaled to
+`idleWidth` px, with a lighter detector (model_complexity=0), and the camera is
+asked for that resolution too. The first idle pass that finds a hand wakes it
+up: that pass's hands are returned at full-frame scale, so they already drive
+the gestures, and the next frame goes through the full detector again.
+
+Loops read frames through read(), so while idle they sleep between polls
+instead of decoding, tracking and drawing every camera frame. Resolution
+changes run on their own thread; read() waits for one in progress, but the
+frame that woke the governor is already dispatched by then.
+"""
+import threading
+import time
+
+import cv2
+
+from Handgesture import HandBatch
+
+
+class IdleGovernor:
+    """HandDetector stand-in that switches between full-rate tracking and low-rate idle polling."""
+
+    def __init__(self, detector, light=None, idleAfter=30.0, idleHz=4.0, idleWidth=320,
+                 capture=None, clock=time.perf_counter):
+        self.detector = detector
+        self.lightFactory = light       # returns the idle detector, built on first idle; None = reuse detector
+        self.light = None
+        self.idleAfter = idleAfter
+        self.idleHz = idleHz
+        self.idleWidth = idleWidth
+        self.capture = capture          # live VideoCapture: resized with the state, paced by read()
+        self.maxDrain = 8               # queued frames skipped at most before an idle poll
+        self.captureLock = threading.Lock()     # read() vs. resolution changes
+        self.captureSize = None         # resolution the camera should switch to
+        self.appliedSize = None
+        self.clock = clock
+        self.idle = False
+        self.shape = None               # full-rate frame shape; idle hands are reported at this scale
+        self.lastSeen = None
+        self.lastPoll = None
+        self.since = None               # when the current state began
+
+        self.seconds = {"active": 0.0, "idle": 0.0}
+        self.frames = {"active": 0, "idle": 0}
+        self.polls = 0
+        self.sleeps = 0
+        self.wakes = 0
+        self.fullTime = 0.0             # detector time over all active frames
+        self.lightTime = 0.0            # idle detector time over all polls
+        self.switchMax = 0.0            # longest camera resolution change
+
+    @property
+    def state(self):
+        return "idle" if self.idle else "active"
+
+    @property
+    def handedThumb(self):
+        return self.detector.handedThumb
+
+    def drawHands(self, img, hands_data, bbox=True):
+        return self.detector.drawHands(img, hands_data, bbox)
+
+    def read(self, cap):
+        """cap.read() for the vision loop.
+
+        While idle on a live camera it sleeps until the next poll is due, then skips
+        the frames the driver queued meanwhile (grab() without decoding) and returns
+        a fresh one.
+        """
+        if not self.idle or self.capture is None or self.lastPoll is None:
+            with self.captureLock:
+                return cap.read()
+        pause = self.lastPoll + 1.0 / self.idleHz - self.clock()
+        if pause > 0:
+            time.sleep(pause)
+        with self.captureLock:
+            for _ in range(self.maxDrain):
+                start = time.perf_counter()
+                if not cap.grab():
+                    return False, None
+                if time.perf_counter() - start > 0.004:
+                    break       # had to wait for it, so it wasn't queued during the pause
+            return cap.retrieve()
+
+    def findHands(self, img, draw=True):
+        t = self.clock()
+        if self.since is None:
+            self.since = self.lastSeen = t
+        self.frames[self.state] += 1
+        hands_data = self._poll(img, t) if self.idle else self._infer(img, t)
+        if draw:
+            self.drawHands(img, hands_data)
+        return img, hands_data
+
+    def _infer(self, img, t):
+        if self.shape is None or img.shape[1] >= self.shape[1]:
+            self.shape = img.shape
+        start = time.perf_counter()
+        _, hands_data = self.detector.findHands(img, draw=False)
+        self.fullTime += time.perf_counter() - start
+        if len(hands_data):
+            self.lastSeen = t
+        elif t - self.lastSeen >= self.idleAfter:
+            self._switch(True, t)
+        return self._fullScale(hands_data)
+
+    def _poll(self, img, t):
+        if self.lastPoll is not None and t - self.lastPoll < 1.0 / self.idleHz:
+            return HandBatch.empty(self.shape)
+        self.lastPoll = t
+        small = img
+        if img.shape[1] > self.idleWidth:
+            height = round(img.shape[0] * self.idleWidth / img.shape[1])
+            small = cv2.resize(img, (self.idleWidth, height), interpolation=cv2.INTER_AREA)
+        start = time.perf_counter()
+        _, hands_data = self.light.findHands(small, draw=False)
+        self.lightTime += time.perf_counter() - start
+        self.polls += 1
+        if len(hands_data):
+            self.lastSeen = t
+            self._switch(False, t)
+        return self._fullScale(hands_data)
+
+    def _fullScale(self, hands_data):
+        """Landmarks are normalized, so only the pixel arrays need the full-rate frame size."""
+        if hands_data.shape[:2] == self.shape[:2]:
+            return hands_data
+        return HandBatch(hands_data.landmarks, hands_data.types, self.shape, self.handedThumb)
+
+    def _switch(self, idle, t):
+        self.seconds[self.state] += t - self.since
+        self.since = t
+        self.idle = idle
+        self.lastPoll = None            # poll on the first idle frame
+        if idle:
+            self.sleeps += 1
+            if self.light is None:
+                self.light = self.lightFactory() if self.lightFactory else self.detector
+        else:
+            self.wakes += 1
+        if self.capture is not None:
+            width = self.idleWidth if idle else self.shape[1]
+            self.captureSize = (width, round(self.shape[0] * width / self.shape[1]))
+            threading.Thread(target=self._resize, daemon=True, name="camera-resize").start()
+
+    def _resize(self):
+        """Applies the newest captureSize; a driver can take hundreds of ms to reconfigure."""
+        with self.captureLock:
+            size = self.captureSize
+            if size == self.appliedSize:
+                return
+            start = time.perf_counter()
+            self.capture.set(cv2.CAP_PROP_FRAME_WIDTH, size[0])
+            self.capture.set(cv2.CAP_PROP_FRAME_HEIGHT, size[1])
+            self.appliedSize = size
+            self.switchMax = max(self.switchMax, time.perf_counter() - start)
+
+    def stats(self):
+        """Time and frames per state, and the inference CPU idle polling saved."""
+        seconds = dict(self.seconds)
+        if self.since is not None:
+            seconds[self.state] += self.clock() - self.since
+        active, idle = self.frames["active"], self.frames["idle"]
+        full = self.fullTime / active if active else 0.0
+        light = self.lightTime / self.polls if self.polls else 0.0
+        # Frames a full-rate loop would have tracked while idle; read() never even decodes most of them
+        rate = active / seconds["active"] if seconds["active"] else 0.0
+        skipped = max(idle, round(seconds["idle"] * rate))
+        saved = skipped * full - self.lightTime
+        total = seconds["active"] + seconds["idle"]
+        return {
+            "active_s": round(seconds["active"], 1),
+            "idle_s": round(seconds["idle"], 1),
+            "idle_pct": round(100.0 * seconds["idle"] / total, 1) if total else 0.0,
+            "sleeps": self.sleeps,
+            "wakes": self.wakes,
+            "frames_active": active,
+            "frames_idle": idle,
+            "frames_skipped_est": skipped,
+            "idle_polls": self.polls,
+            "inference_ms_full": round(full * 1000, 2),
+            "inference_ms_idle": round(light * 1000, 2),
+            "cpu_saved_s": round(saved, 3),
+            "cpu_saved_pct": round(100.0 * saved / ((active + skipped) * full), 1) if full else 0.0,
+            "switch_ms_max": round(self.switchMax * 1000, 1),
+        }
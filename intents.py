@@ -0,0 +1,152 @@
+"""Compiled intent router for Luffy.
+
+All command patterns are joined into one anchored regex, one named group per
+intent, tried in priority order. A single match() call returns the intent and
+its slots (song name, file name, site, search term, ...), so more specific
+commands such as "open calculator" always win over catch-alls like
+"open <something>".
+
+    python intents.py --bench      # latency + accuracy per intent on intent_corpus.json
+"""
+import argparse
+import json
+import os
+import re
+import time
+from collections import defaultdict
+
+CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "intent_corpus.json")
+
+# Words that can follow the city without being part of it ("weather in delhi right now please")
+_FILLER = (r"(?:today|tonight|tomorrow|right|now|currently|outside|please"
+           r"|at the moment|this (?:morning|afternoon|evening|week))")
+
+# (intent, pattern, anywhere) in priority order. anywhere=True matches the
+# pattern anywhere in the utterance, otherwise it must start the utterance.
+INTENTS = [
+    ("exit",            r"\b(?:exit|quit)\b", True),
+    ("close_program",   r"close hand gesture", True),
+    ("close_it",        r"\bclose it\b", True),
+    ("stop_reading",    r"\b(?:stop|enough|be quiet)(?: reading| it| now| please| luffy)*\s*$", True),
+
+    ("open_app",        r"open (?P<app>calculator|command prompt)\b", False),
+    ("open_notepad",    r"open notepad\s*$", False),
+    ("open_target",     r"open (?P<target>.+)", False),
+    ("close_tab",       r"close (?:the )?(?:current )?tab\s*$", False),
+    ("close_target",    r"close (?P<target>.+)", False),
+
+    ("write_note",      r"\bwrite (?:a )?notes?\b", True),
+    ("read_notes",      r"\bread (?:my )?(?:last (?P<count>\w+) )?notes?\b", True),
+    ("search_notes",    r"\b(?:search|find) (?:in )?(?:my )?notes (?:for|about|with) (?P<term>.+)", True),
+
+    ("search_youtube",  r"\bsearch youtube for (?P<term>.+)", True),
+    ("search_web",      r"\bsearch for (?P<term>.+)", True),
+
+    ("play_playlist",   r"play (?P<name>(?=.*\bplaylist\b).+?) on youtube\b", False),
+    ("play_song",       r"play (?P<name>.+?) on youtube\b", False),
+    ("play_music",      r"play\b.*\b(?:music|songs?)\b", False),
+    ("play_unknown",    r"play\b", False),     # "play <anything else>": ask what to play
+
+    ("play_pause",      r"\b(?:play|pause|resume)\b", True),
+    ("next_track",      r"\b(?:next song|next track|skip)\b", True),
+    ("previous_track",  r"\b(?:previous song|previous track)\b", True),
+    ("volume_up",       r"\bvolume up\b", True),
+    ("volume_down",     r"\bvolume down\b", True),
+    ("mute",            r"\bmute\b", True),
+
+    ("shutdown",        r"\bshut ?down\b", True),
+    ("restart",         r"\brestart\b", True),
+    ("lock",            r"\block\b", True),
+
+    ("time",            r"\btime\b", True),
+    ("date",            r"\bdate\b", True),
+    ("battery",         r"\bbattery\b", True),
+    ("weather",         r"\b(?:weather|temperature)\b(?:.*?\bin (?P<city>[a-z][a-z ]*?)(?=(?: " + _FILLER + ")*$))?", True),
+
+    ("screenshot",      r"\bscreen ?shot\b", True),
+    ("change_tab",      r"\b(?:change|switch|next) tab\b", True),
+    ("minimize_all",    r"\bminimi[sz]e all\b", True),
+    ("maximize_window", r"\bmaximi[sz]e(?: the)? window\b", True),
+]
+
+_SLOT = re.compile(r"\(\?P<(\w+)>")
+
+
+class IntentRouter:
+    def __init__(self, intents=INTENTS):
+        parts = []
+        self.names = []
+        for intent, pattern, anywhere in intents:
+            # Slot groups are prefixed with their intent so names stay unique in the joined regex
+            body = _SLOT.sub(lambda m: f"(?P<{intent}__{m.group(1)}>", pattern)
+            parts.append(f"(?P<{intent}>{'.*?' if anywhere else ''}{body})")
+            self.names.append(intent)
+        self.regex = re.compile("^(?:" + "|".join(parts) + ")")
+
+    def route(self, text):
+        """Returns (intent, slots). Empty input gives ("none", {}), no match ("unknown", {})."""
+        text = " ".join(text.lower().split())
+        if not text:
+            return "none", {}
+        m = self.regex.match(text)
+        if m is None:
+            return "unknown", {}
+        intent = m.lastgroup
+        prefix = intent + "__"
+        slots = {k[len(prefix):]: v.strip() for k, v in m.groupdict().items()
+                 if v is not None and k.startswith(prefix)}
+        return intent, slots
+
+
+# -------------------- Benchmark --------------------
+def benchmark(router, corpus, repeat=200):
+    """Routes every corpus sample `repeat` times; returns accuracy and latency per intent."""
+    per_intent = defaultdict(lambda: {"samples": 0, "correct": 0, "times": []})
+    failures = []
+    for sample in corpus:
+        text, expected = sample["text"], sample["intent"]
+        start = time.perf_counter()
+        for _ in range(repeat):
+            intent, slots = router.route(text)
+        elapsed = (time.perf_counter() - start) / repeat
+
+        stats = per_intent[expected]
+        stats["samples"] += 1
+        stats["times"].append(elapsed)
+        if intent == expected and slots == sample.get("slots", {}):
+            stats["correct"] += 1
+        else:
+            failures.append({"text": text, "expected": expected, "got": intent, "slots": slots})
+
+    report = {}
+    for intent, stats in sorted(per_intent.items()):
+        times = sorted(stats["times"])
+        report[intent] = {
+            "samples": stats["samples"],
+            "accuracy": round(stats["correct"] / stats["samples"], 3),
+            "mean_us": round(sum(times) / len(times) * 1e6, 2),
+            "max_us": round(times[-1] * 1e6, 2),
+        }
+    total = sum(s["samples"] for s in report.values())
+    correct = sum(round(s["accuracy"] * s["samples"]) for s in report.values())
+    return {"accuracy": round(correct / total, 3) if total else 0.0,
+            "intents": report, "failures": failures}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Luffy intent router")
+    parser.add_argument("text", nargs="*", help="utterance to route")
+    parser.add_argument("--bench", action="store_true", help="run the corpus benchmark")
+    parser.add_argument("--corpus", default=CORPUS)
+    args = parser.parse_args()
+
+    router = IntentRouter()
+    if args.bench:
+        with open(args.corpus) as f:
+            print(json.dumps(benchmark(router, json.load(f)), indent=2))
+    else:
+        print(router.route(" ".join(args.text)))
+
+
+if __name__ == "__main__":
+    main()
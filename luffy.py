@@ -1,97 +1,167 @@
-import speech_recognition as sr
-import pyttsx3
 import os
 import sys
 import webbrowser
 import datetime
 import psutil
-import pyautogui
 import time
-import requests
 import subprocess
 import threading
 
-# Selenium imports
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager  # ✅ Auto driver manager
+from urllib.parse import quote_plus
 
-# ---------------- Configuration ----------------
-engine = pyttsx3.init()
-engine.setProperty("rate", 170)
+import startup
+from actuator import makeActuator
+from browser import BrowserSession
+from fileindex import FileIndex
+from intents import IntentRouter
+from notes import NotesStore, chunks
+from screencap import ScreenshotService
+from tts import Speaker, makeEngine
+from voice import Listener, makeRecognizer, makeSource
+from webclient import WeatherService
 
+# ---------------- Configuration ----------------
+# LUFFY_TTS=null or file:<path> runs without audio hardware
+speaker = Speaker(makeEngine(os.environ.get("LUFFY_TTS", "pyttsx3")))
+listener = None             # opened on first activation, then kept open
+weather = WeatherService()  # pooled session, timeouts, per-city cache
+DEFAULT_CITY = "Delhi"
+notes = NotesStore()        # notes.log, appended line by line
+reading_stop = threading.Event()
+browser = BrowserSession()  # one Chrome + ad skipper, started on first "play", reused after that
+
+actuator = None             # keys without pyautogui's PAUSE, built on the first key press
+actuator_tried = False
+screenshots = ScreenshotService(".", os.environ.get("LUFFY_SCREENSHOT_FORMAT", "png"))
+on_close_program = None     # set by assistant.py: asks the gesture process to quit
 last_opened_website = None
+file_index = FileIndex()    # roots from LUFFY_FILE_ROOTS, else the home folder
 
 # ---------------- Voice Functions ----------------
-def speak(text):
+def speak(text, **kw):
+    """Queues text on the TTS worker and returns at once (kw: priority, interrupt, key, wait)."""
     print("🗣️ Luffy:", text)
-    engine.say(text)
-    engine.runAndWait()
+    return speaker.speak(text, **kw)
+
+def start_listener():
+    """Opens the microphone once (LUFFY_MIC=<file.wav> and LUFFY_RECOGNIZER=fake:<file> for tests)."""
+    global listener
+    if listener is None:
+        wav = os.environ.get("LUFFY_MIC")
+        listener = Listener(makeSource(wav), makeRecognizer(os.environ.get("LUFFY_RECOGNIZER", "google")),
+                            calibrate=0 if wav else 1.0, ignore=speaker.busy)
+    print("🎙️ Listening...")
+    return listener.start()
 
 def listen():
-    r = sr.Recognizer()
-    with sr.Microphone() as source:
-        print("🎙️ Listening...")
-        r.adjust_for_ambient_noise(source, duration=0.5)
-        audio = r.listen(source, phrase_time_limit=6)
-    try:
-        query = r.recognize_google(audio, language="en-in")
+    speaker.wait()  # don't let the microphone pick up Luffy's own reply
+    query = listener.get()
+    if query is None:
+        raise EOFError("Microphone input ended")
+    if query:
         print("👉 You said:", query)
-        return query.lower()
-    except:
-        return ""
+    return query.lower()
 
 # ---------------- Utility Functions ----------------
-def get_weather(city="Delhi"):
+def get_weather(city=DEFAULT_CITY):
     try:
-        url = f"https://wttr.in/{city}?format=%t"
-        temp = requests.get(url).text.strip()
-        return temp
-    except:
+        return weather.temperature(city)
+    except Exception:
         return "I cannot fetch the weather right now"
 
+def open_in_editor(path):
+    """Opens path in Notepad on Windows, the default app elsewhere; False if nothing could open it."""
+    if sys.platform == "win32":
+        command = ["notepad.exe", path]
+    elif sys.platform == "darwin":
+        command = ["open", path]
+    else:
+        command = ["xdg-open", path]
+    try:
+        subprocess.Popen(command)
+        return True
+    except OSError as e:
+        print(f"⚠️ Could not open {path}: {e}")
+        return False
+
 def write_notes_to_file():
     speak("Okay master, speak to write. Say 'save note' when done.")
-    notes = []
     while True:
         text = listen()
         if "save note" in text or "stop writing" in text:
             break
         elif text:
-            notes.append(text)
+            notes.add(text)     # saved right away, so nothing is lost if Luffy stops mid-way
             speak(f"Added: {text}")
-    filename = "notes.txt"
-    with open(filename, "w") as f:
-        f.write("\n".join(notes))
-    os.system("notepad.exe " + filename)
-    speak("Notes saved and opened in Notepad")
-
-def read_notes():
-    filename = "notes.txt"
-    if os.path.exists(filename):
-        with open(filename, "r") as f:
-            content = f.read().strip()
-        if content:
-            speak("Here are your notes.")
-            speak(content)
-        else:
-            speak("Your notes file is empty.")
+    if open_in_editor(notes.path):
+        speak("Notes saved and opened")
     else:
+        speak(f"Notes saved to {notes.path}")
+
+def read_aloud(texts):
+    """Speaks texts sentence by sentence, keeping one sentence queued ahead.
+
+    Saying "stop" meanwhile (or stop_reading()) cuts it short: while reading, the
+    listener hands phrases it would drop as Luffy's own voice to barge_in().
+    """
+    reading_stop.clear()
+    if listener is not None:
+        listener.bargeIn = barge_in
+    try:
+        playing = None
+        for text in texts:
+            for sentence in chunks(text):
+                if reading_stop.is_set():
+                    return
+                queued = speak(sentence, key=object())  # never merge two identical sentences
+                if playing is not None:
+                    playing.wait()
+                playing = queued
+    finally:
+        if listener is not None:
+            listener.bargeIn = None
+
+def barge_in(text):
+    """Called on a recognizer thread with a phrase heard while Luffy reads; True if it stopped the reading."""
+    if router.route(text)[0] != "stop_reading":
+        return False
+    print("👉 You said:", text)
+    stop_reading()
+    return True
+
+def stop_reading():
+    reading_stop.set()
+    speaker.interrupt()
+
+def read_notes(count=10):
+    recent = notes.last(count)
+    if not recent:
         speak("No notes found. Please create some notes first.")
+        return
+    speak("Here is your latest note." if len(recent) == 1 else f"Here are your last {len(recent)} notes.")
+    read_aloud(text for _, text in recent)
+
+def search_notes(term):
+    found = notes.search(term)
+    if not found:
+        speak(f"I found no notes about {term}.")
+        return
+    speak(f"I found {len(found)} notes about {term}.")
+    read_aloud(f"From {when:%d %B}: {text}" for when, text in found)
 
 def open_file(file_name):
+    if not file_index.ready.is_set():
+        speak("I am still indexing your files, please try again in a moment.")
+        return None
+    # "open report dot pdf file" -> "report.pdf"
+    name = " ".join(w for w in file_name.replace(" dot ", ".").split() if w != "file")
     try:
-        for root, dirs, files in os.walk("C:\\"):
-            for file in files:
-                if file_name.lower() in file.lower():
-                    file_path = os.path.join(root, file)
-                    os.startfile(file_path)
-                    speak(f"Opening {file}")
-                    return file
+        matches = file_index.lookup(name)
+        if matches:
+            file = os.path.basename(matches[0])
+            os.startfile(matches[0])
+            speak(f"Opening {file}")
+            return file
         speak(f"Sorry, I could not find {file_name}")
     except Exception as e:
         speak("Error while opening file")
@@ -123,45 +193,46 @@ def open_website(name):
     except:
         speak(f"Could not open {name}")
 
+def send_keys(*keys):
+    """Presses one key, or several as a chord. False (and says so) if there is no input backend."""
+    global actuator, actuator_tried
+    if not actuator_tried:
+        actuator_tried = True
+        with startup.timed("actuator", "init"):
+            actuator = makeActuator(os.environ.get("LUFFY_ACTUATOR", "auto"))
+    if actuator is None:
+        speak("Keyboard control is not available on this computer.")
+        return False
+    if len(keys) == 1:
+        actuator.press(keys[0])
+    else:
+        actuator.hotkey(*keys)
+    return True
+
 def close_website(name):
     global last_opened_website
     if last_opened_website and name in last_opened_website:
-        pyautogui.hotkey("ctrl", "w")
+        if not send_keys("ctrl", "w"):
+            return
         speak(f"Closed {name} tab")
         last_opened_website = None
     else:
         speak(f"No tab with {name} was opened recently.")
 
 # ---------------- Selenium YouTube Playback ----------------
-def skip_ads_selenium(driver):
-    while last_opened_website == "youtube":
-        try:
-            skip_button = driver.find_element(By.CLASS_NAME, "ytp-ad-skip-button")
-            skip_button.click()
-        except:
-            pass
-        time.sleep(2)
-
 def play_youtube(query, is_playlist=False):
     """Play a song or playlist on YouTube using Selenium"""
+    # Imported here: selenium.webdriver loads every browser's driver module
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
     global last_opened_website
     last_opened_website = "youtube"
 
-    options = webdriver.ChromeOptions()
-    options.add_argument("--start-maximized")
-
-    # ✅ Auto-install driver with webdriver-manager
-    service = Service(ChromeDriverManager().install())
-    driver = webdriver.Chrome(service=service, options=options)
-
-    driver.get("https://www.youtube.com")
-
-    search_box = WebDriverWait(driver, 10).until(
-        EC.presence_of_element_located((By.NAME, "search_query"))
-    )
-    search_box.clear()
-    search_box.send_keys(query)
-    search_box.send_keys(Keys.RETURN)
+    url = "https://www.youtube.com/results?search_query=" + quote_plus(query)
+    if is_playlist:
+        url += "&sp=EgIQAw%253D%253D"  # playlists only
+    driver = browser.open(url)
 
     try:
         if is_playlist:
@@ -174,189 +245,217 @@ def play_youtube(query, is_playlist=False):
             )
         first_item.click()
         time.sleep(5)
-        pyautogui.press("f")  # Fullscreen
+        send_keys("f")  # Fullscreen
     except:
         speak("Could not find the video or playlist to play.")
-        driver.quit()
         return
 
-    threading.Thread(target=skip_ads_selenium, args=(driver,), daemon=True).start()
+# ---------------- Intent Handlers ----------------
+# Each handler gets the slots captured by the router; returning False ends the session.
+def do_exit(slots):
+    speak("Goodbye! Luffy is closing now.", wait=True)
+    return False
 
-# ---------------- Main Luffy Function ----------------
-def luffy_main():
+def do_close_program(slots):
+    speak("Okay, closing the hand gesture program.", wait=True)
+    if on_close_program is not None:
+        on_close_program()  # the gesture process shuts down, and shuts this worker down with it
+    return False
+
+def do_close_it(slots):
+    global last_opened_website
+    if not send_keys("ctrl", "w"):
+        return
+    if last_opened_website:
+        speak(f"Closed {last_opened_website} tab")
+        last_opened_website = None
+    else:
+        speak("Closed the current tab")
+
+def do_open_app(slots):
+    if slots["app"] == "calculator":
+        speak("Opening Calculator")
+        os.system("calc.exe")
+    else:
+        speak("Opening Command Prompt")
+        os.system("start cmd")
+
+def do_open_notepad(slots):
+    speak("Do you want me to write in Notepad?")
+    choice = listen()
+    subprocess.Popen(["notepad.exe"])
+    time.sleep(1)
+    if "yes" in choice:
+        speak("Start speaking. Say 'stop writing' to finish.")
+        while True:
+            text = listen()
+            if "stop writing" in text or "save note" in text:
+                speak("Finished writing in Notepad.")
+                break
+            elif text:
+                import pyautogui    # typing whole lines; only this command needs it
+                pyautogui.typewrite(text + "\n")
+
+def do_open_target(slots):
+    target = slots["target"]
+    if "." in target or " dot " in target or "file" in target:
+        open_file(target)
+    else:
+        open_website(target)
+
+def do_close_target(slots):
+    target = slots["target"]
+    if "tab" in target or "browser" in target:
+        close_website(target)
+    else:
+        close_app(target)
+
+def do_search_web(slots):
+    speak(f"Searching {slots['term']}")
+    webbrowser.open(f"https://www.google.com/search?q={slots['term']}")
+
+def do_search_youtube(slots):
     global last_opened_website
-    speak("Hi, I am Luffy. Ready for your command!")
+    speak(f"Searching YouTube for {slots['term']}")
+    webbrowser.open(f"https://www.youtube.com/results?search_query={slots['term']}")
+    last_opened_website = "youtube"
 
-    while True:
-        query = listen()
+def do_play_playlist(slots):
+    name = " ".join(w for w in slots["name"].split() if w != "playlist")
+    if name:
+        speak(f"Playing playlist {name} on YouTube")
+        threading.Thread(target=play_youtube, args=(name, True), daemon=True).start()
 
-        # --- Exit ---
-        if "exit" in query or "quit" in query:
-            speak("Goodbye! Luffy is closing now.")
-            break
+def do_play_song(slots):
+    speak(f"Playing {slots['name']} on YouTube")
+    threading.Thread(target=play_youtube, args=(slots["name"], False), daemon=True).start()
 
-        elif "close hand gesture" in query:
-            speak("Okay, closing the hand gesture program.")
-            os._exit(0)
-
-        # --- Close current tab ---
-        elif "close it" in query:
-            if last_opened_website:
-                pyautogui.hotkey("ctrl", "w")
-                speak(f"Closed {last_opened_website} tab")
-                last_opened_website = None
-            else:
-                pyautogui.hotkey("ctrl", "w")
-                speak("Closed the current tab")
-
-        # --- File Handling ---
-        elif query.startswith("open "):
-            file_name = query.replace("open", "").strip()
-            if file_name == "notepad":
-                speak("Do you want me to write in Notepad?")
-                choice = listen()
-                subprocess.Popen(["notepad.exe"])
-                time.sleep(1)
-                if "yes" in choice:
-                    speak("Start speaking. Say 'stop writing' to finish.")
-                    while True:
-                        text = listen()
-                        if "stop writing" in text or "save note" in text:
-                            speak("Finished writing in Notepad.")
-                            break
-                        elif text:
-                            pyautogui.typewrite(text + "\n")
-            elif file_name:
-                if "." in file_name or "file" in file_name:
-                    open_file(file_name)
-                else:
-                    open_website(file_name)
-
-        elif query.startswith("close "):
-            target = query.replace("close", "").strip()
-            if target:
-                if target == "notepad":
-                    close_app("notepad")
-                elif "tab" in target or "browser" in target:
-                    close_website(target)
-                else:
-                    close_app(target)
-
-        # --- Notes ---
-        elif "write note" in query:
-            write_notes_to_file()
-        elif "read notes" in query:
-            read_notes()
-
-        # --- Apps ---
-        elif "open calculator" in query:
-            speak("Opening Calculator")
-            os.system("calc.exe")
-        elif "open command prompt" in query:
-            speak("Opening Command Prompt")
-            os.system("start cmd")
-
-        # --- Web Searches ---
-        elif "search for" in query:
-            search_term = query.replace("search for", "").strip()
-            if search_term:
-                speak(f"Searching {search_term}")
-                webbrowser.open(f"https://www.google.com/search?q={search_term}")
-
-        elif "search youtube for" in query:
-            search_term = query.replace("search youtube for", "").strip()
-            if search_term:
-                speak(f"Searching YouTube for {search_term}")
-                webbrowser.open(f"https://www.youtube.com/results?search_query={search_term}")
-                last_opened_website = "youtube"
-
-        # --- Play YouTube (song / playlist / music) ---
-        elif query.startswith("play"):
-            if "playlist" in query and "on youtube" in query:
-                playlist_name = query.replace("play", "").replace("playlist", "").replace("on youtube", "").strip()
-                if playlist_name:
-                    speak(f"Playing playlist {playlist_name} on YouTube")
-                    threading.Thread(target=play_youtube, args=(playlist_name, True), daemon=True).start()
-            elif "on youtube" in query:
-                song_name = query.replace("play", "").replace("on youtube", "").strip()
-                if song_name:
-                    speak(f"Playing {song_name} on YouTube")
-                    threading.Thread(target=play_youtube, args=(song_name, False), daemon=True).start()
-            elif "music" in query or "song" in query:
-                speak("Playing random music on YouTube")
-                threading.Thread(target=play_youtube, args=("music", False), daemon=True).start()
-            else:
-                speak("Please tell me what you want me to play.")
-
-        # --- Media Controls ---
-        elif "play" in query or "pause" in query:
-            pyautogui.press("playpause")
-            speak("Toggled play/pause")
-        elif "next song" in query or "skip" in query:
-            pyautogui.press("nexttrack")
-            speak("Next track")
-        elif "previous song" in query:
-            pyautogui.press("prevtrack")
-            speak("Previous track")
-        elif "volume up" in query:
-            pyautogui.press("volumeup")
-            speak("Volume up")
-        elif "volume down" in query:
-            pyautogui.press("volumedown")
-            speak("Volume down")
-        elif "mute" in query:
-            pyautogui.press("volumemute")
-            speak("Muted")
-
-        # --- System ---
-        elif "shutdown" in query:
-            speak("Shutting down your PC")
-            os.system("shutdown /s /t 5")
-        elif "restart" in query:
-            speak("Restarting your PC")
-            os.system("shutdown /r /t 5")
-        elif "lock" in query:
-            speak("Locking your PC")
-            os.system("rundll32.exe user32.dll,LockWorkStation")
-
-        # --- Info ---
-        elif "time" in query:
-            str_time = datetime.datetime.now().strftime("%H:%M:%S")
-            speak(f"The time is {str_time}")
-        elif "date" in query:
-            str_date = datetime.datetime.now().strftime("%A, %d %B %Y")
-            speak(f"Today is {str_date}")
-        elif "battery" in query:
-            battery = psutil.sensors_battery()
-            if battery:
-                speak(f"Battery is at {battery.percent} percent")
-            else:
-                speak("I cannot read the battery level right now")
-        elif "weather" in query or "temperature" in query:
-            temp = get_weather()
-            speak(f"The temperature is {temp}")
-
-        # --- Gestures via voice ---
-        elif "screenshot" in query:
-            speak("Taking screenshot")
-            filename = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S.png")
-            pyautogui.screenshot(filename)
-            speak("Screenshot saved")
-        elif "change tab" in query:
-            pyautogui.hotkey("ctrl", "tab")
-            speak("Tab changed")
-        elif "close tab" in query:
-            pyautogui.hotkey("ctrl", "w")
-            speak("Tab closed")
-        elif "minimize all" in query:
-            pyautogui.hotkey("win", "d")
-            speak("Windows minimized")
-        elif "maximize window" in query:
-            pyautogui.hotkey("win", "up")
-            speak("Window maximized")
-        else:
-            if query:
-                speak("I did not understand. Please try again.")
+def do_play_music(slots):
+    speak("Playing random music on YouTube")
+    threading.Thread(target=play_youtube, args=("music", False), daemon=True).start()
+
+def do_battery(slots):
+    battery = psutil.sensors_battery()
+    if battery:
+        speak(f"Battery is at {battery.percent} percent")
+    else:
+        speak("I cannot read the battery level right now")
+
+def do_screenshot(slots):
+    if screenshots.take():
+        speak("Screenshot taken")
+    else:
+        speak("I could not take a screenshot")
+
+NUMBER_WORDS = {"one": 1, "two": 2, "three": 3, "four": 4, "five": 5,
+                "six": 6, "seven": 7, "eight": 8, "nine": 9, "ten": 10}
+
+def parse_count(word, default=10):
+    if not word:
+        return default
+    return int(word) if word.isdigit() else NUMBER_WORDS.get(word, default)
+
+def do_unknown(slots):
+    speak("I did not understand. Please try again.")
+
+def press(key, reply):
+    def handler(slots):
+        if send_keys(key):
+            speak(reply)
+    return handler
+
+def hotkey(keys, reply):
+    def handler(slots):
+        if send_keys(*keys):
+            speak(reply)
+    return handler
+
+def system(command, reply):
+    def handler(slots):
+        speak(reply)
+        os.system(command)
+    return handler
+
+HANDLERS = {
+    "exit": do_exit,
+    "close_program": do_close_program,
+    "close_it": do_close_it,
+    "stop_reading": lambda slots: stop_reading(),
+    "open_app": do_open_app,
+    "open_notepad": do_open_notepad,
+    "open_target": do_open_target,
+    "close_tab": hotkey(("ctrl", "w"), "Tab closed"),
+    "close_target": do_close_target,
+    "write_note": lambda slots: write_notes_to_file(),
+    "read_notes": lambda slots: read_notes(parse_count(slots.get("count"))),
+    "search_notes": lambda slots: search_notes(slots["term"]),
+    "search_youtube": do_search_youtube,
+    "search_web": do_search_web,
+    "play_playlist": do_play_playlist,
+    "play_song": do_play_song,
+    "play_music": do_play_music,
+    "play_unknown": lambda slots: speak("Please tell me what you want me to play."),
+    "play_pause": press("playpause", "Toggled play/pause"),
+    "next_track": press("nexttrack", "Next track"),
+    "previous_track": press("prevtrack", "Previous track"),
+    "volume_up": press("volumeup", "Volume up"),
+    "volume_down": press("volumedown", "Volume down"),
+    "mute": press("volumemute", "Muted"),
+    "shutdown": system("shutdown /s /t 5", "Shutting down your PC"),
+    "restart": system("shutdown /r /t 5", "Restarting your PC"),
+    "lock": system("rundll32.exe user32.dll,LockWorkStation", "Locking your PC"),
+    "time": lambda slots: speak(f"The time is {datetime.datetime.now().strftime('%H:%M:%S')}"),
+    "date": lambda slots: speak(f"Today is {datetime.datetime.now().strftime('%A, %d %B %Y')}"),
+    "battery": do_battery,
+    "weather": lambda slots: speak(f"The temperature is {get_weather(slots.get('city', DEFAULT_CITY))}"),
+    "screenshot": do_screenshot,
+    "change_tab": hotkey(("ctrl", "tab"), "Tab changed"),
+    "minimize_all": hotkey(("win", "d"), "Windows minimized"),
+    "maximize_window": hotkey(("win", "up"), "Window maximized"),
+    "unknown": do_unknown,
+    "none": lambda slots: None,
+}
+
+router = IntentRouter()
+
+def shutdown():
+    """Ends a running session and releases the microphone, browser, screenshots and TTS."""
+    stop_reading()
+    if listener is not None:
+        listener.stop()     # a waiting listen() raises EOFError
+    browser.close()
+    screenshots.close()
+    speaker.close()
+    if actuator is not None:
+        actuator.close()
+
+# ---------------- Main Luffy Function ----------------
+def luffy_main(report=False):
+    file_index.start()
+    weather.prefetch([DEFAULT_CITY])
+    if os.environ.get("LUFFY_PREWARM_BROWSER"):
+        browser.prewarm()
+    try:
+        start_listener()
+        speak("Hi, I am Luffy. Ready for your command!")
+        if report:
+            speaker.wait()
+            startup.report("Luffy")
+        while True:
+            intent, slots = router.route(listen())
+            if HANDLERS[intent](slots) is False:
+                break
+    except (EOFError, OSError) as e:     # microphone gone, or the gesture process closed the channel
+        print(f"⚠️ Luffy stopped listening: {e}")
+    finally:
+        stop_reading()
+        if listener is not None:
+            listener.pause()
+        screenshots.close()
 
 if __name__ == "__main__":
-    luffy_main()
+    startup.record("luffy", "import", time.perf_counter() - startup.T0)
+    try:
+        luffy_main(report=True)
+    finally:
+        shutdown()
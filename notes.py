@@ -0,0 +1,187 @@
+"""Append-only notes store for Luffy.
+
+Every dictated line is appended to notes.log as "<ISO time>\\t<text>" and
+fsync'd straight away, so a crash loses at most the line being spoken. A
+small side index (notes.log.idx) holds one fixed-size (offset, timestamp)
+record per note, so the last N notes are read with two seeks, and keyword
+search walks the log backwards in blocks, stopping as soon as it has enough.
+
+Long notes are read out in sentence-sized chunks (see chunks()) so TTS can
+start at once and reading can be stopped between sentences.
+
+    python notes.py add "buy milk"      python notes.py last 3      python notes.py search milk
+"""
+import argparse
+import datetime
+import os
+import re
+import struct
+import threading
+
+RECORD = struct.Struct("<qd")      # byte offset of the line in the log, unix time
+BLOCK = 256                         # index records read per step when searching
+_SENTENCE = re.compile(r"(?<=[.!?])\s+")
+
+
+def _parse(line):
+    """(datetime, text) for a log line, or None if it doesn't start with a valid timestamp."""
+    stamp, tab, text = line.partition("\t")
+    if not tab:
+        return None
+    try:
+        return datetime.datetime.fromisoformat(stamp), text
+    except ValueError:
+        return None
+
+
+class NotesStore:
+    def __init__(self, path="notes.log", legacy="notes.txt"):
+        self.path = path
+        self.indexPath = path + ".idx"
+        self._lock = threading.Lock()
+        if not os.path.exists(path) and legacy and os.path.exists(legacy):
+            self._import(legacy)
+        self._repair()
+
+    # ---------------- Writing ----------------
+    def add(self, text, when=None):
+        """Appends one note durably; returns its number (0-based)."""
+        text = " ".join(text.split())
+        if not text:
+            return None
+        when = when or datetime.datetime.now()
+        line = f"{when.isoformat(timespec='seconds')}\t{text}\n".encode("utf-8")
+        with self._lock:
+            with open(self.path, "ab") as log:
+                offset = log.tell()
+                log.write(line)
+                log.flush()
+                os.fsync(log.fileno())
+            with open(self.indexPath, "ab") as idx:
+                idx.write(RECORD.pack(offset, when.timestamp()))
+                n = idx.tell() // RECORD.size - 1
+        return n
+
+    def _import(self, legacy):
+        """One-off migration of the old overwrite-style notes.txt."""
+        when = datetime.datetime.fromtimestamp(os.path.getmtime(legacy))
+        with open(legacy, encoding="utf-8", errors="replace") as f:
+            for line in f:
+                self.add(line, when)
+
+    def _repair(self):
+        """Re-indexes lines appended to the log after the last good index record (e.g. after a crash).
+
+        Lines without a valid timestamp (added by hand, or by another program) are left unindexed.
+        """
+        if not os.path.exists(self.path):
+            return
+        size = os.path.getsize(self.path)
+        count = len(self)
+        if os.path.exists(self.indexPath) and os.path.getsize(self.indexPath) != count * RECORD.size:
+            with open(self.indexPath, "ab") as idx:
+                idx.truncate(count * RECORD.size)     # half-written record
+        end = 0
+        if count:
+            offset, _ = self._record(count - 1)
+            with open(self.path, "rb") as log:
+                log.seek(offset)
+                end = offset + len(log.readline())
+        if end >= size:
+            return
+        with open(self.path, "rb+") as log, open(self.indexPath, "ab") as idx:
+            log.seek(end)
+            offset = end
+            for line in log:
+                if not line.endswith(b"\n"):
+                    log.truncate(offset)    # half-written last line
+                    break
+                note = _parse(line.decode("utf-8", "replace"))
+                if note is not None:
+                    idx.write(RECORD.pack(offset, note[0].timestamp()))
+                offset += len(line)
+
+    # ---------------- Reading ----------------
+    def __len__(self):
+        try:
+            return os.path.getsize(self.indexPath) // RECORD.size
+        except OSError:
+            return 0
+
+    def _record(self, i):
+        with open(self.indexPath, "rb") as idx:
+            idx.seek(i * RECORD.size)
+            return RECORD.unpack(idx.read(RECORD.size))
+
+    def _range(self, start, stop):
+        """Notes start..stop-1 as (datetime, text), read with one seek each into index and log."""
+        if start >= stop:
+            return []
+        with open(self.indexPath, "rb") as idx:
+            idx.seek(start * RECORD.size)
+            offsets = [off for off, _ in RECORD.iter_unpack(idx.read((stop - start) * RECORD.size))]
+        end = self._record(stop)[0] if stop < len(self) else os.path.getsize(self.path)
+        with open(self.path, "rb") as log:
+            log.seek(offsets[0])
+            data = log.read(end - offsets[0])
+        notes = (_parse(line) for line in data.decode("utf-8", "replace").splitlines())
+        return [note for note in notes if note is not None]    # skips unindexed foreign lines
+
+    def last(self, n=5):
+        """The n most recent notes, oldest first."""
+        count = len(self)
+        return self._range(max(0, count - n), count)
+
+    def search(self, keyword, limit=5):
+        """Newest notes containing every word of keyword (case-insensitive), newest first."""
+        words = keyword.lower().split()
+        found = []
+        stop = len(self)
+        while stop > 0 and len(found) < limit:
+            start = max(0, stop - BLOCK)
+            for when, text in reversed(self._range(start, stop)):
+                lowered = text.lower()
+                if all(w in lowered for w in words):
+                    found.append((when, text))
+                    if len(found) == limit:
+                        break
+            stop = start
+        return found
+
+
+def chunks(text, maxLen=200):
+    """Splits text into sentences, breaking very long ones at commas / spaces."""
+    for sentence in _SENTENCE.split(text.strip()):
+        while len(sentence) > maxLen:
+            cut = sentence.rfind(", ", 0, maxLen) + 1
+            if cut <= 0:
+                cut = sentence.rfind(" ", 0, maxLen)
+            if cut <= 0:
+                cut = maxLen
+            yield sentence[:cut].strip()
+            sentence = sentence[cut:].strip()
+        if sentence:
+            yield sentence
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Luffy's notes log")
+    parser.add_argument("command", choices=["add", "last", "search"])
+    parser.add_argument("args", nargs="*")
+    parser.add_argument("--path", default="notes.log")
+    args = parser.parse_args()
+
+    store = NotesStore(args.path)
+    if args.command == "add":
+        print("note", store.add(" ".join(args.args)))
+        return
+    if args.command == "last":
+        notes = store.last(int(args.args[0]) if args.args else 5)
+    else:
+        notes = store.search(" ".join(args.args))
+    for when, text in notes:
+        print(f"{when:%Y-%m-%d %H:%M}  {text}")
+
+
+if __name__ == "__main__":
+    main()
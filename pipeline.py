@@ -0,0 +1,166 @@
+import threading
+import time
+from collections import deque
+
+
+class LatestQueue:
+    """Bounded queue that keeps only the newest items and counts the ones it drops."""
+
+    def __init__(self, maxsize=1):
+        self.maxsize = maxsize
+        self.items = deque()
+        self.cond = threading.Condition()
+        self.closed = False
+        self.put_count = 0
+        self.dropped = 0
+
+    def put(self, item):
+        with self.cond:
+            if len(self.items) >= self.maxsize:
+                self.items.popleft()
+                self.dropped += 1
+            self.items.append(item)
+            self.put_count += 1
+            self.cond.notify()
+
+    def get(self, timeout=None):
+        """Returns the oldest pending item, or None on timeout / close."""
+        with self.cond:
+            if not self.items and not self.closed:
+                self.cond.wait(timeout)
+            if not self.items:
+                return None
+            return self.items.popleft()
+
+    def close(self):
+        with self.cond:
+            self.closed = True
+            self.cond.notify_all()
+
+
+class FramePacket:
+    """One camera frame and everything computed from it as it moves down the pipeline."""
+    __slots__ = ("id", "t_capture", "img", "hands")
+
+    def __init__(self, frame_id, t_capture, img):
+        self.id = frame_id
+        self.t_capture = t_capture
+        self.img = img
+        self.hands = None
+
+
+class Pipeline:
+    """Runs capture, inference, dispatch and render as separate stages.
+
+    Capture, inference and dispatch each get a thread; render runs on the calling
+    thread because cv2.imshow must stay on the main thread on most platforms.
+    Stages are joined by LatestQueue, so a slow stage skips to the newest frame
+    instead of working through a backlog. With render=None the pipeline runs
+    headless; render_fps caps how often the newest frame is rendered. read
+    replaces cap.read for capture (e.g. IdleGovernor.read, which paces it).
+    """
+
+    def __init__(self, cap, infer, dispatch, render=None, render_fps=None, read=None):
+        self.cap = cap
+        self.read = read or cap.read
+        self.infer = infer          # infer(packet) fills packet.hands
+        self.dispatch = dispatch    # dispatch(packet) performs the gesture actions
+        self.render = render        # render(packet, pipeline) -> False to stop
+        self.render_interval = 1.0 / render_fps if render_fps else 0.0
+
+        self.infer_q = LatestQueue()
+        self.dispatch_q = LatestQueue()
+        self.render_q = LatestQueue()
+        self.running = False
+        self.threads = []
+
+        self.captured = 0
+        self.dispatched = 0
+        self.latency_sum = 0.0
+        self.last_latency = 0.0
+
+    # ---------------- Stages ----------------
+    def _capture_loop(self):
+        while self.running:
+            success, img = self.read()
+            if not success:
+                if not self.cap.isOpened():
+                    self.running = False
+                    break
+                time.sleep(0.005)
+                continue
+            self.captured += 1
+            self.infer_q.put(FramePacket(self.captured, time.time(), img))
+
+    def _infer_loop(self):
+        while self.running:
+            packet = self.infer_q.get(timeout=0.1)
+            if packet is None:
+                continue
+            self.infer(packet)
+            self.dispatch_q.put(packet)
+            if self.render is not None:
+                self.render_q.put(packet)
+
+    def _dispatch_loop(self):
+        while self.running:
+            packet = self.dispatch_q.get(timeout=0.1)
+            if packet is None:
+                continue
+            self.dispatch(packet)
+            self.dispatched += 1
+            self.last_latency = time.time() - packet.t_capture
+            self.latency_sum += self.last_latency
+
+    # ---------------- Control ----------------
+    def start(self):
+        self.running = True
+        for target in (self._capture_loop, self._infer_loop, self._dispatch_loop):
+            t = threading.Thread(target=target, daemon=True)
+            t.start()
+            self.threads.append(t)
+
+    def stop(self):
+        self.running = False
+        for q in (self.infer_q, self.dispatch_q, self.render_q):
+            q.close()
+        for t in self.threads:
+            t.join(timeout=1.0)
+        self.threads = []
+
+    def run(self):
+        """Starts the worker stages and renders on this thread until render returns False."""
+        self.start()
+        next_render = 0.0
+        try:
+            while self.running:
+                if self.render is None:
+                    time.sleep(0.1)
+                    continue
+                delay = next_render - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)   # frames arriving meanwhile are dropped by render_q
+                packet = self.render_q.get(timeout=0.1)
+                if packet is None:
+                    continue
+                next_render = time.perf_counter() + self.render_interval
+                if self.render(packet, self) is False:
+                    break
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
+        return self.stats()
+
+    def stats(self):
+        """Frame counts, per-queue drops and camera-to-dispatch latency in milliseconds."""
+        avg = self.latency_sum / self.dispatched if self.dispatched else 0.0
+        return {
+            "captured": self.captured,
+            "dispatched": self.dispatched,
+            "dropped_before_inference": self.infer_q.dropped,
+            "dropped_before_dispatch": self.dispatch_q.dropped,
+            "dropped_before_render": self.render_q.dropped,
+            "latency_ms_last": round(self.last_latency * 1000, 1),
+            "latency_ms_avg": round(avg * 1000, 1),
+        }
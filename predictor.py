@@ -0,0 +1,252 @@
+"""Reduced-rate hand inference with motion prediction in between.
+
+PredictiveTracker wraps a HandDetector (same findHands interface). MediaPipe
+runs only on the frames picked by InferenceScheduler; on the other frames the
+last HandBatch is shifted along each hand's predicted index-fingertip motion,
+so cursor movement keeps display rate while inference CPU drops. Predictor
+state follows each hand by its type, not by its row in MediaPipe's output.
+"""
+import time
+
+import numpy as np
+
+from Handgesture import HandBatch
+
+TIP = 8  # index fingertip drives the cursor
+
+
+# -------------------- Predictors --------------------
+def matchHands(prevKeys, prevTips, keys, tips):
+    """Row of the previous state for each new hand, or -1 for a hand that wasn't there.
+
+    Hands are matched by key (MediaPipe's "left" / "right"; MediaPipe may list
+    them in either order), and by nearest fingertip among hands with the same key.
+    """
+    order = np.full(len(keys), -1, dtype=np.intp)
+    for key in set(keys):
+        new = [j for j, k in enumerate(keys) if k == key]
+        old = [i for i, k in enumerate(prevKeys) if k == key]
+        pairs = sorted((float(np.hypot(*(tips[j] - prevTips[i]))), j, i) for j in new for i in old)
+        for _, j, i in pairs:
+            if order[j] < 0 and i in old:
+                order[j] = i
+                old.remove(i)
+    return order
+
+
+class ConstantVelocityPredictor:
+    """Extrapolates each hand's fingertip from its last two measurements."""
+
+    def __init__(self, maxHorizon=0.15, blend=0.6):
+        self.maxHorizon = maxHorizon    # never extrapolate further than this (s)
+        self.blend = blend              # weight of the newest velocity estimate
+        self.t = None
+        self.keys = []
+        self.pos = np.zeros((0, 2))
+        self.vel = np.zeros((0, 2))
+
+    def reset(self, t, points, keys=None):
+        self.t = t
+        self.pos = np.array(points, dtype=np.float64)
+        self.vel = np.zeros_like(self.pos)
+        self.keys = list(keys) if keys is not None else [None] * len(self.pos)
+
+    def update(self, t, points, keys=None):
+        """points: (hands, 2) normalized fingertip positions measured at time t; keys: each hand's type."""
+        if self.t is None:
+            return self.reset(t, points, keys)
+        points = np.array(points, dtype=np.float64)
+        keys = list(keys) if keys is not None else [None] * len(points)
+        order = matchHands(self.keys, self.predict(t), keys, points)
+        known, prev = order >= 0, order[order >= 0]
+        vel = np.zeros_like(points)     # hands without a match start at rest
+        vel[known] = self.vel[prev]
+        dt = t - self.t
+        if dt > 0:
+            measured = (points[known] - self.pos[prev]) / dt
+            vel[known] = self.blend * measured + (1 - self.blend) * self.vel[prev]
+        self.t, self.pos, self.vel, self.keys = t, points, vel, keys
+
+    def predict(self, t):
+        dt = min(max(t - self.t, 0.0), self.maxHorizon)
+        return self.pos + self.vel * dt
+
+
+class KalmanPredictor:
+    """Constant-velocity Kalman filter per hand, batched over all hands (state x, y, vx, vy)."""
+
+    H = np.array([[1.0, 0, 0, 0], [0, 1.0, 0, 0]])
+
+    def __init__(self, maxHorizon=0.15, q=50.0, r=1e-5):
+        self.maxHorizon = maxHorizon
+        self.q = q      # process noise (acceleration variance, normalized units / s^2)
+        self.r = r      # measurement noise variance (normalized units^2)
+        self.t = None
+        self.keys = []
+        self.x = np.zeros((0, 4))
+        self.P = np.zeros((0, 4, 4))
+
+    def _F(self, dt):
+        F = np.eye(4)
+        F[0, 2] = F[1, 3] = dt
+        return F
+
+    def _Q(self, dt):
+        a, b, c = dt ** 4 / 4, dt ** 3 / 2, dt ** 2
+        return self.q * np.array([[a, 0, b, 0], [0, a, 0, b], [b, 0, c, 0], [0, b, 0, c]])
+
+    def _initial(self, points):
+        x = np.zeros((len(points), 4))
+        x[:, :2] = points
+        return x, np.tile(np.diag([self.r, self.r, 1.0, 1.0]), (len(points), 1, 1))
+
+    def reset(self, t, points, keys=None):
+        self.t = t
+        self.x, self.P = self._initial(points)
+        self.keys = list(keys) if keys is not None else [None] * len(points)
+
+    def update(self, t, points, keys=None):
+        if self.t is None:
+            return self.reset(t, points, keys)
+        points = np.asarray(points, dtype=np.float64)
+        keys = list(keys) if keys is not None else [None] * len(points)
+        dt = max(t - self.t, 1e-3)
+        F, H = self._F(dt), self.H
+        predicted = self.x @ F.T
+        order = matchHands(self.keys, predicted[:, :2], keys, points)
+        known, prev = order >= 0, order[order >= 0]
+
+        x, P = self._initial(points)    # hands without a match start fresh
+        if known.any():
+            xk = predicted[prev]
+            Pk = F @ self.P[prev] @ F.T + self._Q(dt)
+            S = H @ Pk @ H.T + self.r * np.eye(2)           # (n, 2, 2)
+            K = Pk @ H.T @ np.linalg.inv(S)                  # (n, 4, 2)
+            innovation = points[known] - xk[:, :2]
+            x[known] = xk + np.einsum("nij,nj->ni", K, innovation)
+            P[known] = (np.eye(4) - K @ H) @ Pk
+        self.t, self.x, self.P, self.keys = t, x, P, keys
+
+    def predict(self, t):
+        dt = min(max(t - self.t, 0.0), self.maxHorizon)
+        return (self.x @ self._F(dt).T)[:, :2]
+
+
+PREDICTORS = {"cv": ConstantVelocityPredictor, "kalman": KalmanPredictor}
+
+
+# -------------------- Scheduling --------------------
+class InferenceScheduler:
+    """Decides which frames get a full MediaPipe pass.
+
+    Fixed mode runs inference on every Nth frame. Adaptive mode keeps inference
+    below maxCpu of one core: the next pass is due once (inference cost / maxCpu)
+    seconds have passed. Either way a pass is forced when no hands are tracked or
+    the last one is older than maxAge.
+    """
+
+    def __init__(self, every=2, adaptive=False, maxCpu=0.5, maxAge=0.15):
+        self.every = max(1, every)
+        self.adaptive = adaptive
+        self.maxCpu = maxCpu
+        self.maxAge = maxAge
+        self.cost = 0.0             # EMA of inference seconds
+        self.sinceLast = 0
+        self.tLast = None
+
+    def due(self, t, tracking):
+        if not tracking or self.tLast is None or t - self.tLast >= self.maxAge:
+            return True
+        if self.adaptive:
+            return t - self.tLast >= self.cost / self.maxCpu
+        return self.sinceLast + 1 >= self.every
+
+    def ran(self, t, cost):
+        self.cost = cost if not self.cost else 0.8 * self.cost + 0.2 * cost
+        self.tLast = t
+        self.sinceLast = 0
+
+    def skipped(self):
+        self.sinceLast += 1
+
+
+# -------------------- Tracker --------------------
+class PredictiveTracker:
+    """HandDetector stand-in that runs inference per InferenceScheduler and predicts in between."""
+
+    def __init__(self, detector, predictor="kalman", every=2, adaptive=False, maxCpu=0.5,
+                 clock=time.perf_counter):
+        self.detector = detector
+        self.predictor = PREDICTORS[predictor]()
+        self.scheduler = InferenceScheduler(every, adaptive, maxCpu)
+        self.clock = clock
+        self.last = None        # HandBatch from the last inference pass
+        self.shape = None
+
+        self.frames = 0
+        self.inferences = 0
+        self.inferenceTime = 0.0
+        self.errors = []        # fingertip prediction error at each pass, px
+
+    @property
+    def handedThumb(self):
+        return self.detector.handedThumb
+
+    def drawHands(self, img, hands_data, bbox=True):
+        return self.detector.drawHands(img, hands_data, bbox)
+
+    def findHands(self, img, draw=True):
+        t = self.clock()
+        self.frames += 1
+        tracking = self.last is not None and len(self.last) > 0
+
+        if self.scheduler.due(t, tracking):
+            hands_data = self._infer(img, t, tracking)
+        else:
+            self.scheduler.skipped()
+            hands_data = self._predicted(t)
+
+        if draw:
+            self.drawHands(img, hands_data)
+        return img, hands_data
+
+    def _infer(self, img, t, tracking):
+        start = time.perf_counter()
+        _, hands_data = self.detector.findHands(img, draw=False)
+        cost = time.perf_counter() - start
+        self.scheduler.ran(t, cost)
+        self.inferences += 1
+        self.inferenceTime += cost
+
+        tips = hands_data.landmarks[:, TIP, :2]
+        if tracking:
+            predicted = self.predictor.predict(t)
+            order = matchHands(self.predictor.keys, predicted, hands_data.types, tips)
+            h, w = img.shape[:2]
+            err = (predicted[order[order >= 0]] - tips[order >= 0]) * [w, h]
+            self.errors.extend(np.hypot(err[:, 0], err[:, 1]).tolist())
+        self.predictor.update(t, tips, hands_data.types)
+        self.last, self.shape = hands_data, img.shape
+        return hands_data
+
+    def _predicted(self, t):
+        last = self.last
+        delta = np.zeros((len(last), 1, 3), dtype=np.float32)
+        delta[:, 0, :2] = self.predictor.predict(t) - last.landmarks[:, TIP, :2]
+        return HandBatch(last.landmarks + delta, last.types, self.shape, self.handedThumb)
+
+    def stats(self):
+        """Inference rate, CPU saved and prediction error so the trade-off can be tuned."""
+        skipped = self.frames - self.inferences
+        cost = self.inferenceTime / self.inferences if self.inferences else 0.0
+        errors = np.array(self.errors) if self.errors else np.zeros(1)
+        return {
+            "frames": self.frames,
+            "inferences": self.inferences,
+            "skipped": skipped,
+            "inference_ms": round(cost * 1000, 2),
+            "cpu_saved_s": round(skipped * cost, 3),
+            "cpu_saved_pct": round(100.0 * skipped / self.frames, 1) if self.frames else 0.0,
+            "pred_err_px_mean": round(float(errors.mean()), 2),
+            "pred_err_px_p95": round(float(np.percentile(errors, 95)), 2),
+        }
@@ -0,0 +1,339 @@
+"""Record-and-replay harness for Sky Pointer.
+
+Recordings are single .npz files holding per-frame timestamps, hand landmarks
+and handedness, plus (optionally) the camera frames as encoded images.
+They can be fed back through HandDetector / virtualmouse.dispatch without a
+webcam, with every mouse, keyboard and system action captured by
+actuator.FakeActuator.
+
+    python virtualmouse.py --record session.npz [--record-frames]
+    python replay.py session.npz --fast
+"""
+import argparse
+import copy
+import json
+import time
+
+import cv2
+import numpy as np
+
+from actuator import FakeActuator
+from Handgesture import HandBatch, HandDetector
+
+
+# -------------------- Recording --------------------
+class Recorder:
+    """Collects frames / landmarks in memory and writes them to one compressed .npz."""
+
+    def __init__(self, path, save_frames=False, save_landmarks=True, frame_ext=".jpg"):
+        self.path = path
+        self.save_frames = save_frames
+        self.save_landmarks = save_landmarks
+        self.frame_ext = frame_ext
+        self.shape = None
+        self.timestamps = []
+        self.counts = []
+        self.landmarks = []
+        self.types = []
+        self.frames = []
+
+    def add(self, img, hands_data, t=None):
+        self.shape = img.shape
+        self.timestamps.append(time.time() if t is None else t)
+        if self.save_landmarks:
+            self.counts.append(len(hands_data))
+            if len(hands_data):
+                self.landmarks.append(hands_data.landmarks)
+                self.types.extend(1 if ht == "right" else 0 for ht in hands_data.types)
+        if self.save_frames:
+            ok, buf = cv2.imencode(self.frame_ext, img)
+            self.frames.append(buf.ravel() if ok else np.empty(0, dtype=np.uint8))
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    def save(self):
+        data = {
+            "timestamps": np.array(self.timestamps, dtype=np.float64),
+            "shape": np.array(self.shape or (480, 640, 3), dtype=np.int32),
+        }
+        if self.save_landmarks:
+            data["counts"] = np.array(self.counts, dtype=np.uint8)
+            data["landmarks"] = (np.concatenate(self.landmarks) if self.landmarks
+                                 else np.empty((0, 21, 3), dtype=np.float32))
+            data["types"] = np.array(self.types, dtype=np.uint8)
+        if self.save_frames:
+            sizes = [len(f) for f in self.frames]
+            data["frame_offsets"] = np.concatenate([[0], np.cumsum(sizes)]).astype(np.int64)
+            data["frame_data"] = (np.concatenate(self.frames) if self.frames
+                                  else np.empty(0, dtype=np.uint8))
+        np.savez_compressed(self.path, **data)
+        print(f"💾 Saved {len(self)} frames to {self.path}")
+        return self.path
+
+
+class Recording:
+    """Read-only view over a file written by Recorder."""
+
+    def __init__(self, path):
+        data = np.load(path)
+        self.path = path
+        self.timestamps = data["timestamps"]
+        self.shape = tuple(int(v) for v in data["shape"])
+        self.has_landmarks = "counts" in data
+        self.has_frames = "frame_data" in data
+        if self.has_landmarks:
+            self.counts = data["counts"]
+            self.landmarks = data["landmarks"]
+            self.types = ["right" if t else "left" for t in data["types"]]
+            self.starts = np.concatenate([[0], np.cumsum(self.counts)]).astype(np.int64)
+        if self.has_frames:
+            self.frame_offsets = data["frame_offsets"]
+            self.frame_data = data["frame_data"]
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    def frame(self, i):
+        a, b = self.frame_offsets[i], self.frame_offsets[i + 1]
+        return cv2.imdecode(self.frame_data[a:b], cv2.IMREAD_COLOR)
+
+    def batch(self, i, handedThumb=True):
+        a, b = self.starts[i], self.starts[i + 1]
+        return HandBatch(self.landmarks[a:b], self.types[a:b], self.shape, handedThumb)
+
+
+# -------------------- Replay sources --------------------
+class ReplayCapture:
+    """Drop-in for cv2.VideoCapture that plays back a Recording or a video file.
+
+    With realtime=True frames are released at their recorded pace, otherwise as
+    fast as the consumer reads them. Landmark-only recordings yield blank frames.
+    """
+
+    def __init__(self, source, realtime=True, loop=False):
+        self.realtime = realtime
+        self.loop = loop
+        self.index = -1
+        self.timestamp = 0.0    # recorded time of the last frame read, from 0
+        self.video = None
+        if isinstance(source, Recording):
+            self.recording = source
+        elif str(source).endswith(".npz"):
+            self.recording = Recording(source)
+        else:
+            self.recording = None
+            self.video = cv2.VideoCapture(source)
+            fps = self.video.get(cv2.CAP_PROP_FPS) or 30.0
+            self.frame_interval = 1.0 / fps
+        if self.recording is not None:
+            self.blank = np.zeros(self.recording.shape, dtype=np.uint8)
+        self.t0 = None
+
+    def isOpened(self):
+        if self.video is not None:
+            return self.video.isOpened()
+        return self.index + 1 < len(self.recording) or self.loop
+
+    def _pace(self, offset):
+        if not self.realtime:
+            return
+        if self.t0 is None:
+            self.t0 = time.perf_counter()
+        delay = self.t0 + offset - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+
+    def read(self):
+        if self.video is not None:
+            success, img = self.video.read()
+            if not success and self.loop:
+                self.video.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                self.index, self.t0 = -1, None
+                success, img = self.video.read()
+            if success:
+                self.index += 1
+                self.timestamp = self.index * self.frame_interval
+                self._pace(self.timestamp)
+            return success, img
+
+        rec = self.recording
+        if self.index + 1 >= len(rec):
+            if not self.loop or not len(rec):
+                return False, None
+            self.index, self.t0 = -1, None
+        self.index += 1
+        self.timestamp = float(rec.timestamps[self.index] - rec.timestamps[0])
+        self._pace(self.timestamp)
+        img = rec.frame(self.index) if rec.has_frames else self.blank.copy()
+        return True, img
+
+    def set(self, prop, value):
+        return False
+
+    def get(self, prop):
+        if self.video is not None:
+            return self.video.get(prop)
+        return 0.0
+
+    def release(self):
+        if self.video is not None:
+            self.video.release()
+
+
+class ReplayDetector:
+    """Stands in for HandDetector by returning the recorded landmarks for the current frame."""
+
+    def __init__(self, capture, handedThumb=True):
+        self.capture = capture
+        self.recording = capture.recording
+        self.handedThumb = handedThumb
+
+    def findHands(self, img, draw=True):
+        hands_data = self.recording.batch(self.capture.index, self.handedThumb)
+        if draw:
+            self.drawHands(img, hands_data)
+        return img, hands_data
+
+    drawHands = staticmethod(HandDetector.drawHands)
+
+
+def cursor_metrics(track, reference=None, max_lag=15):
+    """Jitter (mean |second difference|, px) and, against an unfiltered reference track,
+    mean error and the lag (frames) that best aligns the two paths."""
+    stats = {"moves": len(track)}
+    if len(track) >= 3:
+        stats["jitter_px"] = round(float(np.linalg.norm(np.diff(track, 2, axis=0), axis=1).mean()), 2)
+    if reference is not None and len(reference) == len(track) and len(track) > max_lag:
+        errs = [np.linalg.norm(track[s:] - reference[:len(track) - s], axis=1).mean()
+                for s in range(max_lag + 1)]
+        stats["error_px"] = round(float(errs[0]), 2)
+        stats["lag_frames"] = int(np.argmin(errs))
+    return stats
+
+
+# -------------------- Headless runner --------------------
+# virtualmouse globals a replay swaps out, put back once it ends
+PATCHED = ("actuator", "screen_width", "screen_height", "screenshots", "luffy", "actions",
+           "cursor_filter", "detector", "dragging", "gesture_label", "current_volume_percent")
+
+
+def run_replay(source, fast=True, use_frames=False, infer_every=1, adaptive=False,
+               predictor="kalman", cursor_filter=None, idle_after=0.0, idle_hz=4.0):
+    """Feeds a recording or video through virtualmouse.dispatch with a FakeActuator.
+
+    Landmark recordings skip MediaPipe entirely unless use_frames=True. With
+    infer_every > 1 or adaptive, inference is thinned out by a PredictiveTracker.
+    cursor_filter names a filters.py filter to use instead of (a fresh copy of) virtualmouse's.
+    idle_after > 0 puts an IdleGovernor (polling idle_hz times a second) in front.
+    Returns (actuator, stats) where stats has frame count, elapsed seconds,
+    throughput, cursor jitter and, when predicting or idling, the tracker's
+    error / CPU-saved figures and the time spent idle. The virtualmouse globals it
+    patches (actuator, detector, filter, ...) are restored afterwards.
+    """
+    import virtualmouse as vm
+    from actions import ActionExecutor
+    from filters import makeFilter
+
+    saved = {name: getattr(vm, name) for name in PATCHED}
+    devices = [(setter, setter._apply, setter.error, setter.threaded) for setter in (vm.brightness, vm.volume)]
+    vm.actuator = None      # so use_actuator doesn't close the real backend; restored below
+    fake = FakeActuator()
+    vm.use_actuator(fake)
+    vm.cursor_filter = makeFilter(cursor_filter) if cursor_filter is not None else copy.deepcopy(vm.cursor_filter)
+    vm.cursor_filter.reset()
+    vm.dragging, vm.gesture_label = False, ""
+    actions = vm.actions = ActionExecutor(coalesce=False)   # one action per frame, so runs are comparable
+    cap = ReplayCapture(source, realtime=not fast)
+    try:
+        if cap.recording is not None and cap.recording.has_landmarks and not use_frames:
+            vm.detector = ReplayDetector(cap)
+        elif vm.detector is None:
+            vm.detector = vm.make_detector()
+        tracker = None
+        if infer_every > 1 or adaptive:
+            from predictor import PredictiveTracker
+            tracker = vm.detector = PredictiveTracker(vm.detector, predictor, infer_every, adaptive,
+                                                      clock=lambda: cap.timestamp)
+        governor = None
+        if idle_after > 0:
+            from idle import IdleGovernor
+            governor = vm.detector = IdleGovernor(vm.detector, idleAfter=idle_after, idleHz=idle_hz,
+                                                  clock=lambda: cap.timestamp)
+
+        frames = 0
+        start = time.perf_counter()
+        while True:
+            success, img = cap.read()
+            if not success:
+                break
+            # Recorded timestamps drive the cooldown clock, so fast replays stay deterministic
+            vm.dispatch(vm.detect(img), cap.timestamp)
+            frames += 1
+        actions.stop()
+        elapsed = time.perf_counter() - start
+    finally:
+        actions.stop()      # no-op unless the replay raised
+        cap.release()
+        for name, value in saved.items():
+            setattr(vm, name, value)
+        for setter, apply, error, threaded in devices:
+            setter.use(apply, threaded)
+            setter.error = error
+
+    stats = {
+        "frames": frames,
+        "seconds": round(elapsed, 3),
+        "fps": round(frames / elapsed, 1) if elapsed else 0.0,
+        "actions": len(fake.calls),
+        "cursor": cursor_metrics(fake.cursorTrack()),
+    }
+    if tracker is not None:
+        stats["prediction"] = tracker.stats()
+    if governor is not None:
+        stats["idle"] = governor.stats()
+    return fake, stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a Sky Pointer recording without a camera")
+    parser.add_argument("source", help=".npz recording or a video file")
+    parser.add_argument("--fast", action="store_true", help="replay as fast as possible")
+    parser.add_argument("--frames", action="store_true",
+                        help="run MediaPipe on recorded frames instead of recorded landmarks")
+    parser.add_argument("--actions", action="store_true", help="print every captured action")
+    parser.add_argument("--infer-every", type=int, default=1, metavar="N",
+                        help="use recorded hands only on every Nth frame, predict in between")
+    parser.add_argument("--adaptive-infer", action="store_true")
+    parser.add_argument("--predictor", choices=("kalman", "cv"), default="kalman")
+    parser.add_argument("--filter", choices=("one-euro", "ema", "none"),
+                        help="cursor filter to replay with (default: virtualmouse's)")
+    parser.add_argument("--idle-after", type=float, default=0.0, metavar="SECONDS",
+                        help="go idle (low-rate polling) after this long without a hand")
+    parser.add_argument("--idle-hz", type=float, default=4.0)
+    parser.add_argument("--compare-filters", action="store_true",
+                        help="replay once per cursor filter and report jitter / lag vs. unfiltered")
+    args = parser.parse_args()
+
+    if args.compare_filters:
+        from filters import FILTERS
+        tracks = {}
+        for name in ("none",) + tuple(n for n in FILTERS if n != "none"):
+            fake, _ = run_replay(args.source, fast=True, use_frames=args.frames, cursor_filter=name)
+            tracks[name] = fake.cursorTrack()
+        report = {name: cursor_metrics(track, tracks["none"]) for name, track in tracks.items()}
+        print(json.dumps(report, indent=2))
+        return
+
+    fake, stats = run_replay(args.source, fast=args.fast, use_frames=args.frames,
+                             infer_every=args.infer_every, adaptive=args.adaptive_infer,
+                             predictor=args.predictor, cursor_filter=args.filter,
+                             idle_after=args.idle_after, idle_hz=args.idle_hz)
+    if args.actions:
+        for call in fake.calls:
+            print(call)
+    print(json.dumps(stats))
+
+
+if __name__ == "__main__":
+    main()
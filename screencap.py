@@ -0,0 +1,292 @@
+"""Screenshot service for Sky Pointer and Luffy.
+
+take() only grabs the screen, into one of a few reused frame buffers, and
+returns the file path at once; PNG / JPEG / WebP encoding and the disk write
+happen on a background worker, which hands the buffer back when done. If every
+buffer is still waiting to be encoded the shot is dropped rather than queued
+without bound. burst() takes a series of shots on its own thread, waiting for
+the encoder instead of dropping.
+
+Grabbers: mss (fast, direct from the display server / GDI), PIL.ImageGrab as
+the fallback, and FakeGrabber for tests and benchmarks.
+
+    python screencap.py --fake --burst 10 --format jpg --quality 85
+"""
+import argparse
+import datetime
+import os
+import queue
+import threading
+import time
+
+import cv2
+import numpy as np
+
+FORMATS = {
+    # extension: (imencode quality flag, default, range)
+    "png": (cv2.IMWRITE_PNG_COMPRESSION, 1, (0, 9)),    # zlib level; 1 is ~2x faster than 6 for a few % more size
+    "jpg": (cv2.IMWRITE_JPEG_QUALITY, 90, (0, 100)),
+    "webp": (cv2.IMWRITE_WEBP_QUALITY, 90, (1, 100)),
+}
+FORMATS["jpeg"] = FORMATS["jpg"]
+
+
+# -------------------- Grabbers --------------------
+# grab(out) fills `out` (H, W, 3 BGR) when it has the screen's shape and returns
+# it, otherwise returns a newly allocated array the caller keeps for next time.
+class MssGrabber:
+    name = "mss"
+
+    def __init__(self, monitor=1):
+        import mss
+        self.mss = mss
+        self.monitor = monitor
+        self._local = threading.local()     # mss handles are per thread
+
+    def _sct(self):
+        sct = getattr(self._local, "sct", None)
+        if sct is None:
+            sct = self._local.sct = self.mss.mss()
+        return sct
+
+    def grab(self, out=None):
+        sct = self._sct()
+        shot = sct.grab(sct.monitors[self.monitor])
+        bgra = np.frombuffer(shot.bgra, np.uint8).reshape(shot.height, shot.width, 4)
+        if out is None or out.shape[:2] != bgra.shape[:2]:
+            out = None
+        return cv2.cvtColor(bgra, cv2.COLOR_BGRA2BGR, dst=out)
+
+
+class PilGrabber:
+    name = "pil"
+
+    def __init__(self):
+        from PIL import ImageGrab
+        self.ImageGrab = ImageGrab
+
+    def grab(self, out=None):
+        rgb = np.asarray(self.ImageGrab.grab())
+        if out is None or out.shape[:2] != rgb.shape[:2]:
+            out = None
+        return cv2.cvtColor(rgb, cv2.COLOR_RGB2BGR, dst=out)
+
+
+class FakeGrabber:
+    """A synthetic desktop (gradient, noisy 'photo' window, changing text); latency simulates a slow grab."""
+
+    name = "fake"
+
+    def __init__(self, width=1920, height=1080, latency=0.0):
+        self.latency = latency
+        self.count = 0
+        x = np.linspace(0, 255, width, dtype=np.float32)
+        y = np.linspace(0, 255, height, dtype=np.float32)[:, None]
+        self.desktop = np.dstack([np.broadcast_to(x, (height, width)), np.broadcast_to(y, (height, width)),
+                                  np.full((height, width), 96, np.float32)]).astype(np.uint8)
+        h, w = height // 3, width // 3
+        self.desktop[h:2 * h, w:2 * w] = np.random.default_rng(0).integers(0, 256, (h, w, 3), dtype=np.uint8)
+
+    def grab(self, out=None):
+        time.sleep(self.latency)
+        if out is None or out.shape != self.desktop.shape:
+            out = np.empty_like(self.desktop)
+        np.copyto(out, self.desktop)
+        self.count += 1
+        cv2.putText(out, f"shot {self.count}", (40, 80), cv2.FONT_HERSHEY_SIMPLEX, 2, (255, 255, 255), 3)
+        return out
+
+
+def makeGrabber(spec="auto"):
+    """"mss", "pil", "fake" or "auto" (mss, else PIL)."""
+    if spec == "fake":
+        return FakeGrabber()
+    if spec in ("mss", "auto"):
+        try:
+            return MssGrabber()
+        except ImportError as e:
+            if spec == "mss":
+                raise
+            print(f"⚠️ mss unavailable ({e}), screenshots use the slower PIL grab")
+    return PilGrabber()
+
+
+# -------------------- Service --------------------
+class ScreenshotService:
+    def __init__(self, folder="screenshots", fmt="png", quality=None, grabber="auto", buffers=3):
+        if fmt not in FORMATS:
+            raise ValueError(f"unknown screenshot format {fmt!r}, use one of {', '.join(FORMATS)}")
+        self.folder = folder
+        self.fmt = fmt
+        flag, default, (low, high) = FORMATS[fmt]
+        self.params = [flag, int(min(max(default if quality is None else quality, low), high))]
+        self.grabberSpec = grabber
+        self.grabber = None if isinstance(grabber, str) else grabber     # built on first shot
+        self.buffers = buffers
+        self.free = queue.Queue()       # frame buffers ready to be grabbed into
+        self.allocated = 0
+        self.jobs = queue.Queue()       # (image, path) waiting for the encoder; None stops it
+        self.names = set()              # paths handed out but maybe not written yet
+        self._lock = threading.Lock()
+        self._thread = None
+
+        self.shots = 0
+        self.dropped = 0
+        self.written = 0
+        self.failed = 0
+        self.bytes = 0
+        self.grabTime = 0.0
+        self.grabMax = 0.0
+        self.encodeTime = 0.0
+
+    def _buffer(self, block=False):
+        try:
+            return self.free.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self.allocated < self.buffers:
+                self.allocated += 1
+                return None     # the grabber allocates it
+        return self.free.get() if block else False
+
+    def _path(self, suffix=""):
+        stamp = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+        with self._lock:
+            n = 1
+            path = os.path.join(self.folder, f"{stamp}{suffix}.{self.fmt}")
+            while path in self.names or os.path.exists(path):
+                n += 1
+                path = os.path.join(self.folder, f"{stamp}{suffix}_{n}.{self.fmt}")
+            self.names.add(path)
+        return path
+
+    def take(self, path=None, suffix="", block=False):
+        """Grabs the screen now and returns the path it will be written to.
+
+        With every buffer still queued for encoding the shot is dropped (None),
+        or with block=True taken as soon as the encoder frees one.
+        """
+        buf = self._buffer(block)
+        if buf is False:
+            self.dropped += 1
+            return None
+        start = time.perf_counter()
+        try:
+            if self.grabber is None:
+                self.grabber = makeGrabber(self.grabberSpec)
+            img = self.grabber.grab(buf)
+        except Exception as e:
+            if buf is None:
+                with self._lock:
+                    self.allocated -= 1
+            else:
+                self.free.put(buf)
+            print(f"⚠️ Screenshot failed: {e}")
+            return None
+        cost = time.perf_counter() - start
+        self.grabTime += cost
+        self.grabMax = max(self.grabMax, cost)
+        self.shots += 1
+        if path is None:
+            path = self._path(suffix)
+        else:
+            with self._lock:
+                self.names.add(path)
+        self._start()
+        self.jobs.put((img, path))
+        return path
+
+    def burst(self, count=5, interval=0.2):
+        """Takes count shots interval seconds apart on a background thread; returns the thread.
+
+        Shots are never dropped: a burst faster than the encoder is paced by it.
+        """
+        def run():
+            due = time.perf_counter()
+            for i in range(count):
+                self.take(suffix=f"_{i + 1:02d}", block=True)
+                due += interval
+                time.sleep(max(0.0, due - time.perf_counter()))
+        thread = threading.Thread(target=run, daemon=True, name="screenshot-burst")
+        thread.start()
+        return thread
+
+    def _start(self):
+        with self._lock:
+            if self._thread is None:
+                os.makedirs(self.folder, exist_ok=True)
+                self._thread = threading.Thread(target=self._encode, daemon=True, name="screenshot-encode")
+                self._thread.start()
+
+    def _encode(self):
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                return
+            img, path = job
+            start = time.perf_counter()
+            try:
+                ok, data = cv2.imencode("." + self.fmt, img, self.params)
+                if not ok:
+                    raise ValueError(f"could not encode {self.fmt}")
+                with open(path, "wb") as f:
+                    f.write(data)
+                self.written += 1
+                self.bytes += len(data)
+            except Exception as e:
+                self.failed += 1
+                print(f"⚠️ Could not save screenshot {path}: {e}")
+            self.encodeTime += time.perf_counter() - start
+            with self._lock:
+                self.names.discard(path)
+            self.free.put(img)
+
+    def close(self, timeout=10.0):
+        """Writes every shot already taken, then stops the encoder."""
+        if self._thread is not None:
+            self.jobs.put(None)
+            self._thread.join(timeout)
+            self._thread = None
+
+    def stats(self):
+        done = self.written + self.failed
+        return {
+            "grabber": getattr(self.grabber, "name", None),
+            "format": self.fmt,
+            "shots": self.shots,
+            "dropped": self.dropped,
+            "written": self.written,
+            "failed": self.failed,
+            "grab_ms_avg": round(1000 * self.grabTime / self.shots, 1) if self.shots else 0.0,
+            "grab_ms_max": round(1000 * self.grabMax, 1),
+            "encode_ms_avg": round(1000 * self.encodeTime / done, 1) if done else 0.0,
+            "kb_avg": round(self.bytes / 1024 / self.written, 1) if self.written else 0.0,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Take screenshots through the background encoder")
+    parser.add_argument("--folder", default="screenshots")
+    parser.add_argument("--format", default="png", choices=sorted(FORMATS))
+    parser.add_argument("--quality", type=int, help="PNG compression 0-9, JPEG / WebP quality 0-100")
+    parser.add_argument("--grabber", default="auto", choices=("auto", "mss", "pil", "fake"))
+    parser.add_argument("--fake", action="store_true", help="same as --grabber fake")
+    parser.add_argument("--burst", type=int, default=1, help="number of shots")
+    parser.add_argument("--interval", type=float, default=0.2, help="seconds between burst shots")
+    args = parser.parse_args()
+
+    service = ScreenshotService(args.folder, args.format, args.quality, "fake" if args.fake else args.grabber)
+    start = time.perf_counter()
+    if args.burst > 1:
+        service.burst(args.burst, args.interval).join()
+    else:
+        print(service.take())
+    taken = time.perf_counter() - start
+    service.close()
+    print(f"taken in {taken * 1000:.1f} ms, all written after {(time.perf_counter() - start) * 1000:.1f} ms")
+    print(service.stats())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,286 @@
+"""Multi-camera server mode.
+
+Every stream gets its own inference worker process (its own MediaPipe, its own
+GIL). The parent grabs frames straight into a per-stream ring of frame slots in
+multiprocessing.shared_memory and only sends (seq, capture time) down the
+stream's queue; the worker runs the detector on the slot in place and sends
+back the landmark arrays through one shared results queue. A stream never has
+more frames in flight than ring slots: when its worker falls behind, new
+frames are dropped (and counted) instead of queueing up.
+
+    python server.py --source 0 --source 1 --report 2
+    python server.py --source synthetic --source synthetic --fake-infer-ms 30 --seconds 10
+"""
+import argparse
+import json
+import multiprocessing
+import queue
+import threading
+import time
+from multiprocessing import shared_memory
+
+import cv2
+import numpy as np
+
+from benchmark import open_source
+from Handgesture import HandBatch
+
+
+class FrameRing:
+    """`slots` uint8 frames of one shape in a SharedMemory block (created, or attached by name)."""
+
+    def __init__(self, shape, slots=4, name=None):
+        self.shape = tuple(shape)
+        self.slots = slots
+        size = int(np.prod(self.shape)) * slots
+        self.shm = shared_memory.SharedMemory(name=name, create=name is None, size=size)
+        self.name = self.shm.name
+        self.frames = np.ndarray((slots,) + self.shape, dtype=np.uint8, buffer=self.shm.buf)
+
+    def close(self):
+        self.frames = None      # drop the view before unmapping
+        self.shm.close()
+
+    def unlink(self):
+        self.shm.unlink()
+
+
+class FakeDetector:
+    """Stands in for MediaPipe: burns `ms` of CPU per frame and finds no hands."""
+
+    def __init__(self, ms=20.0):
+        self.ms = ms
+
+    def findHands(self, img, draw=False):
+        end = time.process_time() + self.ms / 1000
+        while time.process_time() < end:
+            pass
+        return img, HandBatch.empty(img.shape)
+
+
+def worker(stream, ringName, shape, slots, frames, results, detectorArgs, fakeMs):
+    """Inference process for one stream: reads ring slots in place, posts landmark arrays back."""
+    ring = FrameRing(shape, slots, ringName)
+    if fakeMs:
+        detector = FakeDetector(fakeMs)
+    else:
+        from Handgesture import HandDetector
+        detector = HandDetector(**detectorArgs)
+    results.put((stream, -1, 0.0, 0.0, None, None))     # ready
+    try:
+        while True:
+            msg = frames.get()
+            if msg is None:
+                break
+            seq, t = msg
+            start = time.perf_counter()
+            _, hands = detector.findHands(ring.frames[seq % slots], draw=False)
+            results.put((stream, seq, t, time.perf_counter() - start, hands.landmarks, hands.types))
+    finally:
+        ring.close()
+
+
+class Stream:
+    def __init__(self, index, source, ctx, results, slots, detectorArgs, fakeMs, width, height, fps):
+        self.index = index
+        self.source = source
+        self.interval = 1.0 / fps if fps else 0.0
+        self.cap, _ = open_source(str(source), width, height)
+        ok, first = self.cap.read()
+        if not ok:
+            raise RuntimeError(f"Stream {index}: no frames from {source!r}")
+        self.shape = first.shape
+        self.slots = slots
+        self.ring = FrameRing(first.shape, slots)
+        self.scratch = np.empty_like(first)     # frames read while the ring is full
+        self.frames = ctx.Queue()
+        self.proc = ctx.Process(target=worker, daemon=True, name=f"stream-{index}",
+                                args=(index, self.ring.name, self.shape, slots, self.frames,
+                                      results, detectorArgs, fakeMs))
+        self.ready = threading.Event()
+        self.lock = threading.Lock()
+        self.thread = None
+        self.seq = 0
+
+        self.captured = 0
+        self.dropped = 0
+        self.inflight = 0
+        self.done = 0
+        self.latency = 0.0
+        self.inferTime = 0.0
+        self.hands = None               # latest HandBatch
+        self.started = time.perf_counter()
+        self._window = (self.started, 0, 0)
+
+    def start(self, stop):
+        self.proc.start()
+        self.thread = threading.Thread(target=self._capture, args=(stop,), daemon=True)
+        self.thread.start()
+
+    def _grab(self, out):
+        """Reads the next frame into `out` (in place for cv2 captures)."""
+        if isinstance(self.cap, cv2.VideoCapture):
+            ok, img = self.cap.read(out)
+        else:
+            ok, img = self.cap.read()
+        if ok and not np.shares_memory(img, out):
+            if img.shape != out.shape:
+                img = cv2.resize(img, (out.shape[1], out.shape[0]))
+            out[...] = img
+        return ok
+
+    def _capture(self, stop):
+        self.ready.wait()
+        due = time.perf_counter()
+        while not stop.is_set():
+            if self.interval:
+                # Cameras pace themselves; files and synthetic sources are held to the frame rate
+                due += self.interval
+                time.sleep(max(0.0, due - time.perf_counter()))
+            with self.lock:
+                full = self.inflight >= self.slots
+            slot = self.seq % self.slots
+            if not self._grab(self.scratch if full else self.ring.frames[slot]):
+                break
+            t = time.perf_counter()
+            self.captured += 1
+            if full:
+                self.dropped += 1
+                continue
+            with self.lock:
+                self.inflight += 1
+            self.frames.put((self.seq, t))
+            self.seq += 1
+
+    def finished(self, seq, t, cost, landmarks, types):
+        with self.lock:
+            self.inflight -= 1
+        self.done += 1
+        self.latency += time.perf_counter() - t
+        self.inferTime += cost
+        self.hands = HandBatch(landmarks, types, self.shape)
+
+    def stats(self, total=False):
+        """Rates since the previous call (or over the whole run with total=True)."""
+        now = time.perf_counter()
+        t0, captured0, done0 = (self.started, 0, 0) if total else self._window
+        dt = max(now - t0, 1e-9)
+        self._window = (now, self.captured, self.done)
+        return {
+            "stream": self.index,
+            "source": str(self.source),
+            "capture_fps": round((self.captured - captured0) / dt, 1),
+            "infer_fps": round((self.done - done0) / dt, 1),
+            "queue_depth": self.inflight,
+            "dropped": self.dropped,
+            "latency_ms": round(1000 * self.latency / self.done, 1) if self.done else 0.0,
+            "infer_ms": round(1000 * self.inferTime / self.done, 1) if self.done else 0.0,
+            "hands": len(self.hands) if self.hands is not None else 0,
+            "captured": self.captured,
+            "processed": self.done,
+        }
+
+    def close(self):
+        self.frames.put(None)
+        self.proc.join(5)
+        if self.proc.is_alive():
+            self.proc.terminate()
+        self.cap.release()
+        self.ring.close()
+        self.ring.unlink()
+
+
+class Server:
+    def __init__(self, sources, slots=2, detectorArgs=None, fakeMs=0.0, width=640, height=480,
+                 fps=30.0, onResult=None, startMethod=None):
+        ctx = multiprocessing.get_context(startMethod)
+        self.results = ctx.Queue()
+        self.onResult = onResult        # called as onResult(stream index, seq, HandBatch)
+        self.stop = threading.Event()
+        self.streams = [Stream(i, s, ctx, self.results, slots, detectorArgs or {}, fakeMs,
+                               width, height, fps) for i, s in enumerate(sources)]
+        self.collector = threading.Thread(target=self._collect, daemon=True)
+
+    def start(self):
+        for s in self.streams:
+            s.start(self.stop)
+        self.collector.start()
+        return self
+
+    def _collect(self):
+        while True:
+            try:
+                msg = self.results.get(timeout=0.5)
+            except queue.Empty:
+                if self.stop.is_set():
+                    break
+                continue
+            if msg is None:
+                break
+            index, seq, t, cost, landmarks, types = msg
+            stream = self.streams[index]
+            if seq < 0:
+                stream.started = time.perf_counter()
+                stream._window = (stream.started, 0, 0)
+                stream.ready.set()
+                continue
+            stream.finished(seq, t, cost, landmarks, types)
+            if self.onResult is not None:
+                self.onResult(index, seq, stream.hands)
+
+    def stats(self, total=False):
+        return [s.stats(total) for s in self.streams]
+
+    def close(self):
+        self.stop.set()
+        for s in self.streams:
+            if s.thread is not None:
+                s.thread.join(2)
+        for s in self.streams:
+            s.close()
+        self.results.put(None)
+        self.collector.join(2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hand tracking for several camera streams")
+    parser.add_argument("--source", action="append", required=True,
+                        help="camera index, video, .npz recording or 'synthetic' (repeat per stream)")
+    parser.add_argument("--slots", type=int, default=2, help="shared-memory frame slots per stream")
+    parser.add_argument("--width", type=int, default=640)
+    parser.add_argument("--height", type=int, default=480)
+    parser.add_argument("--fps", type=float, default=30.0, help="capture rate cap per stream (0 = unpaced)")
+    parser.add_argument("--max-hands", type=int, default=2)
+    parser.add_argument("--model-complexity", type=int, default=1, choices=[0, 1])
+    parser.add_argument("--detection-con", type=float, default=0.5)
+    parser.add_argument("--tracking-con", type=float, default=0.5)
+    parser.add_argument("--fake-infer-ms", type=float, default=0.0,
+                        help="replace MediaPipe by a CPU-burning stand-in (scaling tests)")
+    parser.add_argument("--seconds", type=float, default=0.0, help="stop after this long (0 = Ctrl+C)")
+    parser.add_argument("--report", type=float, default=2.0, help="seconds between stat lines")
+    parser.add_argument("--output", help="write the final stats as JSON")
+    args = parser.parse_args()
+
+    detectorArgs = {"maxHands": args.max_hands, "modelComplexity": args.model_complexity,
+                    "detectionCon": args.detection_con, "trackCon": args.tracking_con}
+    server = Server(args.source, args.slots, detectorArgs, args.fake_infer_ms,
+                    args.width, args.height, args.fps).start()
+    start = time.perf_counter()
+    try:
+        while not args.seconds or time.perf_counter() - start < args.seconds:
+            time.sleep(args.report)
+            stats = server.stats()
+            print("  ".join(f"[{s['stream']}] cap {s['capture_fps']:.0f} fps, infer {s['infer_fps']:.1f} fps, "
+                            f"depth {s['queue_depth']}, dropped {s['dropped']}, {s['latency_ms']:.0f} ms"
+                            for s in stats))
+    except KeyboardInterrupt:
+        pass
+    stats = server.stats(total=True)
+    server.close()
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(stats, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Startup timing for Sky Pointer and Luffy.
+
+timed() records how long a subsystem took to import or initialise, so the
+camera loop's startup cost stays visible as backends are moved off it. report()
+prints everything recorded so far, slowest first.
+
+    python startup.py        # cold import cost of each subsystem, one fresh interpreter per module
+"""
+import argparse
+import subprocess
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+T0 = time.perf_counter()
+timings = []                # (subsystem, phase, seconds)
+_lock = threading.Lock()
+
+
+def record(subsystem, phase, seconds):
+    with _lock:
+        timings.append((subsystem, phase, seconds))
+
+
+@contextmanager
+def timed(subsystem, phase="init"):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(subsystem, phase, time.perf_counter() - start)
+
+
+def report(title="Startup"):
+    """Prints every recorded timing, slowest first, and the time since this module was imported."""
+    with _lock:
+        rows = sorted(timings, key=lambda row: -row[2])
+    print(f"⏱️ {title}: ready after {(time.perf_counter() - T0) * 1000:.0f} ms")
+    for subsystem, phase, seconds in rows:
+        print(f"   {subsystem:<12} {phase:<12} {seconds * 1000:8.1f} ms")
+
+
+# -------------------- Cold import report --------------------
+SUBSYSTEMS = {
+    "opencv": "cv2",
+    "mediapipe": "mediapipe",
+    "pyautogui": "pyautogui",
+    "brightness": "screen_brightness_control",
+    "volume": "pycaw.pycaw",
+    "requests": "requests",
+    "speech": "speech_recognition",
+    "tts": "pyttsx3",
+    "selenium": "selenium.webdriver.support.ui",
+    "luffy": "luffy",
+    "virtualmouse": "virtualmouse",
+}
+
+
+def coldImport(module):
+    """Seconds a fresh interpreter spends importing module (None if it fails)."""
+    code = ("import time; t = time.perf_counter(); import {0}; "
+            "print(time.perf_counter() - t)").format(module)
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    if result.returncode:
+        return None
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold import cost of each subsystem")
+    parser.add_argument("subsystems", nargs="*", default=list(SUBSYSTEMS),
+                        help=f"any of: {', '.join(SUBSYSTEMS)}")
+    args = parser.parse_args()
+    for name in args.subsystems:
+        module = SUBSYSTEMS.get(name, name)
+        seconds = coldImport(module)
+        cost = "unavailable" if seconds is None else f"{seconds * 1000:8.1f} ms"
+        print(f"{name:<12} {module:<32} {cost}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+import time
+
+from actuator import FakeActuator, makeActuator
+
+
+def test_fake_actuator_records_pyautogui_calls():
+    act = FakeActuator()
+    act.moveTo(10.7, 20.2)
+    act.click()
+    act.mouseDown()
+    act.mouseUp()
+    act.scroll(-3)
+    act.press("Space")
+    act.hotkey("ctrl", "w")
+    act.take("shot.png")
+    assert act.names() == ["moveTo", "click", "mouseDown", "mouseUp", "scroll", "press", "hotkey", "screenshot"]
+    assert act.calls[0][2:] == (10, 20)
+    assert act.calls[5][2:] == ("space",)
+    assert act.calls[6][2:] == ("ctrl", "w")
+    assert act.cursorTrack().tolist() == [[10.0, 20.0]]
+
+
+def test_rate_limited_moves_coalesce_to_the_newest():
+    act = FakeActuator(rate=20.0)
+    act.moveTo(0, 0)
+    time.sleep(0.01)
+    for x in range(1, 50):
+        act.moveTo(x, x)
+    act.click()             # flushes the pending move before clicking
+    act.close()
+    assert act.names()[-2:] == ["moveTo", "click"]
+    assert act.cursorTrack()[-1].tolist() == [49.0, 49.0]
+    assert act.coalesced > 0 and act.injections < 50
+
+
+def test_make_actuator_returns_none_for_unknown_backends(capsys):
+    assert isinstance(makeActuator("fake", rate=0), FakeActuator)
+    assert makeActuator("bogus") is None
+    assert "Unknown input backend" in capsys.readouterr().out
+
@@ -0,0 +1,32 @@
+import subprocess
+import sys
+import threading
+from multiprocessing.connection import Client, Listener
+
+from actuator import FakeActuator
+from assistant import FakeLuffy, LuffyProcess
+
+
+def test_fake_luffy_forwards_activations():
+    act = FakeActuator()
+    luffy = FakeLuffy(act.luffy_main).start()
+    assert luffy.activate()
+    luffy.close()
+    assert act.names() == ["luffy_main"]
+
+
+def test_worker_that_hangs_after_the_channel_closes_is_terminated():
+    statuses = []
+    luffy = LuffyProcess(onStatus=statuses.append)
+    luffy.status = "dormant"
+    luffy.startupTime = 0.5             # it had loaded, so a bad exit doesn't mark it failed
+    luffy.proc = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)"])
+    listener = Listener(("127.0.0.1", 0), authkey=b"test")
+    # The worker connects and closes the channel at once, but its process doesn't exit
+    worker = threading.Thread(target=lambda: Client(listener.address, authkey=b"test").close())
+    worker.start()
+    luffy._run(listener)
+    worker.join()
+    assert luffy.proc.returncode is not None
+    assert statuses == ["stopped"]
+    assert not luffy.failed
@@ -0,0 +1,91 @@
+import json
+import sys
+import time
+import types
+
+import pytest
+
+import browser
+from browser import BrowserSession, FakeDriver
+
+
+def test_session_reuses_one_driver():
+    drivers = []
+
+    def factory():
+        drivers.append(FakeDriver())
+        return drivers[-1]
+
+    session = BrowserSession(factory, watchAds=False)
+    session.open("https://example.com/a")
+    session.open("https://example.com/b")
+    assert len(drivers) == 1
+    assert drivers[0].urls == ["https://example.com/a", "https://example.com/b"]
+    assert (session.launches, session.reuses) == (1, 1)
+    session.close()
+    assert drivers[0].closed
+
+
+def test_closed_browser_is_relaunched():
+    drivers = []
+
+    def factory():
+        drivers.append(FakeDriver())
+        return drivers[-1]
+
+    session = BrowserSession(factory, watchAds=False)
+    session.open("https://example.com/a")
+    drivers[0].quit()       # the user closed the window
+    session.open("https://example.com/b")
+    assert len(drivers) == 2 and drivers[1].urls == ["https://example.com/b"]
+    assert session.launches == 2
+    session.close()
+
+
+def test_ad_watcher_injects_and_counts_skips():
+    session = BrowserSession(FakeDriver)
+    driver = session.open("https://www.youtube.com/watch?v=x")
+    watcher = session.watcher
+    watcher.minInterval = watcher.maxInterval = 0.01
+    watcher.kick()
+    deadline = time.monotonic() + 2
+    while watcher.injections == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    driver.skips = 2
+    while watcher.clicks < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    session.close()
+    stats = session.stats()
+    assert (stats["ad_injections"], stats["ads_skipped"]) == (1, 2)
+
+
+def test_outdated_remembered_driver_is_replaced(tmp_path, monkeypatch):
+    pytest.importorskip("selenium")
+    from selenium import webdriver
+    from selenium.common.exceptions import SessionNotCreatedException
+
+    old, new = tmp_path / "old-chromedriver", tmp_path / "new-chromedriver"
+    old.touch()
+    new.touch()
+    cache = tmp_path / "chromedriver.json"
+    cache.write_text(json.dumps({"path": str(old)}))
+    monkeypatch.setattr(browser.driverPath, "__defaults__", (str(cache), False))
+    monkeypatch.setattr(browser, "_driverPath", None)
+    monkeypatch.delenv("CHROMEDRIVER", raising=False)
+    manager = types.ModuleType("webdriver_manager.chrome")
+    manager.ChromeDriverManager = lambda: types.SimpleNamespace(install=lambda: str(new))
+    monkeypatch.setitem(sys.modules, "webdriver_manager.chrome", manager)
+
+    launched = []
+
+    def chrome(service, options):
+        launched.append(service.path)
+        if service.path == str(old):
+            raise SessionNotCreatedException("This version of ChromeDriver only supports Chrome version 120")
+        return FakeDriver()
+
+    monkeypatch.setattr(webdriver, "Chrome", chrome)
+    assert isinstance(browser.chromeFactory(), FakeDriver)
+    assert launched == [str(old), str(new)]
+    assert json.loads(cache.read_text())["path"] == str(new)
+    assert browser.chromeFactory() and launched[-1] == str(new)     # no second download
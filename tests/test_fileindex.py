@@ -0,0 +1,70 @@
+import os
+import threading
+
+from fileindex import FileIndex
+
+
+def make_tree(root, files):
+    for rel in files:
+        path = os.path.join(root, rel)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8"):
+            pass
+
+
+def test_lookup_ranks_exact_then_prefix(tmp_path):
+    make_tree(tmp_path, ["docs/report.pdf", "docs/old/report_2023.pdf", "misc/my report notes.txt"])
+    index = FileIndex([str(tmp_path)], str(tmp_path / "index.json"))
+    index.refresh()
+    results = [os.path.basename(p) for p in index.lookup("report")]
+    assert results == ["report.pdf", "report_2023.pdf", "my report notes.txt"]
+    assert os.path.basename(index.lookup("2023 report")[0]) == "report_2023.pdf"
+    assert os.path.basename(index.lookup("reprot")[0]) == "report.pdf"     # close match
+
+
+def test_refresh_relists_only_changed_dirs(tmp_path):
+    make_tree(tmp_path, ["a/one.txt", "b/two.txt"])
+    index = FileIndex([str(tmp_path)], str(tmp_path / "index.json"))
+    assert index.refresh()["scanned"] == 3
+    make_tree(tmp_path, ["a/three.txt"])
+    os.utime(tmp_path / "a", (1, 1))    # mtime resolution can be coarse
+    stats = index.refresh()
+    assert (stats["scanned"], stats["reused"], stats["files"]) == (1, 2, 3)
+    assert index.lookup("three")
+
+
+def test_saved_index_is_reused(tmp_path):
+    root = str(tmp_path / "tree")       # the index file is written outside the indexed folder
+    make_tree(root, ["a/one.txt"])
+    path = str(tmp_path / "index.json")
+    first = FileIndex([root], path)
+    first.refresh()
+    first.save()
+    second = FileIndex([root], path)
+    assert second.load() and second.ready.is_set()
+    assert second.lookup("one") and second.refresh()["scanned"] == 0
+
+
+def test_lookup_during_refresh(tmp_path):
+    make_tree(tmp_path, [f"d{i}/file_{i}_{j}.txt" for i in range(20) for j in range(20)])
+    index = FileIndex([str(tmp_path)], str(tmp_path / "index.json"))
+    index.refresh()
+    errors, done = [], threading.Event()
+
+    def lookups():
+        while not done.is_set():
+            try:
+                for path in index.lookup("file_1"):
+                    assert os.path.basename(path).startswith("file_1")
+            except Exception as e:      # pylint: disable=broad-except
+                errors.append(e)
+                return
+
+    thread = threading.Thread(target=lookups)
+    thread.start()
+    for _ in range(30):
+        index.dirs = {}                 # full rebuild every time
+        index.refresh()
+    done.set()
+    thread.join()
+    assert not errors
@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("cv2")
+pytest.importorskip("mediapipe")
+
+from Handgesture import HandBatch   # noqa: E402
+from idle import IdleGovernor       # noqa: E402
+
+HAND = np.tile(np.linspace(0.3, 0.6, 21, dtype=np.float32)[:, None], (1, 3))[None]
+
+
+class ScriptedDetector:
+    """One hand while present() is true, on whatever frame it gets."""
+
+    handedThumb = True
+
+    def __init__(self, present):
+        self.present = present
+        self.calls = []
+
+    def findHands(self, img, draw=True):
+        self.calls.append(img.shape)
+        if self.present():
+            return img, HandBatch(HAND, ["right"], img.shape)
+        return img, HandBatch.empty(img.shape)
+
+
+def run(governor, clock, until, fps=30):
+    states = []
+    frame = np.zeros((480, 640, 3), np.uint8)
+    while clock[0] < until:
+        _, hands = governor.findHands(frame, draw=False)
+        states.append((round(clock[0], 3), governor.state, len(hands), hands.shape))
+        clock[0] += 1.0 / fps
+    return states
+
+
+def test_sleeps_polls_and_wakes():
+    clock = [0.0]
+    present = lambda: clock[0] < 1.0 or clock[0] >= 5.0
+    full, light = ScriptedDetector(present), ScriptedDetector(present)
+    governor = IdleGovernor(full, lambda: light, idleAfter=2.0, idleHz=4.0, idleWidth=160,
+                            clock=lambda: clock[0])
+    states = run(governor, clock, 6.0)
+
+    assert governor.sleeps == 1 and governor.wakes == 1
+    idle = [s for s in states if s[1] == "idle"]
+    assert idle[0][0] == pytest.approx(3.0, abs=0.05)
+    # ~4 polls a second with the light detector on 160 px frames, none of them full-size
+    assert 7 <= len(light.calls) <= 10
+    assert set(light.calls) == {(120, 160, 3)}
+    # The poll that sees the hand returns it at full-frame scale and wakes straight away
+    wake = next(s for s in states if s[0] >= 5.0 and s[2])
+    assert wake[0] - 5.0 <= 0.25 + 1e-6
+    assert wake[3] == (480, 640, 3)
+    after = states[states.index(wake) + 1]
+    assert after[1] == "active" and after[2] == 1
+
+    stats = governor.stats()
+    assert stats["idle_s"] == pytest.approx(wake[0] - 3.0, abs=0.05)
+    assert stats["cpu_saved_s"] >= 0 and stats["idle_polls"] == len(light.calls)
+
+
+def test_no_idle_while_hands_stay():
+    clock = [0.0]
+    governor = IdleGovernor(ScriptedDetector(lambda: True), idleAfter=1.0, clock=lambda: clock[0])
+    run(governor, clock, 3.0)
+    assert governor.sleeps == 0 and governor.stats()["idle_s"] == 0
@@ -0,0 +1,32 @@
+import json
+
+import pytest
+
+from intents import CORPUS, IntentRouter
+
+router = IntentRouter()
+
+with open(CORPUS, encoding="utf-8") as f:
+    SAMPLES = json.load(f)
+
+
+@pytest.mark.parametrize("sample", SAMPLES, ids=[s["text"] for s in SAMPLES])
+def test_corpus(sample):
+    assert router.route(sample["text"]) == (sample["intent"], sample.get("slots", {}))
+
+
+@pytest.mark.parametrize("text, intent", [
+    ("play despacito", "play_unknown"),
+    ("Play   Despacito on YouTube", "play_song"),
+    ("play some music", "play_music"),
+    ("pause", "play_pause"),
+    ("", "none"),
+    ("blah blah", "unknown"),
+])
+def test_route(text, intent):
+    assert router.route(text)[0] == intent
+
+
+def test_specific_command_beats_catch_all():
+    assert router.route("open calculator") == ("open_app", {"app": "calculator"})
+    assert router.route("open report dot pdf") == ("open_target", {"target": "report dot pdf"})
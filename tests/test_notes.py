@@ -0,0 +1,42 @@
+import datetime
+
+from notes import NotesStore, chunks
+
+
+def test_add_last_search(tmp_path):
+    store = NotesStore(str(tmp_path / "notes.log"), legacy=None)
+    for text in ("buy milk", "call mom", "buy bread"):
+        store.add(text)
+    assert [text for _, text in store.last(2)] == ["call mom", "buy bread"]
+    assert [text for _, text in store.search("buy")] == ["buy bread", "buy milk"]
+
+
+def test_repair_indexes_lines_missing_from_index(tmp_path):
+    path = tmp_path / "notes.log"
+    NotesStore(str(path), legacy=None).add("first")
+    with open(path, "a", encoding="utf-8") as log:
+        log.write("2024-01-02T03:04:05\tafter crash\n")
+        log.write("2024-01-02T03:04:06\ttorn")      # half-written, no newline
+    store = NotesStore(str(path), legacy=None)
+    assert [text for _, text in store.last(5)] == ["first", "after crash"]
+    assert store.last(1)[0][0] == datetime.datetime(2024, 1, 2, 3, 4, 5)
+
+
+def test_foreign_line_is_skipped(tmp_path):
+    path = tmp_path / "notes.log"
+    store = NotesStore(str(path), legacy=None)
+    store.add("before")
+    with open(path, "a", encoding="utf-8") as log:
+        log.write("a line added by hand\n")
+        log.write("yesterday\tnot a timestamp\n")
+    store = NotesStore(str(path), legacy=None)
+    store.add("after")
+    assert [text for _, text in store.last(5)] == ["before", "after"]
+    assert [text for _, text in store.search("after")] == ["after"]
+    assert store.search("hand") == []
+
+
+def test_chunks_split_long_sentences():
+    parts = list(chunks("Short one. " + "word " * 100, maxLen=50))
+    assert parts[0] == "Short one."
+    assert all(len(part) <= 50 for part in parts)
@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("cv2")
+pytest.importorskip("mediapipe")
+
+from Handgesture import HandBatch                                       # noqa: E402
+from predictor import PREDICTORS, PredictiveTracker, TIP, matchHands    # noqa: E402
+
+
+def hand_at(x, y):
+    landmarks = np.full((21, 3), 0.5, dtype=np.float32)
+    landmarks[TIP, :2] = x, y
+    return landmarks
+
+
+def test_match_by_type_then_nearest_fingertip():
+    prev = np.array([[0.2, 0.5], [0.8, 0.5]])
+    assert matchHands(["left", "right"], prev, ["right", "left"], prev[::-1]).tolist() == [1, 0]
+    assert matchHands(["right", "right"], prev, ["right", "right"], prev[::-1]).tolist() == [1, 0]
+    assert matchHands(["left"], prev[:1], ["left", "right"], prev).tolist() == [0, -1]
+
+
+@pytest.mark.parametrize("name", sorted(PREDICTORS))
+def test_swapped_hand_order_keeps_each_hand_on_its_own_track(name):
+    predictor = PREDICTORS[name]()
+    # Left hand still at 0.2, right hand moving right at 1 unit/s
+    for i in range(5):
+        t = i * 0.03
+        tips, types = np.array([[0.2, 0.5], [0.6 + t, 0.5]]), ["left", "right"]
+        if i % 2:
+            tips, types = tips[::-1], types[::-1]      # MediaPipe listed them the other way round
+        predictor.update(t, tips, types)
+    ahead = dict(zip(predictor.keys, predictor.predict(0.12 + 0.05)))
+    assert ahead["left"] == pytest.approx([0.2, 0.5], abs=0.01)
+    assert ahead["right"] == pytest.approx([0.77, 0.5], abs=0.02)
+
+
+class SwappingDetector:
+    handedThumb = True
+
+    def __init__(self):
+        self.calls = 0
+
+    def findHands(self, img, draw=True):
+        self.calls += 1
+        hands = [(hand_at(0.2, 0.5), "left"), (hand_at(0.6, 0.5), "right")]
+        if self.calls % 2:
+            hands.reverse()
+        return img, HandBatch([h for h, _ in hands], [k for _, k in hands], img.shape)
+
+
+def test_predicted_frames_follow_the_right_hand():
+    clock = [0.0]
+    tracker = PredictiveTracker(SwappingDetector(), every=2, clock=lambda: clock[0])
+    frame = np.zeros((480, 640, 3), np.uint8)
+    for _ in range(10):
+        _, hands = tracker.findHands(frame, draw=False)
+        tips = {hand.type: hand.landmarks[TIP, :2] for hand in hands}
+        assert tips["left"] == pytest.approx([0.2, 0.5], abs=1e-3)
+        assert tips["right"] == pytest.approx([0.6, 0.5], abs=1e-3)
+        clock[0] += 1 / 30
+    assert tracker.stats()["pred_err_px_p95"] < 1.0
@@ -0,0 +1,70 @@
+"""Gesture regressions on a generated landmark recording, replayed through virtualmouse.dispatch."""
+import numpy as np
+import pytest
+
+pytest.importorskip("cv2")
+pytest.importorskip("mediapipe")
+
+from Handgesture import HandBatch               # noqa: E402
+from replay import Recorder, Recording, run_replay  # noqa: E402
+
+FRAME = np.zeros((480, 640, 3), dtype=np.uint8)
+FPS = 32            # exact in binary, so cooldown boundaries don't depend on rounding
+
+
+def right_hand(pattern, pinch=False):
+    """Landmarks whose finger states read as `pattern` (thumb .. pinky) for the physical right hand.
+
+    The preview isn't mirrored, so MediaPipe labels the physical right hand "left".
+    """
+    lm = np.full((21, 3), 0.5, dtype=np.float32)
+    lm[:, 1] = 0.6
+    lm[3, 0] = 0.5
+    lm[4, 0] = 0.55 if pattern[0] == "1" else 0.45
+    for finger, tip in zip(pattern[1:], (8, 12, 16, 20)):
+        lm[tip - 2, 1] = 0.5
+        lm[tip, 1] = 0.4 if finger == "1" else 0.6
+        lm[tip, 0] = 0.3 + tip / 40
+    if pinch:
+        lm[12, 0] = lm[8, 0] + 0.02     # index and middle tips ~13 px apart
+    return HandBatch(lm[None], ["left"], FRAME.shape)
+
+
+NO_HAND = HandBatch.empty(FRAME.shape)
+
+
+@pytest.fixture
+def recording(tmp_path):
+    script = ([right_hand("01100", pinch=True)] * 10     # pinch held: one click
+              + [NO_HAND] * 3
+              + [right_hand("00000")] * 5                # drag ...
+              + [NO_HAND] * 3                            # ... released when the hand is lost
+              + [right_hand("00010")] * 32)              # scroll up for a second
+    recorder = Recorder(str(tmp_path / "gestures.npz"))
+    for i, hands in enumerate(script):
+        recorder.add(FRAME, hands, t=i / FPS)
+    return recorder.save()
+
+
+def test_recorder_round_trip(recording):
+    rec = Recording(recording)
+    assert len(rec) == 53 and rec.has_landmarks and not rec.has_frames
+    assert len(rec.batch(0)) == 1 and len(rec.batch(10)) == 0
+    assert rec.batch(0).fingers[0].tolist() == [0, 1, 1, 0, 0]
+
+
+def test_gestures_replay_to_the_expected_actions(recording):
+    fake, stats = run_replay(recording, fast=True)
+    assert stats["frames"] == 53
+    # Scroll has a 0.2 s cooldown: at 32 fps it fires every 7th frame
+    assert fake.names() == ["click", "mouseDown", "mouseUp"] + ["scroll"] * 5
+    assert {c[2] for c in fake.calls if c[1] == "scroll"} == {200}
+
+
+def test_replay_restores_virtualmouse(recording):
+    import virtualmouse as vm
+    before = {name: getattr(vm, name) for name in ("actuator", "detector", "cursor_filter", "actions", "luffy")}
+    run_replay(recording, fast=True, cursor_filter="ema")
+    run_replay(recording, fast=True)
+    assert {name: getattr(vm, name) for name in before} == before
+    assert vm.dragging is False
@@ -0,0 +1,60 @@
+import types
+
+import numpy as np
+import pytest
+
+pytest.importorskip("cv2")
+pytest.importorskip("mediapipe")
+
+import Handgesture                  # noqa: E402
+from Handgesture import HandDetector    # noqa: E402
+
+
+class FakeHands:
+    """mp.solutions.hands.Hands stand-in: one hand centred in whatever image it gets."""
+
+    instances = []
+
+    def __init__(self, **kwargs):
+        self.shapes = []
+        self.miss = set()           # call numbers that find nothing
+        FakeHands.instances.append(self)
+
+    def process(self, img):
+        self.shapes.append(img.shape[:2])
+        if len(self.shapes) in self.miss:
+            return types.SimpleNamespace(multi_hand_landmarks=None, multi_handedness=None)
+        points = [types.SimpleNamespace(x=0.45 + 0.005 * (i % 3), y=0.45 + 0.005 * i, z=0.0) for i in range(21)]
+        label = types.SimpleNamespace(classification=[types.SimpleNamespace(label="Right")])
+        return types.SimpleNamespace(multi_hand_landmarks=[types.SimpleNamespace(landmark=points)],
+                                     multi_handedness=[label])
+
+
+@pytest.fixture
+def detector(monkeypatch):
+    FakeHands.instances = []
+    solutions = types.SimpleNamespace(hands=types.SimpleNamespace(Hands=FakeHands), drawing_utils=None)
+    monkeypatch.setattr(Handgesture.mp, "solutions", solutions, raising=False)
+    detector = HandDetector(roiRefresh=3)
+    detector.roi = True             # as virtualmouse --roi sets it
+    return detector
+
+
+def test_crops_and_full_frames_use_separate_trackers(detector):
+    frame = np.zeros((480, 640, 3), np.uint8)
+    for _ in range(8):
+        _, hands = detector.findHands(frame, draw=False)
+        assert len(hands) == 1
+    full, crops = FakeHands.instances
+    assert set(full.shapes) == {(480, 640)}
+    assert crops.shapes and (480, 640) not in crops.shapes
+    assert (detector.fullFrames, detector.roiFrames, detector.switchDrops) == (len(full.shapes), len(crops.shapes), 0)
+
+
+def test_hands_lost_on_a_switch_are_counted(detector):
+    full, = FakeHands.instances
+    full.miss = {2}                 # the refresh pass after the first crops misses the hand
+    frame = np.zeros((480, 640, 3), np.uint8)
+    for _ in range(6):
+        detector.findHands(frame, draw=False)
+    assert detector.switchDrops == 1
@@ -0,0 +1,85 @@
+import threading
+
+from tts import LOW, NORMAL, URGENT, FileEngine, Speaker
+
+
+class GatedEngine:
+    """Records utterances; each one blocks until the test releases it (or it is cut off)."""
+
+    def __init__(self):
+        self.said = []
+        self.cutoff = []
+        self.started = threading.Semaphore(0)
+        self.release = threading.Event()
+
+    def open(self):
+        pass
+
+    def say(self, text, cut):
+        self.said.append(text)
+        self.started.release()
+        while not self.release.is_set():
+            if cut.wait(0.01):
+                self.cutoff.append(text)
+                return
+
+    def close(self):
+        pass
+
+
+def busy_speaker():
+    """A Speaker whose engine is stuck on a first utterance, so later ones stay queued."""
+    engine = GatedEngine()
+    speaker = Speaker(engine)
+    speaker.speak("first")
+    assert engine.started.acquire(timeout=2)
+    return speaker, engine
+
+
+def test_queue_plays_by_priority_then_arrival():
+    speaker, engine = busy_speaker()
+    speaker.speak("low", LOW)
+    speaker.speak("normal one")
+    speaker.speak("urgent", URGENT)
+    speaker.speak("normal two", NORMAL)
+    engine.release.set()
+    assert speaker.wait(2)
+    assert engine.said == ["first", "urgent", "normal one", "normal two", "low"]
+    speaker.close()
+
+
+def test_same_key_is_merged_while_queued():
+    speaker, engine = busy_speaker()
+    a = speaker.speak("Volume 40", key="volume")
+    b = speaker.speak("Volume 50", key="volume")
+    assert a is b
+    engine.release.set()
+    assert speaker.wait(2)
+    assert engine.said == ["first", "Volume 50"]
+    assert speaker.stats()["merged"] == 1
+    speaker.close()
+
+
+def test_interrupt_drops_queued_and_cuts_the_current_one():
+    speaker, engine = busy_speaker()
+    dropped = speaker.speak("stale", LOW)
+    speaker.speak("now", URGENT, interrupt=True)
+    assert dropped.cancelled and dropped.wait(0)
+    assert engine.started.acquire(timeout=2)    # "now" started after "first" was cut
+    engine.release.set()
+    assert speaker.wait(2)
+    assert engine.said == ["first", "now"]
+    assert engine.cutoff == ["first"]
+    stats = speaker.stats()
+    assert (stats["spoken"], stats["dropped"]) == (2, 1)
+    speaker.close()
+
+
+def test_file_engine_writes_one_line_per_utterance(tmp_path):
+    path = tmp_path / "speech.log"
+    speaker = Speaker(FileEngine(str(path)))
+    speaker.speak("hello")
+    speaker.speak("world", wait=True)
+    speaker.close()
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert [line.split("\t")[1] for line in lines] == ["hello", "world"]
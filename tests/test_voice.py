@@ -0,0 +1,25 @@
+import pytest
+
+pytest.importorskip("speech_recognition")
+
+from voice import FakeRecognizer, Listener     # noqa: E402
+
+
+def test_phrases_held_back_while_busy_go_to_barge_in():
+    busy = [True]
+    heard = []
+    listener = Listener(source=object(), recognizer=FakeRecognizer(["stop", "hello", "open notepad"]),
+                        calibrate=0, ignore=lambda: busy[0])
+    listener.active.set()
+    listener._heard(None)                   # no hook: dropped unrecognized
+    listener.bargeIn = lambda text: heard.append(text) or text == "stop"
+    listener._heard(None)                   # "stop": acted on
+    listener._heard(None)                   # "hello": not for the hook, dropped
+    busy[0] = False
+    listener._heard(None)
+    assert listener.get(timeout=2) == "open notepad"
+    listener.stop()
+    listener.pool.shutdown(wait=True)
+    assert heard == ["stop", "hello"]
+    stats = listener.stats()
+    assert (stats["barge_ins"], stats["ignored"], stats["phrases"]) == (1, 2, 3)
@@ -0,0 +1,73 @@
+import threading
+
+import pytest
+
+requests = pytest.importorskip("requests")
+
+from webclient import HttpClient, StubServer, TTLCache, WeatherService
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_fresh_entry_is_a_hit():
+    clock, calls = Clock(), []
+    cache = TTLCache(ttl=60, stale=600, clock=clock)
+    assert cache.get("delhi", lambda: calls.append(1) or "+30°C") == "+30°C"
+    clock.now = 59
+    assert cache.get("delhi", lambda: calls.append(1) or "+31°C") == "+30°C"
+    assert (cache.misses, cache.hits, len(calls)) == (1, 1, 1)
+
+
+def test_stale_entry_is_served_while_one_refresh_runs():
+    clock = Clock()
+    cache = TTLCache(ttl=60, stale=600, clock=clock)
+    cache.get("delhi", lambda: "+30°C")
+    clock.now = 120
+    release, calls = threading.Event(), []
+
+    def slow():
+        calls.append(1)
+        release.wait(2)
+        return "+32°C"
+
+    assert cache.get("delhi", slow) == "+30°C"
+    assert cache.get("delhi", slow) == "+30°C"     # refresh already in flight
+    done = cache.inflight["delhi"]
+    release.set()
+    assert done.wait(2)
+    assert cache.get("delhi", slow) == "+32°C"
+    assert (cache.staleHits, len(calls)) == (2, 1)
+
+
+def test_expired_entry_falls_back_when_the_fetch_fails():
+    clock = Clock()
+    cache = TTLCache(ttl=60, stale=600, clock=clock)
+    cache.get("delhi", lambda: "+30°C")
+    clock.now = 1000
+
+    def fail():
+        raise requests.ConnectionError("offline")
+
+    assert cache.get("delhi", fail) == "+30°C"
+    with pytest.raises(requests.ConnectionError):
+        cache.get("mumbai", fail)
+    assert "delhi" not in cache.inflight and "mumbai" not in cache.inflight
+
+
+def test_weather_service_caches_per_city():
+    stub = StubServer()
+    try:
+        weather = WeatherService(HttpClient(), stub.url)
+        first = weather.temperature("Delhi")
+        assert weather.temperature(" delhi ") == first
+        assert weather.temperature("Mumbai") != first
+        assert stub.calls == 2
+    finally:
+        weather.client.close()
+        stub.close()
@@ -0,0 +1,243 @@
+"""Text-to-speech on a dedicated worker thread.
+
+speak() only queues the text and returns, so confirmations like "Volume up"
+no longer hold up the command loop. Utterances are ordered by priority (then
+arrival). A queued utterance with the same merge key (by default its text) is
+replaced instead of being queued twice, and interrupt=True drops everything
+queued at the same or lower priority and cuts off the current utterance.
+Callers that must not talk over the audio (Luffy before it listens) call wait().
+
+The engine is pluggable: pyttsx3 for real audio, or NullEngine / FileEngine to
+run without audio hardware.
+"""
+import heapq
+import itertools
+import threading
+import time
+
+import startup
+
+URGENT, NORMAL, LOW = 0, 1, 2
+
+
+# -------------------- Engines --------------------
+class NullEngine:
+    """Speaks nothing. Set wordsPerSecond to simulate how long real speech would take."""
+
+    def __init__(self, wordsPerSecond=0.0):
+        self.wordsPerSecond = wordsPerSecond
+
+    def open(self):
+        pass
+
+    def say(self, text, cut):
+        if self.wordsPerSecond:
+            cut.wait(len(text.split()) / self.wordsPerSecond)
+
+    def close(self):
+        pass
+
+
+class FileEngine(NullEngine):
+    """Appends every utterance to a text file, one "<time>\\t<text>" line each."""
+
+    def __init__(self, path, wordsPerSecond=0.0):
+        super().__init__(wordsPerSecond)
+        self.path = path
+        self.file = None
+
+    def open(self):
+        self.file = open(self.path, "a", encoding="utf-8")
+
+    def say(self, text, cut):
+        self.file.write(f"{time.time():.3f}\t{text}\n")
+        self.file.flush()
+        super().say(text, cut)
+
+    def close(self):
+        if self.file:
+            self.file.close()
+
+
+class Pyttsx3Engine:
+    """pyttsx3 driven entirely from the worker thread, which SAPI / NSSpeech need."""
+
+    def __init__(self, rate=170):
+        self.rate = rate
+        self.engine = None
+        self._cut = None
+
+    def open(self):
+        import pyttsx3
+        self.engine = pyttsx3.init()
+        self.engine.setProperty("rate", self.rate)
+        # engine.stop() is only safe from the engine's own callbacks
+        self.engine.connect("started-word", self._onWord)
+
+    def _onWord(self, name, location, length):
+        if self._cut.is_set():
+            self.engine.stop()
+
+    def say(self, text, cut):
+        self._cut = cut
+        self.engine.say(text)
+        self.engine.runAndWait()
+
+    def close(self):
+        pass
+
+
+def makeEngine(spec="pyttsx3"):
+    """'pyttsx3', 'null' or 'file:<path>'."""
+    if spec == "null":
+        return NullEngine()
+    if spec.startswith("file:"):
+        return FileEngine(spec[5:])
+    return Pyttsx3Engine()
+
+
+# -------------------- Worker --------------------
+class Utterance:
+    __slots__ = ("text", "priority", "key", "queued", "done", "cancelled")
+
+    def __init__(self, text, priority, key):
+        self.text = text
+        self.priority = priority
+        self.key = key
+        self.queued = time.perf_counter()
+        self.done = threading.Event()
+        self.cancelled = False
+
+    def wait(self, timeout=None):
+        return self.done.wait(timeout)
+
+
+class Speaker:
+    def __init__(self, engine=None):
+        self.engine = engine or NullEngine()
+        self._heap = []
+        self._seq = itertools.count()
+        self._pending = {}              # merge key -> queued Utterance
+        self._cond = threading.Condition()
+        self._current = None
+        self._cut = threading.Event()   # set to cut off the current utterance
+        self._closed = False
+
+        self.spoken = 0
+        self.merged = 0
+        self.dropped = 0
+        self.failed = 0
+        self.queueTime = 0.0            # total seconds utterances waited before playing
+
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def speak(self, text, priority=NORMAL, interrupt=False, key=None, wait=False):
+        """Queues text and returns its Utterance (wait=True blocks until it has been spoken)."""
+        key = text if key is None else key
+        with self._cond:
+            if interrupt:
+                self._dropQueued(priority)
+                if self._current is not None and self._current.priority >= priority:
+                    self._cut.set()
+
+            queued = self._pending.get(key)
+            if queued is not None and not queued.cancelled:
+                # Same message still waiting: update it in place instead of repeating it
+                queued.text = text
+                self.merged += 1
+                utterance = queued
+            else:
+                utterance = Utterance(text, priority, key)
+                self._pending[key] = utterance
+                heapq.heappush(self._heap, (priority, next(self._seq), utterance))
+                self._cond.notify()
+        if wait:
+            utterance.wait()
+        return utterance
+
+    def _dropQueued(self, priority):
+        keep = []
+        for item in self._heap:
+            u = item[2]
+            if u.priority >= priority:
+                u.cancelled = True
+                self._pending.pop(u.key, None)
+                u.done.set()
+                self.dropped += 1
+            else:
+                keep.append(item)
+        heapq.heapify(keep)
+        self._heap = keep
+        self._cond.notify_all()
+
+    def interrupt(self):
+        """Drops everything queued and cuts off the current utterance."""
+        with self._cond:
+            self._dropQueued(URGENT)
+            if self._current is not None:
+                self._cut.set()
+
+    def busy(self):
+        with self._cond:
+            return self._current is not None or bool(self._heap)
+
+    def wait(self, timeout=None):
+        """Blocks until everything queued has been spoken; returns False on timeout."""
+        end = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self._current is not None or self._heap:
+                left = None if end is None else end - time.monotonic()
+                if left is not None and left <= 0:
+                    return False
+                self._cond.wait(left)
+        return True
+
+    def close(self, timeout=2.0):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+
+    def _run(self):
+        try:
+            with startup.timed("tts", "init"):
+                self.engine.open()
+        except Exception as e:
+            print("⚠️ Text-to-speech unavailable:", e)
+            self.engine = NullEngine()
+        while True:
+            with self._cond:
+                while not self._heap and not self._closed:
+                    self._cond.wait()
+                if not self._heap:
+                    break
+                _, _, u = heapq.heappop(self._heap)
+                if self._pending.get(u.key) is u:
+                    del self._pending[u.key]
+                if u.cancelled:
+                    self._cond.notify_all()
+                    continue
+                self._current = u
+                self._cut.clear()
+                self.queueTime += time.perf_counter() - u.queued
+            try:
+                self.engine.say(u.text, self._cut)
+                self.spoken += 1
+            except Exception as e:
+                self.failed += 1
+                print("⚠️ Speech failed:", e)
+            with self._cond:
+                self._current = None
+                u.done.set()
+                self._cond.notify_all()
+        self.engine.close()
+
+    def stats(self):
+        return {
+            "spoken": self.spoken,
+            "merged": self.merged,
+            "dropped": self.dropped,
+            "failed": self.failed,
+            "queue_ms_avg": round(1000 * self.queueTime / self.spoken, 1) if self.spoken else 0.0,
+        }
@@ -1,213 +1,457 @@
-import cv2
-import mediapipe as mp
-import numpy as np
-import pyautogui
+import startup   # first, so the timings below cover the heavy imports
 import time
-import math
-import datetime
-import os
 import threading
-from pycaw.pycaw import AudioUtilities, IAudioEndpointVolume
-from comtypes import CLSCTX_ALL
-import screen_brightness_control as sbc
-from luffy import luffy_main   # Import Luffy assistant
+import argparse
+with startup.timed("opencv", "import"):
+    import cv2
+    import numpy as np
+with startup.timed("mediapipe", "import"):
+    from Handgesture import HandDetector
+from pipeline import Pipeline
+from actions import ActionExecutor
+from filters import makeFilter
+from gestures import GestureEngine
+from actuator import makeActuator, FakeActuator
+from assistant import LuffyProcess, FakeLuffy
+from devices import DeviceSetter, openBrightness, openVolume
+from screencap import ScreenshotService
+
+# -------------------- Optional Backends --------------------
+# Missing backends (no display, non-Windows CI) only disable their gestures,
+# so recordings can still be replayed with a FakeActuator.
+with startup.timed("actuator", "init"):
+    actuator = makeActuator()   # SendInput / XTest / pyautogui without PAUSE, see actuator.py
+
+# Brightness and volume are applied on their own worker threads (latest value
+# wins, see devices.py). Luffy runs in its own process, started on its first
+# gesture and reused after that (see assistant.py).
+brightness = DeviceSetter("brightness", openBrightness, minDelta=2, maxRate=5)
+volume = DeviceSetter("volume", openVolume, minDelta=0.01, maxRate=20)
+quit_requested = threading.Event()   # Luffy was asked to close the gesture program
+
+def luffy_action(name, *args):
+    """Actions Luffy's process asks this one to perform."""
+    if name == "quit":
+        quit_requested.set()
+
+luffy = LuffyProcess(onAction=luffy_action)
 
 # -------------------- Setup --------------------
-mpHands = mp.solutions.hands
-hands = mpHands.Hands(max_num_hands=2)
-mpDraw = mp.solutions.drawing_utils
-
-screen_width, screen_height = pyautogui.size()
-
-# Camera setup
-cap = cv2.VideoCapture(0)
-cap.set(3, 640)
-cap.set(4, 480)
-time.sleep(1)
-
-# Audio setup
-try:
-    devices = AudioUtilities.GetSpeakers()
-    interface = devices.Activate(IAudioEndpointVolume._iid_, CLSCTX_ALL, None)
-    volume = interface.QueryInterface(IAudioEndpointVolume)
-except Exception as e:
-    print(f"⚠️ Audio control error: {e}")
-    volume = None
+detector = None     # built in main(); replay.py and benchmark.py bring their own
+gestures = GestureEngine.load()   # finger pattern -> action tables, see gestures.json
+
+screen_width, screen_height = actuator.size() if actuator else (1920, 1080)
+recorder = None        # replay.Recorder when running with --record
+governor = None        # idle.IdleGovernor unless --idle-after 0
 
 # Variables
-prev_x, prev_y = 0, 0
-smoothening = 5
+cursor_filter = makeFilter("one-euro")   # smooths the fingertip in normalized coordinates
 dragging = False
 pTime = time.time()
+fps = 0.0
 current_volume_percent = 0
 gesture_label = ""
-luffy_active = False   # Track if Luffy is running
+actions = ActionExecutor()   # pyautogui / hotkey calls run off the vision loop
 
-# Screenshot folder
-screenshot_folder = "screenshots"
-os.makedirs(screenshot_folder, exist_ok=True)
+# Screenshots are grabbed on the action thread and encoded / saved in the background
+screenshots = ScreenshotService("screenshots")
 
 # -------------------- Helper Functions --------------------
-def fingersUp(lmList):
-    fingers = []
-    fingers.append(1 if lmList[4][0] > lmList[3][0] else 0)  # Thumb
-    for id in range(8, 21, 4):
-        fingers.append(1 if lmList[id][1] < lmList[id-2][1] else 0)
-    return fingers
-
-def findDistance(p1, p2):
-    return np.hypot(p2[0]-p1[0], p2[1]-p1[1])
+def open_camera(index=0, timeout=5.0):
+    """Opens the camera and returns as soon as it delivers a frame (no fixed warm-up sleep)."""
+    with startup.timed("camera", "open"):
+        cap = cv2.VideoCapture(index)
+        cap.set(3, 640)
+        cap.set(4, 480)
+    with startup.timed("camera", "1st frame"):
+        deadline = time.perf_counter() + timeout
+        while cap.isOpened() and not cap.read()[0]:
+            if time.perf_counter() > deadline:
+                print("⚠️ Camera has not delivered a frame yet")
+                break
+            time.sleep(0.01)
+    return cap
 
 def take_screenshot():
-    filename = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S.png")
-    filepath = os.path.join(screenshot_folder, filename)
-    pyautogui.screenshot(filepath)
-    print(f"📸 Screenshot saved: {filepath}")
+    filepath = screenshots.take()
+    if filepath:
+        print(f"📸 Screenshot: {filepath}")
+
+finger_panels = {}   # finger state tuple -> pre-rendered overlay panel
 
 def draw_finger_overlay(img, fingers):
+    key = tuple(int(f) for f in fingers)
+    panel = finger_panels.get(key)
+    if panel is None:
+        # Rendered once per finger state (32 at most), then blitted every frame
+        panel = np.empty((151, 181, 3), dtype=np.uint8)   # filled rectangle is inclusive
+        panel[:] = (50,50,50)
+        cv2.putText(panel, "Fingers:", (10, 20),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255,255,0), 2)
+        labels = ["Thumb","Index","Middle","Ring","Pinky"]
+        for i, label in enumerate(labels):
+            color = (0,255,0) if key[i]==1 else (100,100,100)
+            cv2.putText(panel, label, (10, 50+i*20),
+                        cv2.FONT_HERSHEY_SIMPLEX,0.5,color,2)
+        finger_panels[key] = panel
     h, w, _ = img.shape
+    if w < 200 or h < 171:
+        return   # frame too small for the panel (e.g. a small --idle-width)
     x0, y0 = w - 200, 20
-    cv2.rectangle(img, (x0, y0), (x0+180, y0+150), (50,50,50), -1)
-    cv2.putText(img, "Fingers:", (x0+10, y0+20),
-                cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255,255,0), 2)
-    labels = ["Thumb","Index","Middle","Ring","Pinky"]
-    for i, label in enumerate(labels):
-        color = (0,255,0) if fingers[i]==1 else (100,100,100)
-        cv2.putText(img, label, (x0+10, y0+50+i*20),
-                    cv2.FONT_HERSHEY_SIMPLEX,0.5,color,2)
-
-# -------------------- Main Loop --------------------
-while True:
-    success, img = cap.read()
-    if not success:
-        continue
-
-    imgRGB = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-    results = hands.process(imgRGB)
-
-    lmLists = []
-    if results.multi_hand_landmarks:
-        for handLms in results.multi_hand_landmarks:
-            lmList = []
-            h, w, c = img.shape
-            for id, lm in enumerate(handLms.landmark):
-                cx, cy = int(lm.x*w), int(lm.y*h)
-                lmList.append((cx,cy))
-            lmLists.append(lmList)
-            mpDraw.draw_landmarks(img, handLms, mpHands.HAND_CONNECTIONS)
-
+    img[y0:y0+151, x0:x0+181] = panel
+
+def make_detector(**kwargs):
+    """The camera HandDetector with this app's settings."""
+    with startup.timed("mediapipe", "init"):
+        return HandDetector(maxHands=2, detectionCon=0.5, trackCon=0.5, **kwargs)
+
+# -------------------- Frame Stages --------------------
+def use_actuator(backend, fakes=True):
+    """Sends mouse and keyboard actions to `backend`; fakes=True also screenshots, brightness, volume, Luffy."""
+    global actuator, screen_width, screen_height, screenshots, luffy
+    if actuator is not None and actuator is not backend:
+        actuator.close()
+    actuator = backend
+    if fakes:
+        screenshots = backend
+        brightness.use(backend.set_brightness)
+        volume.use(lambda level: backend.SetMasterVolumeLevelScalar(level, None))
+        luffy = FakeLuffy(backend.luffy_main)
+    screen_width, screen_height = backend.size()
+
+def detect(img):
+    """Runs hand detection and returns a HandBatch (landmarks, finger states, boxes)."""
+    _, hands_data = detector.findHands(img, draw=False)
+    if recorder is not None:
+        recorder.add(img, hands_data)
+    return hands_data
+
+# ---------------- Gesture Actions ---------------- #
+# Each handler gets (hand, side, gesture, t) and returns the label to show ("" for none).
+# Which finger pattern triggers which handler, and with what thresholds, lives in gestures.json.
+def act_cursor(hand, side, g, t):
+    frame_h, frame_w = hand_frame_shape[:2]
+    fx, fy = cursor_filter(HAND_SLOTS[side], t, hand.landmarks[8, :2])
+    curr_x = np.interp(fx*frame_w, g.params["x_range"], (0,screen_width))
+    curr_y = np.interp(fy*frame_h, g.params["y_range"], (0,screen_height))
+    actions.submit(actuator.moveTo, curr_x, curr_y, coalesce="cursor")
+    actions.hold(side, g.label)
+    return g.label
+
+def act_click(hand, side, g, t):
+    if hand.distance(*g.params["points"]) < g.params["max_distance"]:
+        actions.fire(side, g.label, actuator.click, cooldown=g.cooldown, edge=g.edge)
+        return g.label
+    return ""
+
+def act_right_click(hand, side, g, t):
+    actions.fire(side, g.label, actuator.rightClick, cooldown=g.cooldown, edge=g.edge)
+    return g.label
+
+def act_drag(hand, side, g, t):
+    global dragging
+    if not dragging:
+        actions.submit(actuator.mouseDown)
+        dragging = True
+    return g.label
+
+def act_scroll(hand, side, g, t):
+    actions.fire(side, g.label, actuator.scroll, g.params["amount"], cooldown=g.cooldown, edge=g.edge)
+    return g.label
+
+def act_screenshot(hand, side, g, t):
+    actions.fire(side, g.label, take_screenshot, cooldown=g.cooldown, edge=g.edge)
+    return g.label
+
+def act_hotkey(hand, side, g, t):
+    actions.fire(side, g.label, actuator.hotkey, *g.params["keys"], cooldown=g.cooldown, edge=g.edge)
+    return g.label
+
+def act_brightness(hand, side, g, t):
+    dist = hand.distance(*g.params["points"])
+    bright = np.interp(dist, g.params["range"], [0,100])
+    if not brightness.available:
+        return ""
+    brightness.set(int(bright))
+    return g.label
+
+def act_luffy(hand, side, g, t):
+    if luffy.active or not luffy.activate():
+        return ""
+    return g.label
+
+def act_volume(hand, side, g, t):
+    global current_volume_percent
+    if not volume.available:
+        return ""
+    y = hand.px[g.params.get("point", 9)][1]
+    vol = np.interp(y, g.params["range"], [1.0,0.0])
+    volume.set(float(vol))
+    current_volume_percent = int(vol*100)
+    return g.label
+
+GESTURE_ACTIONS = {
+    "cursor": act_cursor, "click": act_click, "right_click": act_right_click, "drag": act_drag,
+    "scroll": act_scroll, "screenshot": act_screenshot, "hotkey": act_hotkey,
+    "brightness": act_brightness, "luffy": act_luffy, "volume": act_volume,
+}
+HAND_SLOTS = {"right": 0, "left": 1}   # per-hand filter state
+hand_frame_shape = (480, 640, 3)
+
+def dispatch(hands_data, t=None):
+    """Looks up each hand's finger pattern in the gesture table and runs its action."""
+    global dragging, gesture_label, hand_frame_shape
+
+    t = time.monotonic() if t is None else t
     gesture_label = ""
-    for i, lmList in enumerate(lmLists):
-        if not lmList:
+    actions.new_frame(t)
+    hand_frame_shape = hands_data.shape
+    if not actuator:
+        return
+
+    still_dragging = False
+    for _, hand, side, gesture in gestures.match(hands_data):
+        if gesture is None:
             continue
-        fingers = fingersUp(lmList)
-
-        # ---------------- Right Hand Controls ---------------- #
-        if i == 0:
-            if fingers == [0,1,0,0,0]:  # Cursor move
-                x, y = lmList[8]
-                screen_x = np.interp(x,(100,540),(0,screen_width))
-                screen_y = np.interp(y,(100,380),(0,screen_height))
-                curr_x = prev_x + (screen_x - prev_x)/smoothening
-                curr_y = prev_y + (screen_y - prev_y)/smoothening
-                pyautogui.moveTo(curr_x,curr_y)
-                prev_x, prev_y = curr_x, curr_y
-                gesture_label = "Cursor Move"
-
-            elif fingers == [0,1,1,0,0]:  # Left click
-                dist = findDistance(lmList[8], lmList[12])
-                if dist<30:
-                    pyautogui.click()
-                    gesture_label = "Left Click"
-                    time.sleep(0.2)
-
-            elif fingers == [1,1,0,0,0]:  # Right click
-                pyautogui.rightClick()
-                gesture_label = "Right Click"
-                time.sleep(0.3)
-
-            elif fingers == [0,0,0,0,0]:  # Drag
-                if not dragging:
-                    pyautogui.mouseDown()
-                    dragging = True
-                    gesture_label = "Drag Mode"
-            elif dragging and fingers != [0,0,0,0,0]:
-                pyautogui.mouseUp()
-                dragging = False
-
-            elif fingers == [0,0,0,1,0]:  # Scroll up
-                pyautogui.scroll(200)
-                gesture_label = "Scroll Up"
-                time.sleep(0.2)
-
-            elif fingers == [0,0,0,1,1]:  # Scroll down
-                pyautogui.scroll(-200)
-                gesture_label = "Scroll Down"
-                time.sleep(0.2)
-
-            elif fingers == [1,0,0,0,1]:  # Screenshot
-                take_screenshot()
-                gesture_label = "Screenshot"
-                time.sleep(0.5)
-
-            elif fingers == [1,0,0,1,1]:  # Tab Change
-                pyautogui.hotkey('ctrl','tab')
-                gesture_label = "Tab Change"
-                time.sleep(0.3)
-
-            elif fingers == [0,0,0,0,1]:  # Brightness
-                dist = findDistance(lmList[4], lmList[20])
-                bright = np.interp(dist,[30,200],[0,100])
-                try:
-                    sbc.set_brightness(int(bright))
-                    gesture_label = "Brightness Control"
-                except Exception as e:
-                    print(f"⚠️ Brightness error: {e}")
-
-            elif fingers == [0,1,1,1,0] and not luffy_active:  # NEW Gesture → Activate Luffy
-                luffy_active = True
-                threading.Thread(target=luffy_main, daemon=True).start()
-                gesture_label = "Luffy Activated"
-                time.sleep(0.5)
-
-        # ---------------- Left Hand Controls ---------------- #
-        if i == 1 and volume:
-            if fingers[0]==0 and fingers[1]==1 and fingers[2]==1:  # Volume
-                y = lmList[9][1]
-                vol = np.interp(y,[100,380],[1.0,0.0])
-                volume.SetMasterVolumeLevelScalar(vol,None)
-                current_volume_percent = int(vol*100)
-                gesture_label = "Volume Control"
-
-            elif fingers == [1,1,1,1,1]:
-                pyautogui.hotkey('win','d')
-                gesture_label = "Minimize All"
-                time.sleep(0.5)
-
-            elif fingers == [0,1,1,1,1]:
-                pyautogui.hotkey('win','up')
-                gesture_label = "Maximize"
-                time.sleep(0.5)
-
-            elif fingers == [1,0,1,0,1]:
-                pyautogui.hotkey('ctrl','w')
-                gesture_label = "Close Tab"
-                time.sleep(0.3)
+        label = GESTURE_ACTIONS[gesture.action](hand, side, gesture, t)
+        still_dragging |= gesture.action == "drag"
+        if label:
+            gesture_label = label
+
+    if dragging and not still_dragging:
+        actions.submit(actuator.mouseUp)
+        dragging = False
+
+def tick():
+    """Updates the tracking-loop FPS; called once per processed frame, whether or not it is drawn."""
+    global pTime, fps
+    # Smoothed so the overlay isn't a single noisy frame delta (use benchmark.py for real numbers)
+    cTime = time.time()
+    if cTime > pTime:
+        fps = 0.9*fps + 0.1/(cTime-pTime) if fps else 1/(cTime-pTime)
+    pTime = cTime
 
+def draw(img, hands_data, status_lines=()):
+    """Draws landmarks, finger states and the text overlays onto img."""
+    detector.drawHands(img, hands_data, bbox=False)
+    for fingers in hands_data.fingers:
         draw_finger_overlay(img, fingers)
 
-    # ---------------- Display ----------------
-    cTime = time.time()
-    fps = 1/(cTime-pTime)
-    pTime = cTime
     cv2.putText(img,f'FPS: {int(fps)}',(10,30),cv2.FONT_HERSHEY_SIMPLEX,1,(255,0,0),2)
     cv2.putText(img,f'Vol: {current_volume_percent}%',(10,70),cv2.FONT_HERSHEY_SIMPLEX,1,(0,255,0),2)
     if gesture_label:
         cv2.putText(img,f'{gesture_label}',(10,110),cv2.FONT_HERSHEY_SIMPLEX,1,(0,255,255),2)
-
+    if luffy.active:
+        cv2.putText(img,f'Luffy: {luffy.status}',(10,150),cv2.FONT_HERSHEY_SIMPLEX,0.8,(255,0,255),2)
+    if governor is not None and governor.idle:
+        cv2.putText(img,f'Idle ({governor.idleHz:g} Hz)',(10,190),cv2.FONT_HERSHEY_SIMPLEX,0.8,(128,128,128),2)
+    for j, line in enumerate(status_lines):
+        cv2.putText(img,line,(10,img.shape[0]-20-j*25),cv2.FONT_HERSHEY_SIMPLEX,0.6,(255,255,255),2)
+    return img
+
+def show(img):
+    """Shows the frame. Returns False when 'q' is pressed."""
     cv2.imshow("Hand Tracking", img)
-    if cv2.waitKey(1) & 0xFF==ord('q'):
-        break
+    return not (cv2.waitKey(1) & 0xFF==ord('q'))
+
+def render(img, hands_data, status_lines=()):
+    draw(img, hands_data, status_lines)
+    return show(img)
 
-cap.release()
-cv2.destroyAllWindows()
+# -------------------- Main Loop --------------------
+def run_sequential(cap, headless=False, preview_fps=None):
+    """Single loop. headless skips all drawing; preview_fps caps how often the preview is drawn."""
+    preview_interval = 1.0/preview_fps if preview_fps else 0.0
+    next_preview = 0.0
+    read = cap.read if governor is None else lambda: governor.read(cap)   # idle: paced polls
+    try:
+        while not quit_requested.is_set():
+            success, img = read()
+            if not success:
+                if not cap.isOpened():   # end of a replay
+                    break
+                continue
+
+            hands_data = detect(img)
+            dispatch(hands_data)
+            tick()
+            if headless:
+                continue
+
+            now = time.perf_counter()
+            if now < next_preview:
+                continue
+            next_preview = now + preview_interval
+            if not render(img, hands_data):
+                break
+    except KeyboardInterrupt:
+        pass
+
+def run_pipelined(cap, headless=False, preview_fps=None):
+    """Capture, inference, dispatch and render on separate stages (see pipeline.py)."""
+    cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
+    def infer_stage(packet):
+        packet.hands = detect(packet.img)
+
+    def dispatch_stage(packet):
+        dispatch(packet.hands)
+        tick()
+        if quit_requested.is_set():
+            pipe.running = False
+
+    def render_stage(packet, pipe):
+        s = pipe.stats()
+        status = [
+            f"Latency: {s['latency_ms_last']} ms",
+            f"Dropped: {s['dropped_before_inference']}/{s['dropped_before_dispatch']}/{s['dropped_before_render']}",
+        ]
+        return render(packet.img, packet.hands, status)
+
+    render_fn = None if headless else render_stage
+    read = None if governor is None else lambda: governor.read(cap)
+    pipe = Pipeline(cap, infer_stage, dispatch_stage, render_fn, preview_fps, read)
+    stats = pipe.run()
+    print(f"📊 Pipeline stats: {stats}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Sky Pointer gesture controlled mouse")
+    parser.add_argument("--pipeline", action="store_true",
+                        help="run capture / inference / dispatch / render on separate threads")
+    parser.add_argument("--record", metavar="PATH",
+                        help="save per-frame landmarks, handedness and timestamps to a .npz file")
+    parser.add_argument("--record-frames", action="store_true",
+                        help="also save the camera frames (JPEG) with --record")
+    parser.add_argument("--replay", metavar="PATH",
+                        help="play back a .npz recording or video file instead of the camera; "
+                             "actions go to a FakeActuator")
+    parser.add_argument("--fast", action="store_true", help="with --replay, ignore recorded pacing")
+    parser.add_argument("--roi", action="store_true",
+                        help="run hand detection on a crop around last frame's hands")
+    parser.add_argument("--infer-every", type=int, default=1, metavar="N",
+                        help="run MediaPipe on every Nth frame and predict the cursor in between")
+    parser.add_argument("--adaptive-infer", action="store_true",
+                        help="pick the inference rate from its measured cost (see --max-cpu)")
+    parser.add_argument("--max-cpu", type=float, default=0.5,
+                        help="with --adaptive-infer, share of one core inference may use")
+    parser.add_argument("--predictor", choices=("kalman", "cv"), default="kalman",
+                        help="motion model used between inference passes")
+    parser.add_argument("--filter", choices=("one-euro", "ema", "none"), default="one-euro",
+                        help="cursor filter (ema is the old fixed smoothening = 5)")
+    parser.add_argument("--min-cutoff", type=float, default=1.0,
+                        help="one-euro: cutoff (Hz) when the hand is still; lower = less jitter")
+    parser.add_argument("--beta", type=float, default=10.0,
+                        help="one-euro: how fast the cutoff opens with speed; higher = less lag")
+    parser.add_argument("--headless", action="store_true",
+                        help="no preview window and no drawing (stop with Ctrl+C)")
+    parser.add_argument("--preview-fps", type=float, metavar="FPS",
+                        help="draw the preview at most this often, independent of tracking rate")
+    parser.add_argument("--gestures", metavar="PATH",
+                        help="gesture table to use instead of gestures.json")
+    parser.add_argument("--actuator", choices=("auto", "sendinput", "xtest", "pyautogui"), default="auto",
+                        help="mouse / keyboard injection backend")
+    parser.add_argument("--move-hz", type=float, default=60.0,
+                        help="cursor moves sent to the OS per second at most (display rate)")
+    parser.add_argument("--brightness-step", type=float, default=2,
+                        help="ignore brightness changes smaller than this many percent")
+    parser.add_argument("--volume-step", type=float, default=1,
+                        help="ignore volume changes smaller than this many percent")
+    parser.add_argument("--screenshot-format", choices=("png", "jpg", "webp"), default="png")
+    parser.add_argument("--screenshot-quality", type=int,
+                        help="PNG compression 0-9 (default 1), JPEG / WebP quality 0-100 (default 90)")
+    parser.add_argument("--idle-after", type=float, default=30.0, metavar="SECONDS",
+                        help="poll for hands at a low rate after this long without one (0 = never)")
+    parser.add_argument("--idle-hz", type=float, default=4.0,
+                        help="hand detection passes per second while idle")
+    parser.add_argument("--idle-width", type=int, default=320,
+                        help="capture / inference width (px) while idle, with the lighter model")
+    parser.add_argument("--prewarm-luffy", action="store_true",
+                        help="start Luffy's process at startup instead of on its first gesture")
+    args = parser.parse_args()
+
+    global recorder, detector, cursor_filter, gestures, screenshots, governor
+    screenshots = ScreenshotService("screenshots", args.screenshot_format, args.screenshot_quality)
+    if args.gestures:
+        gestures = GestureEngine.load(args.gestures)
+    if args.filter == "one-euro":
+        cursor_filter = makeFilter("one-euro", minCutoff=args.min_cutoff, beta=args.beta)
+    else:
+        cursor_filter = makeFilter(args.filter)
+    if args.replay:
+        from replay import ReplayCapture, ReplayDetector
+        cap = ReplayCapture(args.replay, realtime=not args.fast)
+        if cap.recording is not None and not cap.recording.has_frames:
+            detector = ReplayDetector(cap)
+        use_actuator(FakeActuator())
+    else:
+        if args.actuator != "auto" or (actuator is not None and args.move_hz != actuator.rate):
+            backend = makeActuator(args.actuator, args.move_hz)
+            if backend is not None:
+                use_actuator(backend, fakes=False)
+        cap = open_camera()
+    if detector is None:
+        detector = make_detector(roi=args.roi)
+    base_detector = detector
+    tracker = None
+    if args.infer_every > 1 or args.adaptive_infer:
+        from predictor import PredictiveTracker
+        tracker = detector = PredictiveTracker(base_detector, args.predictor, args.infer_every,
+                                               args.adaptive_infer, args.max_cpu)
+        if args.replay:
+            tracker.clock = lambda: cap.timestamp
+    if args.idle_after > 0:
+        from idle import IdleGovernor
+        light = None
+        if isinstance(base_detector, HandDetector):
+            light = lambda: HandDetector(maxHands=base_detector.maxHands, detectionCon=base_detector.detectionCon,
+                                         trackCon=base_detector.trackCon, handedThumb=base_detector.handedThumb,
+                                         modelComplexity=0)
+        # A replay is neither resized nor paced: frames between polls still go through dispatch
+        governor = detector = IdleGovernor(detector, light, args.idle_after, args.idle_hz, args.idle_width,
+                                           capture=None if args.replay else cap)
+        if args.replay:
+            governor.clock = lambda: cap.timestamp
+    if args.record:
+        from replay import Recorder
+        recorder = Recorder(args.record, save_frames=args.record_frames)
+    if not args.replay:
+        brightness.minDelta, volume.minDelta = args.brightness_step, args.volume_step / 100
+        brightness.start()
+        volume.start()
+    if args.prewarm_luffy:
+        luffy.start()
+    startup.report()
+
+    try:
+        if args.pipeline:
+            run_pipelined(cap, args.headless, args.preview_fps)
+        else:
+            run_sequential(cap, args.headless, args.preview_fps)
+    finally:
+        luffy.close()   # ends a running session; microphone and browser are released
+        actions.stop()
+        if actuator is not None:
+            actuator.close()
+            print(f"🖱️ Input stats: {actuator.stats()}")
+        if isinstance(screenshots, ScreenshotService):
+            screenshots.close()
+            if screenshots.shots:
+                print(f"📸 Screenshot stats: {screenshots.stats()}")
+        for setter in (brightness, volume):
+            setter.close()
+            if setter.requested:
+                print(f"🎛️ {setter.name.capitalize()} stats: {setter.stats()}")
+        cap.release()
+        cv2.destroyAllWindows()
+        if recorder is not None:
+            recorder.save()
+        if args.roi and isinstance(base_detector, HandDetector):
+            print(f"🎯 ROI frames: {base_detector.roiFrames}, full frames: {base_detector.fullFrames}, "
+                  f"hands lost on a switch: {base_detector.switchDrops}")
+        if tracker is not None:
+            print(f"🔮 Prediction stats: {tracker.stats()}")
+        if governor is not None:
+            print(f"💤 Idle stats: {governor.stats()}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+"""Continuous speech capture for Luffy.
+
+One capture thread keeps the microphone open for the whole session, calibrates
+the noise floor once and then lets speech_recognition adapt the energy
+threshold as it goes. Every phrase the energy VAD cuts out is handed to a small
+thread pool for recognition while capture carries on, and results come back
+through get() in the order the phrases were spoken. Phrases heard while
+ignore() is true are dropped, unless a bargeIn hook is set: then they are
+recognized and handed to it instead (e.g. "stop" while Luffy reads aloud).
+
+The recognizer is pluggable: GoogleRecognizer for real use, FakeRecognizer
+(with an AudioFile source) to test without a microphone or network.
+
+    python voice.py --wav commands.wav --transcripts commands.txt
+"""
+import argparse
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import startup
+
+# speech_recognition (and PyAudio behind it) is imported where it is first
+# needed, so importing this module, and Luffy with it, stays cheap.
+
+
+# -------------------- Recognizers --------------------
+class GoogleRecognizer:
+    def __init__(self, language="en-in"):
+        import speech_recognition as sr
+        self.language = language
+        self.recognizer = sr.Recognizer()
+
+    def __call__(self, audio, seq):
+        return self.recognizer.recognize_google(audio, language=self.language)
+
+
+class FakeRecognizer:
+    """Returns transcripts[seq] for the seq-th phrase, after an optional simulated delay."""
+
+    def __init__(self, transcripts, latency=0.0):
+        self.transcripts = list(transcripts)
+        self.latency = latency
+
+    @classmethod
+    def load(cls, path, latency=0.0):
+        with open(path) as f:
+            return cls([line.strip() for line in f if line.strip()], latency)
+
+    def __call__(self, audio, seq):
+        time.sleep(self.latency)
+        if seq >= len(self.transcripts):
+            import speech_recognition as sr
+            raise sr.UnknownValueError()
+        return self.transcripts[seq]
+
+
+def makeSource(spec=None):
+    """Default microphone, or an AudioFile for a .wav path."""
+    import speech_recognition as sr
+    return sr.AudioFile(spec) if spec else sr.Microphone()
+
+
+def makeRecognizer(spec="google"):
+    """'google' or 'fake:<transcripts.txt>'."""
+    if spec.startswith("fake:"):
+        return FakeRecognizer.load(spec[5:])
+    return GoogleRecognizer()
+
+
+# -------------------- Listener --------------------
+class Listener:
+    def __init__(self, source=None, recognizer=None, workers=2, phraseLimit=6,
+                 calibrate=1.0, ignore=None):
+        self.source = source if source is not None else makeSource()
+        self.recognizer = recognizer or GoogleRecognizer()
+        self.phraseLimit = phraseLimit
+        self.calibrate = calibrate      # seconds of one-off noise calibration (0 to skip)
+        self.ignore = ignore            # callable: True drops the phrase (e.g. while Luffy talks)
+        self.bargeIn = None             # callable(text) -> True if it acted on a phrase ignore() held back
+
+        import speech_recognition as sr
+        self.sr = sr
+        self.vad = sr.Recognizer()
+        self.vad.dynamic_energy_threshold = True
+        self.pool = ThreadPoolExecutor(workers, thread_name_prefix="recognize")
+        self.results = queue.Queue()    # (capture time, future) in capture order
+
+        self.active = threading.Event() # cleared while Luffy is dormant: phrases are dropped
+        self.ended = threading.Event()  # source ran out (AudioFile) or failed
+        self._stop = threading.Event()
+        self._thread = None
+        self._seq = 0
+
+        self.phrases = 0
+        self.ignored = 0
+        self.bargeIns = 0
+        self.recognized = 0
+        self.failed = 0
+        self.recognizeTime = 0.0
+
+    def start(self):
+        """Opens the source and starts capturing; safe to call again to just resume."""
+        self.resume()
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._capture, daemon=True)
+            self._thread.start()
+        return self
+
+    def _capture(self):
+        try:
+            opened = time.perf_counter()
+            with self.source as s:
+                if self.calibrate:
+                    self.vad.adjust_for_ambient_noise(s, duration=self.calibrate)
+                startup.record("microphone", "open", time.perf_counter() - opened)
+                while not self._stop.is_set():
+                    try:
+                        audio = self.vad.listen(s, timeout=1, phrase_time_limit=self.phraseLimit)
+                    except self.sr.WaitTimeoutError:
+                        continue
+                    if not audio.frame_data:
+                        break   # end of an AudioFile
+                    seconds = len(audio.frame_data) / (audio.sample_rate * audio.sample_width)
+                    if seconds >= self.vad.phrase_threshold:
+                        self._heard(audio)
+        except Exception as e:
+            print("⚠️ Microphone stopped:", e)
+        finally:
+            self.ended.set()
+            self.results.put((time.perf_counter(), None))
+
+    def _heard(self, audio):
+        bargeIn = self.bargeIn
+        held = self.ignore is not None and self.ignore()
+        if not self.active.is_set() or (held and bargeIn is None):
+            self.ignored += 1
+            return
+        seq, self._seq = self._seq, self._seq + 1
+        self.phrases += 1
+        if held:
+            self.pool.submit(self._checkBargeIn, audio, seq, bargeIn)
+        else:
+            self.results.put((time.perf_counter(), self.pool.submit(self._recognize, audio, seq)))
+
+    def _checkBargeIn(self, audio, seq, bargeIn):
+        text = self._recognize(audio, seq)
+        if text and bargeIn(text.lower()):
+            self.bargeIns += 1
+        else:
+            self.ignored += 1
+
+    def _recognize(self, audio, seq):
+        start = time.perf_counter()
+        try:
+            text = self.recognizer(audio, seq)
+            self.recognized += 1
+        except (self.sr.UnknownValueError, self.sr.RequestError):
+            text = ""
+            self.failed += 1
+        self.recognizeTime += time.perf_counter() - start
+        return text
+
+    def get(self, timeout=None):
+        """Next recognized phrase ("" if it couldn't be recognized, None on timeout / end)."""
+        if self.ended.is_set() and self.results.empty():
+            return None
+        try:
+            _, future = self.results.get(timeout=timeout)
+        except queue.Empty:
+            return None
+        return None if future is None else future.result()
+
+    def pause(self):
+        """Stops queueing phrases but keeps the stream open and calibrated."""
+        self.active.clear()
+
+    def resume(self):
+        """Starts queueing phrases again, dropping anything left over from before."""
+        while True:
+            try:
+                self.results.get_nowait()
+            except queue.Empty:
+                break
+        self.active.set()
+
+    def stop(self):
+        self._stop.set()
+        self.pause()
+        if self._thread is not None:
+            self._thread.join(2.0)
+        self.pool.shutdown(wait=False)
+
+    def stats(self):
+        return {
+            "phrases": self.phrases,
+            "ignored": self.ignored,
+            "barge_ins": self.bargeIns,
+            "recognized": self.recognized,
+            "failed": self.failed,
+            "energy_threshold": round(self.vad.energy_threshold, 1),
+            "recognize_ms_avg": round(1000 * self.recognizeTime / self.phrases, 1) if self.phrases else 0.0,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Transcribe phrases with Luffy's listener")
+    parser.add_argument("--wav", help="read from a WAV file instead of the microphone")
+    parser.add_argument("--transcripts", help="fake recognizer: one expected phrase per line")
+    parser.add_argument("--latency", type=float, default=0.0, help="fake recognition delay (s)")
+    parser.add_argument("--workers", type=int, default=2)
+    args = parser.parse_args()
+
+    recognizer = FakeRecognizer.load(args.transcripts, args.latency) if args.transcripts else None
+    listener = Listener(makeSource(args.wav), recognizer, args.workers,
+                        calibrate=0 if args.wav else 1.0).start()
+    start = time.perf_counter()
+    try:
+        while True:
+            text = listener.get()
+            if text is None:
+                break
+            print(f"{time.perf_counter() - start:7.2f}s  {text!r}")
+    except KeyboardInterrupt:
+        pass
+    listener.stop()
+    print(listener.stats())
+
+
+if __name__ == "__main__":
+    main()
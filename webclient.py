@@ -0,0 +1,214 @@
+"""HTTP client layer for Luffy's online lookups.
+
+One pooled requests.Session with strict (connect, read) timeouts, plus a TTL
+cache with stale-while-revalidate: a fresh entry is returned as is; a stale
+one is returned at once while a single background request refreshes it; only
+a missing or expired entry makes the caller wait, and even then a failed
+request falls back to the last known value.
+
+    python webclient.py --stub            # exercise the cache against a local stub server
+"""
+import argparse
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import quote
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+TIMEOUT = (2.0, 4.0)    # connect, read (s)
+
+
+class HttpClient:
+    def __init__(self, timeout=TIMEOUT, retries=1, poolSize=4):
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=poolSize, pool_maxsize=poolSize,
+                              max_retries=Retry(total=retries, connect=retries, read=0,
+                                                backoff_factor=0.2, allowed_methods=["GET"]))
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers["User-Agent"] = "curl/8"   # wttr.in answers plain text to curl
+
+        self.requests = 0
+        self.failures = 0
+
+    def get_text(self, url, **params):
+        self.requests += 1
+        try:
+            r = self.session.get(url, params=params or None, timeout=self.timeout)
+            r.raise_for_status()
+            return r.text.strip()
+        except requests.RequestException:
+            self.failures += 1
+            raise
+
+    def close(self):
+        self.session.close()
+
+
+class TTLCache:
+    """key -> value, fresh for `ttl` seconds and still served (while refreshing) for `stale` more."""
+
+    def __init__(self, ttl=600.0, stale=3600.0, clock=time.monotonic):
+        self.ttl = ttl
+        self.stale = stale
+        self.clock = clock
+        self.entries = {}           # key -> (value, fetched at)
+        self.inflight = {}          # key -> Event set when its fetch finishes
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.staleHits = 0
+        self.misses = 0
+
+    def get(self, key, fetch):
+        """Cached value for key, calling fetch() when needed (errors propagate only with nothing cached)."""
+        with self._lock:
+            entry = self.entries.get(key)
+            age = None if entry is None else self.clock() - entry[1]
+            if age is not None and age < self.ttl:
+                self.hits += 1
+                return entry[0]
+            if age is not None and age < self.ttl + self.stale:
+                self.staleHits += 1
+                self._refresh(key, fetch)
+                return entry[0]
+            self.misses += 1
+            done = self.inflight.get(key)
+            if done is None:
+                self.inflight[key] = threading.Event()
+        if done is not None:
+            done.wait()         # someone is already fetching it
+            with self._lock:
+                if key in self.entries:
+                    return self.entries[key][0]
+        try:
+            return self._fetch(key, fetch)
+        except Exception:
+            if entry is not None:
+                return entry[0]
+            raise
+
+    def _refresh(self, key, fetch):
+        if key in self.inflight:
+            return
+        self.inflight[key] = threading.Event()
+        threading.Thread(target=self._background, args=(key, fetch), daemon=True).start()
+
+    def _background(self, key, fetch):
+        try:
+            self._fetch(key, fetch)
+        except Exception:
+            pass    # keep serving the stale value; the next get() tries again
+
+    def _fetch(self, key, fetch):
+        try:
+            value = fetch()
+            with self._lock:
+                self.entries[key] = (value, self.clock())
+            return value
+        finally:
+            with self._lock:
+                done = self.inflight.pop(key, None)
+            if done is not None:
+                done.set()
+
+
+class WeatherService:
+    def __init__(self, client=None, base="https://wttr.in", ttl=600.0, stale=3600.0):
+        self.client = client or HttpClient()
+        self.base = base.rstrip("/")
+        self.cache = TTLCache(ttl, stale)
+
+    def temperature(self, city="Delhi"):
+        key = city.strip().lower()
+        return self.cache.get(key, lambda: self.client.get_text(f"{self.base}/{quote(key)}", format="%t"))
+
+    def prefetch(self, cities):
+        """Warms the cache on a background thread so the first question is answered at once."""
+        def run():
+            for city in cities:
+                try:
+                    self.temperature(city)
+                except requests.RequestException:
+                    pass
+        threading.Thread(target=run, daemon=True).start()
+
+
+# -------------------- Local stub for testing --------------------
+class StubServer:
+    """wttr.in look-alike on localhost: answers "+<n>°C" after `delay` seconds."""
+
+    def __init__(self, delay=0.0):
+        stub = self
+        self.delay = delay
+        self.calls = 0
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stub.calls += 1
+                time.sleep(stub.delay)
+                body = f"+{20 + stub.calls}°C".encode()
+                self.send_response(200)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.handle_error = lambda request, address: None   # clients that timed out
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+
+
+def demo():
+    stub = StubServer(delay=0.2)
+    now = [0.0]
+    weather = WeatherService(HttpClient(timeout=(1.0, 0.5)), stub.url, ttl=60, stale=600)
+    weather.cache.clock = lambda: now[0]
+
+    def ask(label):
+        start = time.perf_counter()
+        try:
+            value = weather.temperature("Delhi")
+        except requests.RequestException as e:
+            value = type(e).__name__
+        print(f"{label:<28} {value:<8} {(time.perf_counter() - start) * 1000:7.1f} ms  (server calls: {stub.calls})")
+
+    ask("cold")
+    ask("warm")
+    now[0] = 120                            # past ttl, inside stale window
+    ask("stale (refresh in bg)")
+    time.sleep(0.4)
+    ask("after background refresh")
+    now[0] = 1000                           # expired
+    stub.delay = 1.0                        # slower than the read timeout
+    ask("expired, server too slow")
+    weather.cache.entries.clear()
+    ask("nothing cached, too slow")
+    print({"hits": weather.cache.hits, "stale": weather.cache.staleHits, "misses": weather.cache.misses,
+           "requests": weather.client.requests, "failures": weather.client.failures})
+    stub.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Luffy HTTP client")
+    parser.add_argument("city", nargs="?", default="Delhi")
+    parser.add_argument("--stub", action="store_true", help="run the cache demo against a local stub server")
+    args = parser.parse_args()
+    if args.stub:
+        demo()
+    else:
+        print(WeatherService().temperature(args.city))
+
+
+if __name__ == "__main__":
+    main()